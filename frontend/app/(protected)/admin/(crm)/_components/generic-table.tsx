@@ -197,12 +197,21 @@ export function TableActions<T extends BaseEntity>({
 
 // Table Info Component
 export function TableInfo<T extends BaseEntity>() {
-  const { items, rowsPerPage, setRowsPerPage } = useTableContext<T>();
+  const { items, serverPaged, page, rowsPerPage, setRowsPerPage } =
+    useTableContext<T>();
+
+  // A server-paged table never loads the whole set, so it can only tell
+  // which rows of it are on screen.
+  const start = (page - 1) * rowsPerPage;
 
   return (
     <div className="flex justify-between items-center">
       <span className="text-default-400 text-small">
-        Total {items.length} items
+        {serverPaged
+          ? items.length
+            ? `Showing ${start + 1}-${start + items.length}`
+            : "No items"
+          : `Total ${items.length} items`}
       </span>
       <div className="flex items-center gap-2">
         <span className="text-small text-default-400 whitespace-nowrap">
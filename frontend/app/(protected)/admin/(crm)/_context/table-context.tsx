@@ -8,6 +8,7 @@ import React, {
   useEffect,
   useState,
   useCallback,
+  useRef,
 } from "react";
 
 // Generic types for the table system
@@ -41,6 +42,22 @@ export interface SearchConfig {
   searchableFields: string[];
 }
 
+// One page request for tables the server paginates (see actions.findPage).
+export interface PageQuery {
+  cursor: string | null;
+  limit: number;
+  // Sort key with a leading "-" for descending, e.g. "-warranty_expiry".
+  sort: string;
+  search: string;
+  filters: Record<string, string>;
+}
+
+export interface PageResult<T> {
+  results: T[];
+  // Cursor of the following page; null on the last page.
+  next_cursor: string | null;
+}
+
 export interface TableConfig<T extends BaseEntity> {
   id: string;
   name: string;
@@ -49,7 +66,11 @@ export interface TableConfig<T extends BaseEntity> {
   initialVisibleColumns: string[];
   searchOption: SearchConfig;
   actions: {
-    findAll: () => Promise<T[]>;
+    // Either load every row once and page/sort/filter in the browser
+    // (findAll), or let the server do it and load one page at a time
+    // (findPage) for tables too large to download.
+    findAll?: () => Promise<T[]>;
+    findPage?: (query: PageQuery) => Promise<PageResult<T>>;
     create?: (data: any) => Promise<T>;
     update?: (id: string | number, data: any) => Promise<T>;
     delete?: (id: string | number) => Promise<void>;
@@ -64,6 +85,9 @@ export interface TableContextValue<T extends BaseEntity> {
   paginatedItems: T[];
   isLoading: boolean;
   error: string | null;
+  // True when the server pages the data: items then only holds the
+  // current page and pages only counts the pages reached so far.
+  serverPaged: boolean;
 
   // Pagination
   page: number;
@@ -168,9 +192,29 @@ export function TableProvider<T extends BaseEntity>({
     );
   }, [visibleColumns, config.columns]);
 
+  const serverPaged = Boolean(config.actions.findPage);
   const hasSearchFilter = Boolean(filterValue);
 
+  // The status filter values the user narrowed the table to, or null when
+  // every option is selected.
+  const selectedFilters = React.useMemo(() => {
+    if (
+      !config.filterOption ||
+      roleFilter === "all" ||
+      Array.from(roleFilter).length === config.filterOption.options.length
+    ) {
+      return null;
+    }
+
+    return Array.from(roleFilter).map((filter) =>
+      filter.toString().toLowerCase(),
+    );
+  }, [roleFilter, config.filterOption]);
+
   const filteredItems = React.useMemo(() => {
+    // The server already searched and filtered the page it returned.
+    if (serverPaged) return items;
+
     let filtered = [...items];
 
     if (hasSearchFilter) {
@@ -189,15 +233,8 @@ export function TableProvider<T extends BaseEntity>({
     }
 
     // Apply role/status filter - FIXED LOGIC
-    if (
-      config.filterOption &&
-      roleFilter !== "all" &&
-      Array.from(roleFilter).length !== config.filterOption.options.length
-    ) {
+    if (config.filterOption && selectedFilters) {
       const filterColumn = config.filterOption.column;
-      const selectedFilters = Array.from(roleFilter).map((filter) =>
-        filter.toString().toLowerCase(),
-      );
 
       filtered = filtered.filter((item) => {
         const rawValue = item[filterColumn];
@@ -212,18 +249,63 @@ export function TableProvider<T extends BaseEntity>({
     }
 
     return filtered;
-  }, [items, filterValue, roleFilter, config.filterOption, hasSearchFilter]);
+  }, [
+    items,
+    filterValue,
+    selectedFilters,
+    config.filterOption,
+    hasSearchFilter,
+    serverPaged,
+  ]);
+
+  // Server paging: cursors[i] fetches page i + 1. They are only valid for
+  // the query they were issued under, so a new sort, filter, search or page
+  // size starts over from the first page.
+  const pageQuery = React.useMemo(() => {
+    const filters: Record<string, string> = {};
+
+    // The list endpoint filters on a single value per column.
+    if (config.filterOption && selectedFilters?.length === 1) {
+      filters[config.filterOption.column] = selectedFilters[0];
+    }
 
-  const pages = Math.ceil(filteredItems.length / rowsPerPage) || 1;
+    return {
+      limit: rowsPerPage,
+      sort: `${sortDescriptor.direction === "descending" ? "-" : ""}${String(
+        sortDescriptor.column,
+      )}`,
+      search: filterValue.trim(),
+      filters,
+    };
+  }, [
+    rowsPerPage,
+    sortDescriptor,
+    filterValue,
+    selectedFilters,
+    config.filterOption,
+  ]);
+  const cursors = useRef<{ key: string; cursors: (string | null)[] }>({
+    key: "",
+    cursors: [null],
+  });
+  const [serverPages, setServerPages] = useState(1);
+
+  const pages = serverPaged
+    ? serverPages
+    : Math.ceil(filteredItems.length / rowsPerPage) || 1;
 
   const paginatedItems = React.useMemo(() => {
+    if (serverPaged) return filteredItems;
+
     const start = (page - 1) * rowsPerPage;
     const end = start + rowsPerPage;
 
     return filteredItems.slice(start, end);
-  }, [page, filteredItems, rowsPerPage]);
+  }, [page, filteredItems, rowsPerPage, serverPaged]);
 
   const sortedItems = React.useMemo(() => {
+    if (serverPaged) return paginatedItems;
+
     return [...paginatedItems].sort((a, b) => {
       const first = a[sortDescriptor.column as keyof T];
       const second = b[sortDescriptor.column as keyof T];
@@ -231,10 +313,11 @@ export function TableProvider<T extends BaseEntity>({
 
       return sortDescriptor.direction === "descending" ? -cmp : cmp;
     });
-  }, [sortDescriptor, paginatedItems]);
+  }, [sortDescriptor, paginatedItems, serverPaged]);
 
   // Actions
-  const refresh = useCallback(async () => {
+  const loadAll = useCallback(async () => {
+    if (!config.actions.findAll) return;
     setIsLoading(true);
     setError(null);
     try {
@@ -248,6 +331,55 @@ export function TableProvider<T extends BaseEntity>({
     }
   }, [config.actions]);
 
+  const latestRequest = useRef(0);
+
+  const loadPage = useCallback(async () => {
+    if (!config.actions.findPage) return;
+    const key = JSON.stringify(pageQuery);
+
+    if (cursors.current.key !== key) {
+      cursors.current = { key, cursors: [null] };
+      setServerPages(1);
+      if (page !== 1) {
+        // Changing the page loads again, this time the first page.
+        setPage(1);
+
+        return;
+      }
+    }
+
+    const request = ++latestRequest.current;
+
+    setIsLoading(true);
+    setError(null);
+    try {
+      const known = cursors.current.cursors;
+      const data = await config.actions.findPage({
+        ...pageQuery,
+        cursor: known[page - 1] ?? null,
+      });
+
+      // A newer page or query was asked for meanwhile.
+      if (request !== latestRequest.current) return;
+
+      // Keep the cursors up to this page, plus the next one if any.
+      const next = known.slice(0, page);
+
+      if (data.next_cursor) next.push(data.next_cursor);
+      cursors.current = { key, cursors: next };
+      setServerPages(next.length);
+      setItems(data.results);
+    } catch (err) {
+      if (request !== latestRequest.current) return;
+      setError(err instanceof Error ? err.message : "Failed to fetch data");
+    } finally {
+      if (request === latestRequest.current) setIsLoading(false);
+    }
+  }, [config.actions, pageQuery, page]);
+
+  // Server-paged tables reload whenever the page or the query changes.
+  const refresh = serverPaged ? loadPage : loadAll;
+
   const createItem = useCallback(
     async (data: Partial<T>) => {
       if (!config.actions.create) {
@@ -406,6 +538,7 @@ export function TableProvider<T extends BaseEntity>({
     paginatedItems: sortedItems,
     isLoading,
     error,
+    serverPaged,
 
     // Pagination
     page,
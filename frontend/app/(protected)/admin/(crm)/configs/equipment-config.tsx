@@ -11,7 +11,12 @@ import {
 import { Button } from "@heroui/button";
 import { MoreHorizontal, Eye, Pencil, Trash } from "lucide-react";
 
-import { TableConfig, BaseEntity } from "../_context/table-context";
+import {
+  TableConfig,
+  BaseEntity,
+  PageQuery,
+  PageResult,
+} from "../_context/table-context";
 import { ModalConfig, useModalActions } from "../_context/modal-context";
 import {
   EquipmentViewModal,
@@ -47,8 +52,33 @@ export interface Equipment extends BaseEntity {
 
 // Server actions implementation using Django REST API
 const equipmentActions = {
-  findAll: async (): Promise<Equipment[]> => {
-    const response = await fetch(`${API_BASE_URL}/equipment/list/`, {
+  findPage: async ({
+    cursor,
+    limit,
+    sort,
+    search,
+    filters,
+  }: PageQuery): Promise<PageResult<Equipment>> => {
+    // The list endpoint is keyset-paginated and sorts and filters
+    // server-side, so only the page on screen is ever downloaded. A search
+    // returns the best matches instead, as a single page.
+    const params = new URLSearchParams({ limit: String(limit) });
+    let url = `${API_BASE_URL}/equipment/list/`;
+
+    if (search) {
+      params.set("q", search);
+      url = `${API_BASE_URL}/equipment/search/`;
+    } else {
+      params.set("sort", sort);
+      for (const [key, value] of Object.entries(filters)) {
+        params.set(key, value);
+      }
+      if (cursor) {
+        params.set("cursor", cursor);
+      }
+    }
+
+    const response = await fetch(`${url}?${params}`, {
       method: "GET",
       headers: {
         "Content-Type": "application/json",
@@ -62,7 +92,10 @@ const equipmentActions = {
 
     const data = await response.json();
 
-    return data as Equipment[];
+    return {
+      results: data.results as Equipment[],
+      next_cursor: data.next_cursor ?? null,
+    };
   },
 
   create: async (data: any): Promise<Equipment> => {
@@ -168,7 +201,6 @@ export const equipmentConfig: TableConfig<Equipment> = {
     {
       name: "Department",
       uid: "department",
-      sortable: true,
       customRender: (equipment: Equipment) => (
         <span>
           {equipment.department_name || `Dept #${equipment.department}`}
@@ -178,7 +210,6 @@ export const equipmentConfig: TableConfig<Equipment> = {
     {
       name: "Assigned To",
       uid: "assigned_to",
-      sortable: true,
       customRender: (equipment: Equipment) => {
         if (!equipment.assigned_to) {
           return <span className="text-foreground/40">Unassigned</span>;
@@ -232,7 +263,6 @@ export const equipmentConfig: TableConfig<Equipment> = {
     {
       name: "Status",
       uid: "is_scrapped",
-      sortable: true,
       customRender: (equipment: Equipment) => (
         <Chip
           color={equipment.is_scrapped ? "danger" : "success"}
@@ -246,7 +276,6 @@ export const equipmentConfig: TableConfig<Equipment> = {
     {
       name: "Maintenance Team",
       uid: "maintenance_team",
-      sortable: true,
       customRender: (equipment: Equipment) => (
         <span>
           {equipment.maintenance_team_name ||
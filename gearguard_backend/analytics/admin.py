@@ -1,3 +1,6 @@
 from django.contrib import admin
+from .models import RequestRollup
 
 # Register your models here.
+
+admin.site.register(RequestRollup)
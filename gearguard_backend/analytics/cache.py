@@ -0,0 +1,125 @@
+import hashlib
+import threading
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+
+# Invalidation domains: a write to one of these bumps its version, which
+# retires every cached result that depends on it.
+DOMAINS = ('requests', 'equipment', 'teams', 'users')
+ANALYTICS_CACHE_TTL = getattr(settings, 'ANALYTICS_CACHE_TTL', 60)
+VERSION_KEY = 'analytics:version:{}'
+
+
+def analytics_cache():
+    return caches[getattr(settings, 'ANALYTICS_CACHE_ALIAS', 'default')]
+
+
+def initial_version():
+    # Seeded from the clock, so a version key lost to eviction or a cache
+    # restart never comes back at a number older entries were stored under.
+    return time.time_ns() // 1000
+
+
+def versions(domains):
+    """
+    Current version of each domain, from one get_many in the common case.
+    """
+
+    cache = analytics_cache()
+    keys = {domain: VERSION_KEY.format(domain) for domain in domains}
+    found = cache.get_many(keys.values())
+    for key in keys.values():
+        if key not in found:
+            cache.add(key, initial_version(), timeout=None)
+            found[key] = cache.get(key)
+    return {domain: found[key] for domain, key in keys.items()}
+
+
+def bump(*domains):
+    cache = analytics_cache()
+    for domain in domains:
+        key = VERSION_KEY.format(domain)
+        try:
+            cache.incr(key)
+        except ValueError:
+            # No version stored yet: any fresh one retires nothing cached.
+            cache.add(key, initial_version(), timeout=None)
+
+
+def invalidate(*domains):
+    """
+    Bumps ``domains`` once the current transaction commits (immediately
+    outside one). Bumping earlier would let a reader recompute from the
+    pre-commit rows and store them under the new version.
+    """
+
+    transaction.on_commit(lambda: bump(*domains))
+
+
+class CacheStats:
+    """
+    Per-result hit and miss counters for this process.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counts = defaultdict(lambda: {'hits': 0, 'misses': 0})
+
+    def record(self, name, hit):
+        with self.lock:
+            self.counts[name]['hits' if hit else 'misses'] += 1
+
+    def snapshot(self):
+        with self.lock:
+            results = {name: dict(counts) for name, counts in self.counts.items()}
+        for counts in results.values():
+            lookups = counts['hits'] + counts['misses']
+            counts['hit_ratio'] = counts['hits'] / lookups if lookups else None
+        hits = sum(counts['hits'] for counts in results.values())
+        lookups = hits + sum(counts['misses'] for counts in results.values())
+        return {
+            'hits': hits,
+            'misses': lookups - hits,
+            'hit_ratio': hits / lookups if lookups else None,
+            'results': results,
+        }
+
+    def reset(self):
+        with self.lock:
+            self.counts.clear()
+
+
+cache_stats = CacheStats()
+
+
+def cache_key(name, domain_versions, params):
+    raw = '&'.join(f'{key}={value}' for key, value in sorted(params.items()))
+    digest = hashlib.md5(raw.encode()).hexdigest()
+    tags = '.'.join(str(domain_versions[domain]) for domain in sorted(domain_versions))
+    return f'analytics:{name}:{tags}:{digest}'
+
+
+def cached_result(name, domains, compute, params=None, ttl=None):
+    """
+    Returns ``compute()`` for (``name``, ``params``), served from the cache
+    while none of ``domains`` has been written to and ``ttl`` seconds
+    (default ANALYTICS_CACHE_TTL) have not passed.
+
+    The domain versions are part of the key, so a write never has to find
+    and delete entries: it bumps the version and the old entries are simply
+    never asked for again, expiring on their TTL.
+    """
+
+    cache = analytics_cache()
+    key = cache_key(name, versions(domains), params or {})
+    value = cache.get(key)
+    cache_stats.record(name, value is not None)
+    if value is None:
+        value = compute()
+        cache.set(key, value, ANALYTICS_CACHE_TTL if ttl is None else ttl)
+    return value
@@ -0,0 +1,208 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import close_old_connections, connections
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from equipment.models import Equipment
+from maintenance.aggregates import STATUSES
+from maintenance.models import MaintenanceRequest
+from teams.models import MaintenanceTeam
+from users.models import GearguardUser
+from .models import RequestRollup
+from .rollups import UNASSIGNED_TEAM
+
+
+OPEN_STATUSES = ('new', 'in_progress')
+ROLES = [value for value, _ in GearguardUser.ROLE_CHOICES]
+DASHBOARD_TEAM_LIMIT = 20
+DASHBOARD_WORKERS = 5
+
+_executor = None
+
+
+def executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=DASHBOARD_WORKERS, thread_name_prefix='analytics-query')
+    return _executor
+
+
+def can_run_in_parallel(using='default'):
+    """
+    Each worker thread has its own database connection, so queries only run
+    in parallel on a server database, outside a transaction (other
+    connections would not see its uncommitted rows), and unless
+    ANALYTICS_PARALLEL_QUERIES is False.
+    """
+
+    connection = connections[using]
+    return (
+        getattr(settings, 'ANALYTICS_PARALLEL_QUERIES', True)
+        and connection.vendor != 'sqlite'
+        and not connection.in_atomic_block
+    )
+
+
+def in_worker(query):
+    """
+    Runs ``query`` on the worker thread's own connection. Worker threads
+    outlive requests, so the checks Django makes at the start and end of
+    every request run around each query instead: a connection older than
+    CONN_MAX_AGE, or one that errored and no longer works, is closed and
+    the next query reconnects. With persistent connections a worker keeps
+    its connection from one dashboard hit to the next.
+    """
+
+    close_old_connections()
+    try:
+        return query()
+    finally:
+        close_old_connections()
+
+
+def shutdown_workers():
+    """
+    Closes every worker thread's connection and stops the pool (e.g. before
+    dropping a test database). The next parallel run starts a new one.
+    """
+
+    global _executor
+    if _executor is None:
+        return
+    # One task per worker, held at the barrier until all have started, so
+    # each thread runs exactly one of them.
+    barrier = threading.Barrier(DASHBOARD_WORKERS)
+
+    def close():
+        connections.close_all()
+        barrier.wait()
+
+    for future in [_executor.submit(close) for _ in range(DASHBOARD_WORKERS)]:
+        future.result()
+    _executor.shutdown()
+    _executor = None
+
+
+def run_queries(queries, parallel=None):
+    """
+    Runs the ``{name: callable}`` queries, concurrently on the worker pool
+    when ``parallel`` (default: ``can_run_in_parallel()``), and returns
+    ``{name: result}``.
+    """
+
+    if parallel is None:
+        parallel = can_run_in_parallel()
+    if not parallel:
+        return {name: query() for name, query in queries.items()}
+    futures = {name: executor().submit(in_worker, query) for name, query in queries.items()}
+    return {name: future.result() for name, future in futures.items()}
+
+
+def requests_by_team():
+    """
+    Request counts per (team, status), summed from the rollups rather than
+    grouped over every request. Unassigned requests come back under team
+    None.
+    """
+
+    rows = RequestRollup.objects.values('team_id', 'status').annotate(total=Sum('count')).order_by()
+    return [
+        (None if row['team_id'] == UNASSIGNED_TEAM else row['team_id'], row['status'], row['total'])
+        for row in rows
+    ]
+
+
+def overdue_by_team(today):
+    """
+    Open requests scheduled before ``today``, per assigned team: the one
+    count the rollups cannot give, as they carry no scheduled date.
+    """
+
+    return list(
+        MaintenanceRequest.objects
+        .filter(status__in=OPEN_STATUSES, scheduled_date__lt=today)
+        .values_list('assigned_team_id')
+        .annotate(overdue=Count('id'))
+        .order_by()
+    )
+
+
+def equipment_counts():
+    return Equipment.objects.aggregate(total=Count('id'), scrapped=Count('id', filter=Q(is_scrapped=True)))
+
+
+def team_members():
+    return list(
+        MaintenanceTeam.objects
+        .values('id', 'name')
+        .annotate(member_count=Count('members'), technicians=Count('members', filter=Q(members__role='technician')))
+        .order_by()
+    )
+
+
+def user_counts():
+    counts = {role: Count('id', filter=Q(role=role)) for role in ROLES}
+    return GearguardUser.objects.aggregate(total=Count('id'), **counts)
+
+
+def dashboard_summary(today=None, team_limit=DASHBOARD_TEAM_LIMIT, parallel=None):
+    """
+    Every admin dashboard KPI from five aggregate queries (request rollups
+    per team, overdue requests per team, equipment, team membership,
+    users), run concurrently where the database allows. Teams are listed by open backlog, largest first, up to
+    ``team_limit``, so the payload stays a few KB however many teams exist.
+    """
+
+    today = today or timezone.localdate()
+    results = run_queries({
+        'requests': requests_by_team,
+        'overdue': lambda: overdue_by_team(today),
+        'equipment': equipment_counts,
+        'teams': team_members,
+        'users': user_counts,
+    }, parallel=parallel)
+
+    requests = {status: 0 for status in STATUSES}
+    requests['overdue'] = 0
+    backlog = {}
+    for team_id, status, total in results['requests']:
+        requests[status] += total
+        row = backlog.setdefault(team_id, {})
+        row[status] = row.get(status, 0) + total
+    for team_id, overdue in results['overdue']:
+        requests['overdue'] += overdue
+        backlog.setdefault(team_id, {})['overdue'] = overdue
+
+    teams = []
+    for team in results['teams']:
+        row = backlog.get(team['id'], {})
+        teams.append({
+            'id': team['id'],
+            'name': team['name'],
+            'technicians': team['technicians'],
+            'members': team['member_count'],
+            'backlog': sum(row.get(status, 0) for status in OPEN_STATUSES),
+            'in_progress': row.get('in_progress', 0),
+            'overdue': row.get('overdue', 0),
+        })
+    teams.sort(key=lambda team: (-team['backlog'], team['id']))
+    unassigned = backlog.get(None, {})
+
+    return {
+        'requests': {
+            **requests,
+            'open': sum(requests[status] for status in OPEN_STATUSES),
+            'unassigned_backlog': sum(unassigned.get(status, 0) for status in OPEN_STATUSES),
+        },
+        'equipment': {
+            'total': results['equipment']['total'],
+            'scrapped': results['equipment']['scrapped'],
+            'active': results['equipment']['total'] - results['equipment']['scrapped'],
+        },
+        'users': results['users'],
+        'teams_total': len(teams),
+        'teams': teams[:team_limit],
+    }
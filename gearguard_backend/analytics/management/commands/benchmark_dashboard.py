@@ -0,0 +1,102 @@
+import random
+import statistics
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from analytics.dashboard import can_run_in_parallel, dashboard_summary, shutdown_workers
+from analytics.models import RequestRollup
+from analytics.rollups import rebuild_rollups
+from departements.models import Department
+from equipment.models import Equipment
+from gearguard_backend.benchmarking import measure
+from maintenance.models import MaintenanceRequest
+from teams.models import MaintenanceTeam
+from users.models import GearguardUser
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds a fleet, then times the dashboard summary run sequentially on one connection, in parallel "
+        "on persistent worker connections, and in parallel with CONN_MAX_AGE 0. The worker threads "
+        "only see committed rows, so the seed is committed and deleted again at the end."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200000)
+        parser.add_argument('--teams', type=int, default=200)
+        parser.add_argument('--hits', type=int, default=50)
+
+    def handle(self, *args, **options):
+        if not can_run_in_parallel():
+            raise CommandError('Parallel dashboard queries need a server database (and ANALYTICS_PARALLEL_QUERIES)')
+
+        department, teams, users = self.seed(options['requests'], options['teams'])
+        try:
+            # Worker connections follow CONN_MAX_AGE, read when they connect.
+            modes = [
+                ('sequential', None, False),
+                ('parallel, persistent', 60, True),
+                ('parallel, reconnecting', 0, True),
+            ]
+            max_age_setting = connection.settings_dict['CONN_MAX_AGE']
+            for label, max_age, parallel in modes:
+                shutdown_workers()
+                connection.settings_dict['CONN_MAX_AGE'] = max_age_setting if max_age is None else max_age
+                try:
+                    hit = lambda: dashboard_summary(parallel=parallel)
+                    hit()
+                    timings = [measure(hit)[0] * 1000 for _ in range(options['hits'])]
+                finally:
+                    connection.settings_dict['CONN_MAX_AGE'] = max_age_setting
+                self.stdout.write(
+                    f'{label}: median {statistics.median(timings):.1f}ms, '
+                    f'p95 {sorted(timings)[int(len(timings) * 0.95) - 1]:.1f}ms over {len(timings)} hits'
+                )
+        finally:
+            shutdown_workers()
+            RequestRollup.objects.filter(department_id=department.id).delete()
+            requests = MaintenanceRequest.objects.filter(equipment__department=department)
+            # Seeded rows only: skip the per-row feed and rollup receivers.
+            requests._raw_delete(connection.alias)
+            Equipment.objects.filter(department=department).delete()
+            MaintenanceTeam.objects.filter(id__in=[team.id for team in teams]).delete()
+            GearguardUser.objects.filter(id__in=[user.id for user in users]).delete()
+            department.delete()
+
+    def seed(self, request_count, team_count):
+        rng = random.Random(1)
+        department = Department.objects.create(name='bench dashboard')
+        teams = MaintenanceTeam.objects.bulk_create(MaintenanceTeam(name=f'bench {i}') for i in range(team_count))
+        users = GearguardUser.objects.bulk_create(
+            GearguardUser(username=f'bench-dashboard-{i}', role=rng.choice(['technician', 'technician', 'manager']))
+            for i in range(team_count * 5)
+        )
+        MaintenanceTeam.members.through.objects.bulk_create(
+            MaintenanceTeam.members.through(maintenanceteam_id=teams[i // 5].id, gearguarduser_id=user.id)
+            for i, user in enumerate(users)
+        )
+        equipment = Equipment.objects.bulk_create(
+            Equipment(
+                name='bench', serial_number=f'bench-dashboard-{i}', department=department, location='bench',
+                purchase_date=date(2024, 1, 1), warranty_expiry=date(2027, 1, 1), is_scrapped=i % 20 == 0,
+            )
+            for i in range(request_count // 20)
+        )
+        today = date.today()
+        MaintenanceRequest.objects.bulk_create(
+            (
+                MaintenanceRequest(
+                    subject='bench', equipment=rng.choice(equipment), request_type='corrective',
+                    status=rng.choice(['new', 'in_progress', 'repaired', 'scrap']),
+                    assigned_team=rng.choice(teams + [None]),
+                    scheduled_date=today + timedelta(days=rng.randint(-60, 60)),
+                )
+                for _ in range(request_count)
+            ),
+            batch_size=5000,
+        )
+        # bulk_create skips the rollup hooks the dashboard counts come from.
+        rebuild_rollups()
+        return department, teams, users
@@ -0,0 +1,58 @@
+import random
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from analytics.reliability import load_failures, reliability
+from departements.models import Department
+from equipment.models import Equipment
+from gearguard_backend.benchmarking import measure, rolled_back
+from maintenance.models import MaintenanceRequest
+
+
+class Command(BaseCommand):
+    help = (
+        "Seeds corrective requests (a tenth of them with a repair time) and times loading them "
+        "and computing MTTR/MTBF per equipment and per department. Runs in a rolled-back transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=1000000)
+        parser.add_argument('--equipment', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            self.seed(options['requests'], options['equipment'])
+
+            seconds, queries, failures = measure(load_failures)
+            self.stdout.write(f"load: {len(failures['equipment'])} failures in {seconds:.2f}s, {queries} queries")
+            for by in ('equipment', 'department'):
+                seconds, _, rows = measure(lambda: reliability(failures, by=by))
+                self.stdout.write(f'by {by}: {len(rows)} groups in {seconds * 1000:.0f}ms')
+
+    def seed(self, count, equipment_count):
+        rng = random.Random(1)
+        departments = Department.objects.bulk_create(Department(name=f'bench {i}') for i in range(20))
+        equipment = Equipment.objects.bulk_create(
+            (
+                Equipment(
+                    name='bench', serial_number=f'bench-reliability-{i}', department=departments[i % 20],
+                    location='bench', purchase_date=date(2024, 1, 1), warranty_expiry=date(2027, 1, 1),
+                )
+                for i in range(equipment_count)
+            ),
+            batch_size=5000,
+        )
+        now = timezone.now()
+        MaintenanceRequest.objects.bulk_create(
+            (
+                MaintenanceRequest(
+                    subject='bench', equipment=rng.choice(equipment), request_type='corrective',
+                    duration_hours=rng.choice([None, 1.0, 2.5, 8.0]),
+                    repaired_at=now + timedelta(hours=rng.uniform(0, 48)) if i % 10 == 0 else None,
+                )
+                for i in range(count)
+            ),
+            batch_size=5000,
+        )
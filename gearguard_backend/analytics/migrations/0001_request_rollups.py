@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RequestRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('team_id', models.BigIntegerField()),
+                ('equipment_id', models.BigIntegerField()),
+                ('department_id', models.BigIntegerField()),
+                ('status', models.CharField(max_length=20)),
+                ('request_type', models.CharField(max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('duration_hours', models.FloatField(default=0)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['team_id', 'day'], name='rollup_team_day_idx'), models.Index(fields=['department_id', 'day'], name='rollup_department_day_idx'), models.Index(fields=['equipment_id', 'day'], name='rollup_equipment_day_idx')],
+                'constraints': [models.UniqueConstraint(fields=('day', 'team_id', 'equipment_id', 'department_id', 'status', 'request_type'), name='request_rollup_key_uniq')],
+            },
+        ),
+    ]
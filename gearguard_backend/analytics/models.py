@@ -1,3 +1,39 @@
 from django.db import models
 
 # Create your models here.
+class RequestRollup(models.Model):
+    """
+    Maintenance request counts and ``duration_hours`` sums per
+    (creation day, team, equipment, department, status, type). Kept current
+    by the request write hooks in ``analytics.rollups`` and rebuilt with
+    ``rebuild_request_rollups``.
+
+    Ids are plain columns so rollups never cascade or lock the source rows;
+    ``team_id`` 0 stands for unassigned requests.
+    """
+
+    day = models.DateField()
+    team_id = models.BigIntegerField()
+    equipment_id = models.BigIntegerField()
+    department_id = models.BigIntegerField()
+    status = models.CharField(max_length=20)
+    request_type = models.CharField(max_length=20)
+
+    count = models.IntegerField(default=0)
+    duration_hours = models.FloatField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=['day', 'team_id', 'equipment_id', 'department_id', 'status', 'request_type'],
+                name='request_rollup_key_uniq',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['team_id', 'day'], name='rollup_team_day_idx'),
+            models.Index(fields=['department_id', 'day'], name='rollup_department_day_idx'),
+            models.Index(fields=['equipment_id', 'day'], name='rollup_equipment_day_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.day} {self.status}/{self.request_type}: {self.count}"
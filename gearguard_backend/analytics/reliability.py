@@ -0,0 +1,171 @@
+import numpy as np
+from django.core.exceptions import EmptyResultSet
+from django.db import connections
+from django.db.models import Case, FloatField, Func, When
+
+from maintenance.models import MaintenanceRequest
+
+
+RELIABILITY_CHUNK_SIZE = 20000
+SECONDS_PER_HOUR = 3600.0
+FAILURE_DTYPES = {
+    'equipment': np.int64,
+    'department': np.int64,
+    'created': np.float64,
+    'repair_hours': np.float64,
+}
+
+
+class EpochSeconds(Func):
+    """
+    Seconds since the Unix epoch as a float, computed by the database so
+    that streaming a million timestamps skips Python datetime parsing.
+    """
+
+    template = 'CAST(EXTRACT(EPOCH FROM %(expressions)s) AS double precision)'
+    output_field = FloatField()
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        return self.as_sql(
+            compiler, connection, template='((julianday(%(expressions)s) - 2440587.5) * 86400.0)', **extra_context,
+        )
+
+
+def failure_rows(queryset=None):
+    """
+    Corrective requests (failures) as (equipment id, department id,
+    created, duration_hours, repaired) tuples, times in epoch seconds.
+    ``repaired`` is the request's ``repaired_at``, only read for requests
+    without ``duration_hours``.
+    """
+
+    if queryset is None:
+        queryset = MaintenanceRequest.objects.all()
+    return (
+        queryset
+        .filter(request_type='corrective')
+        .annotate(
+            created=EpochSeconds('created_at'),
+            repaired=Case(When(duration_hours__isnull=True, then=EpochSeconds('repaired_at')), output_field=FloatField()),
+        )
+        .order_by()
+        .values_list('equipment_id', 'equipment__department_id', 'created', 'duration_hours', 'repaired')
+    )
+
+
+def failure_chunks(queryset=None, chunk_size=RELIABILITY_CHUNK_SIZE):
+    """
+    Streams ``failure_rows`` through a server-side cursor, reading it
+    directly rather than through the ORM iterator, and yields
+    ``chunk_size`` rows at a time as column arrays: equipment, department,
+    created (epoch seconds) and repair_hours (NaN when unknown).
+
+    Repair time is ``duration_hours`` when recorded, otherwise the time from
+    creation to ``repaired_at``; negative spans count as unknown.
+    """
+
+    rows = failure_rows(queryset)
+    try:
+        sql, params = rows.query.sql_with_params()
+    except EmptyResultSet:
+        return
+    with connections[rows.db].chunked_cursor() as cursor:
+        cursor.execute(sql, params)
+        while True:
+            chunk = cursor.fetchmany(chunk_size)
+            if not chunk:
+                return
+            equipment, department, created, hours, repaired = zip(*chunk)
+            created = np.array(created, dtype=np.float64)
+            hours = np.array(hours, dtype=np.float64)
+            logged = (np.array(repaired, dtype=np.float64) - created) / SECONDS_PER_HOUR
+            hours = np.where(np.isnan(hours), logged, hours)
+            hours[hours < 0] = np.nan
+            yield {
+                'equipment': np.array(equipment, dtype=FAILURE_DTYPES['equipment']),
+                'department': np.array(department, dtype=FAILURE_DTYPES['department']),
+                'created': created,
+                'repair_hours': hours,
+            }
+
+
+def load_failures(queryset=None, chunk_size=RELIABILITY_CHUNK_SIZE):
+    """
+    Every failure of ``queryset`` as one set of column arrays (see
+    ``failure_chunks``), from a single query.
+    """
+
+    chunks = list(failure_chunks(queryset, chunk_size))
+    return {
+        name: np.concatenate([chunk[name] for chunk in chunks]) if chunks else np.empty(0, dtype=dtype)
+        for name, dtype in FAILURE_DTYPES.items()
+    }
+
+
+def group_sums(keys, failures):
+    """
+    Sums over ``failures`` (as from ``load_failures``) grouped by ``keys``,
+    one key per failure (e.g. its equipment or department).
+    Failures are sorted by (equipment, created) and the intervals between
+    consecutive failures of the same asset are summed into the group of
+    the later failure. Returns (unique keys, failures, repairs, repair
+    hours, intervals, interval hours), all arrays aligned with the keys.
+    """
+
+    order = np.lexsort((failures['created'], failures['equipment']))
+    equipment = failures['equipment'][order]
+    created = failures['created'][order]
+    repair_hours = failures['repair_hours'][order]
+    groups, index = np.unique(keys[order], return_inverse=True)
+    size = len(groups)
+
+    repaired = ~np.isnan(repair_hours)
+    same_asset = equipment[1:] == equipment[:-1]
+    gaps = np.diff(created)[same_asset] / SECONDS_PER_HOUR
+    gap_index = index[1:][same_asset]
+
+    return (
+        groups,
+        np.bincount(index, minlength=size),
+        np.bincount(index[repaired], minlength=size),
+        np.bincount(index[repaired], weights=repair_hours[repaired], minlength=size),
+        np.bincount(gap_index, minlength=size),
+        np.bincount(gap_index, weights=gaps, minlength=size),
+    )
+
+
+def mean_or_none(total, count):
+    return round(float(total) / int(count), 3) if count else None
+
+
+def reliability(failures, by='equipment'):
+    """
+    MTTR and MTBF in hours per equipment or per department, or for the
+    whole fleet with ``by=None``.
+
+    MTTR is the mean repair time of the failures with a known one. MTBF is
+    the mean time between consecutive failure reports of the same asset;
+    a department's MTBF pools the intervals of all its assets. Groups with
+    no asset failing twice have no MTBF (None).
+    """
+
+    if by is None:
+        keys = np.zeros(len(failures['equipment']), dtype=np.int64)
+    else:
+        keys = failures[by]
+    groups, failed, repairs, repair_hours, intervals, interval_hours = group_sums(keys, failures)
+    rows = [
+        {
+            'id': int(groups[i]),
+            'failures': int(failed[i]),
+            'repairs': int(repairs[i]),
+            'mttr_hours': mean_or_none(repair_hours[i], repairs[i]),
+            'mtbf_hours': mean_or_none(interval_hours[i], intervals[i]),
+        }
+        for i in range(len(groups))
+    ]
+    if by == 'equipment':
+        _, first = np.unique(failures['equipment'], return_index=True)
+        for row, department_id in zip(rows, failures['department'][first].tolist()):
+            row['department_id'] = department_id
+    return rows
@@ -0,0 +1,173 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+from itertools import chain
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Max, Min, Sum
+from django.db.models.functions import Coalesce, TruncDate
+from django.utils import timezone
+
+from equipment.models import Equipment
+from maintenance.models import MaintenanceRequest
+from .cache import invalidate
+from .models import RequestRollup
+
+
+UNASSIGNED_TEAM = 0
+REBUILD_CHUNK_DAYS = 30
+ROLLUP_KEY = ('day', 'team_id', 'equipment_id', 'department_id', 'status', 'request_type')
+ROLLUP_COLUMNS = ('created_at', 'assigned_team_id', 'equipment_id', 'status', 'request_type', 'duration_hours')
+
+
+def rollup_deltas(changes, inserted=()):
+    """
+    Folds (before, after) request rows, and (row, count) groups of inserted
+    rows, into {(day, team id, equipment id, status, type): [count delta,
+    hours delta]}. A change that leaves every rollup column alone cancels
+    out and costs no query. Rows missing a rollup column (e.g. loaded with
+    .only()) are skipped; the next rebuild picks them up.
+    """
+
+    deltas = defaultdict(lambda: [0, 0.0])
+    # Set-based writers stamp a whole batch with one created_at; convert
+    # each distinct timestamp to a local day once.
+    days = {}
+    weighted = chain(
+        ((before, after, 1) for before, after in changes),
+        ((None, row, count) for row, count in inserted),
+    )
+    for before, after, weight in weighted:
+        if any(row is not None and not all(column in row for column in ROLLUP_COLUMNS) for row in (before, after)):
+            continue
+        for row, sign in ((before, -weight), (after, weight)):
+            if row is None:
+                continue
+            created_at = row['created_at']
+            if created_at not in days:
+                days[created_at] = timezone.localdate(created_at)
+            key = (
+                days[created_at],
+                row['assigned_team_id'] or UNASSIGNED_TEAM,
+                row['equipment_id'],
+                row['status'],
+                row['request_type'],
+            )
+            deltas[key][0] += sign
+            deltas[key][1] += sign * (row['duration_hours'] or 0.0)
+    return {key: delta for key, delta in deltas.items() if delta[0] or delta[1]}
+
+
+def add_to_rollup(key, count, hours):
+    rollups = RequestRollup.objects.filter(**key)
+    changes = {'count': F('count') + count, 'duration_hours': F('duration_hours') + hours}
+    if rollups.update(**changes):
+        return
+    try:
+        with transaction.atomic():
+            RequestRollup.objects.create(**key, count=count, duration_hours=hours)
+    except IntegrityError:
+        # Another writer created the row since the UPDATE above.
+        rollups.update(**changes)
+
+
+def apply_request_changes(changes, inserted=()):
+    """
+    Applies (before, after) request rows and (row, count) groups of
+    inserted rows to the rollups inside the caller's transaction, with a
+    fixed number of queries however many rows changed: one department lookup, one locking read of the affected rollups, one
+    bulk UPDATE and one bulk INSERT for new keys.
+
+    Departments are read from the equipment at write time; moving equipment
+    to another department leaves its past rollups under the old one until
+    the next rebuild.
+    """
+
+    deltas = rollup_deltas(changes, inserted)
+    if not deltas:
+        return
+    departments = dict(
+        Equipment.objects.filter(id__in={key[2] for key in deltas}).values_list('id', 'department_id')
+    )
+    with transaction.atomic():
+        locked = RequestRollup.objects.select_for_update().filter(
+            day__in={key[0] for key in deltas}, equipment_id__in={key[2] for key in deltas},
+        )
+        existing = {tuple(getattr(rollup, field) for field in ROLLUP_KEY): rollup for rollup in locked}
+
+        updated, created = [], []
+        for (day, team_id, equipment_id, status, request_type), (count, hours) in deltas.items():
+            key = (day, team_id, equipment_id, departments.get(equipment_id, 0), status, request_type)
+            rollup = existing.get(key)
+            if rollup is None:
+                created.append(RequestRollup(**dict(zip(ROLLUP_KEY, key)), count=count, duration_hours=hours))
+            else:
+                rollup.count += count
+                rollup.duration_hours += hours
+                updated.append(rollup)
+
+        if updated:
+            RequestRollup.objects.bulk_update(updated, ['count', 'duration_hours'])
+        if created:
+            try:
+                with transaction.atomic():
+                    RequestRollup.objects.bulk_create(created)
+            except IntegrityError:
+                # A concurrent writer created some of these keys first.
+                for rollup in created:
+                    key = {field: getattr(rollup, field) for field in ROLLUP_KEY}
+                    add_to_rollup(key, rollup.count, rollup.duration_hours)
+
+
+def day_start(day):
+    return timezone.make_aware(datetime.combine(day, time.min))
+
+
+def rebuild_rollups(chunk_days=REBUILD_CHUNK_DAYS):
+    """
+    Recomputes every rollup from MaintenanceRequest in one transaction,
+    ``chunk_days`` days of creation time per GROUP BY query, so neither the
+    database nor this process ever holds more than one window of groups.
+    Readers keep seeing the previous rollups until it commits. Returns the
+    number of rollup rows written.
+    """
+
+    written = 0
+    with transaction.atomic():
+        invalidate('requests')
+        RequestRollup.objects.all().delete()
+        bounds = MaintenanceRequest.objects.aggregate(first=Min('created_at'), last=Max('created_at'))
+        if bounds['first'] is None:
+            return 0
+        day = timezone.localdate(bounds['first'])
+        last_day = timezone.localdate(bounds['last'])
+        while day <= last_day:
+            until = day + timedelta(days=chunk_days)
+            groups = (
+                MaintenanceRequest.objects
+                .filter(created_at__gte=day_start(day), created_at__lt=day_start(until))
+                .values(
+                    'equipment_id', 'status', 'request_type',
+                    rollup_day=TruncDate('created_at'),
+                    rollup_team_id=Coalesce('assigned_team_id', UNASSIGNED_TEAM),
+                    rollup_department_id=F('equipment__department_id'),
+                )
+                .annotate(total=Count('id'), hours=Sum(Coalesce('duration_hours', 0.0)))
+                .order_by()
+            )
+            rollups = [
+                RequestRollup(
+                    day=group['rollup_day'],
+                    team_id=group['rollup_team_id'],
+                    equipment_id=group['equipment_id'],
+                    department_id=group['rollup_department_id'],
+                    status=group['status'],
+                    request_type=group['request_type'],
+                    count=group['total'],
+                    duration_hours=group['hours'] or 0.0,
+                )
+                for group in groups
+            ]
+            RequestRollup.objects.bulk_create(rollups, batch_size=1000)
+            written += len(rollups)
+            day = until
+    return written
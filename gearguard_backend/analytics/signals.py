@@ -0,0 +1,65 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from equipment.events import equipment_changed
+from equipment.models import Equipment
+from maintenance.events import requests_changed
+from maintenance.models import MaintenanceRequest
+from teams.models import MaintenanceTeam
+from users.models import GearguardUser
+from .cache import invalidate
+from .rollups import apply_request_changes
+
+
+@receiver(post_save, sender=MaintenanceRequest)
+def request_saved(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    invalidate('requests')
+    before = None if created else getattr(instance, '_loaded_values', None)
+    if created or before is not None:
+        apply_request_changes([(before, instance.snapshot())])
+
+
+@receiver(pre_delete, sender=MaintenanceRequest)
+def request_deleted(sender, instance, **kwargs):
+    invalidate('requests')
+    apply_request_changes([(instance.snapshot(), None)])
+
+
+@receiver(requests_changed, sender=MaintenanceRequest)
+def requests_written(sender, changes=(), inserted=(), **kwargs):
+    invalidate('requests')
+    apply_request_changes(changes, inserted)
+
+
+# Result cache invalidation for the other domains analytics reads.
+CACHE_DOMAINS = {
+    Equipment: 'equipment',
+    MaintenanceTeam: 'teams',
+    GearguardUser: 'users',
+}
+
+
+@receiver(post_save, sender=Equipment)
+@receiver(post_save, sender=MaintenanceTeam)
+@receiver(post_save, sender=GearguardUser)
+@receiver(post_delete, sender=Equipment)
+@receiver(post_delete, sender=MaintenanceTeam)
+@receiver(post_delete, sender=GearguardUser)
+def model_written(sender, raw=False, update_fields=None, **kwargs):
+    # Logins save last_login only, which no analytics result reads.
+    if raw or update_fields == frozenset({'last_login'}):
+        return
+    invalidate(CACHE_DOMAINS[sender])
+
+
+@receiver(equipment_changed, sender=Equipment)
+def equipment_written(sender, **kwargs):
+    invalidate('equipment')
+
+
+@receiver(m2m_changed, sender=MaintenanceTeam.members.through)
+def team_members_changed(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate('teams')
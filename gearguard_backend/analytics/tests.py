@@ -1,3 +1,483 @@
-from django.test import TestCase
+import json
+import random
+import threading
+from datetime import date, datetime, timedelta, timezone as dt_timezone
+from importlib import import_module
+from types import SimpleNamespace
+from unittest import mock, skipUnless
+
+import numpy as np
+from django.apps import apps as django_apps
+from django.db import DatabaseError, connection
+from django.db.backends.signals import connection_created
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from departements.models import Department
+from equipment.models import Equipment
+from maintenance.dispatch import bulk_assign
+from maintenance.models import ArchivedMaintenanceLog, MaintenanceLog, MaintenanceRequest, RecurrenceRule
+from maintenance.recurrence import generate_preventive_requests
+from maintenance.transitions import transition
+from teams.models import MaintenanceTeam
+from users.models import GearguardUser
+from equipment.bulk import bulk_update_equipment
+from .cache import analytics_cache, cache_stats, versions
+from .dashboard import DASHBOARD_WORKERS, can_run_in_parallel, dashboard_summary, run_queries, shutdown_workers
+from .models import RequestRollup
+from .reliability import load_failures, reliability
+from .rollups import rebuild_rollups
 
 # Create your tests here.
+
+
+def rollup_table():
+    return {
+        (row.day, row.team_id, row.equipment_id, row.department_id, row.status, row.request_type): (row.count, row.duration_hours)
+        for row in RequestRollup.objects.exclude(count=0)
+    }
+
+
+class AnalyticsCacheMixin:
+
+    def setUp(self):
+        super().setUp()
+        analytics_cache().clear()
+        cache_stats.reset()
+
+
+class RollupFixtureMixin:
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.departments = [Department.objects.create(name=name) for name in ('Production', 'Logistics')]
+        cls.teams = [MaintenanceTeam.objects.create(name=name) for name in ('Mechanics', 'Electricians')]
+        cls.equipment = [
+            Equipment.objects.create(
+                name=f'Machine {i}', serial_number=f'SN-{i}', department=cls.departments[i % 2],
+                location='Plant A', purchase_date=date(2024, 1, 1), warranty_expiry=date(2027, 1, 1),
+            )
+            for i in range(3)
+        ]
+        cls.requests = [
+            MaintenanceRequest.objects.create(
+                subject=f'Request {i}', equipment=cls.equipment[i % 3], assigned_team=cls.teams[i % 2],
+                request_type='corrective' if i % 3 else 'preventive', duration_hours=i or None,
+            )
+            for i in range(8)
+        ]
+
+
+class IncrementalRollupTests(RollupFixtureMixin, TestCase):
+
+    def assertMatchesRebuild(self):
+        incremental = rollup_table()
+        rebuild_rollups()
+        self.assertEqual(incremental, rollup_table())
+
+    def test_creates_are_counted(self):
+        self.assertEqual(sum(count for count, _ in rollup_table().values()), 8)
+        self.assertMatchesRebuild()
+
+    def test_saves_transitions_bulk_writes_and_deletes_stay_in_sync(self):
+        request = MaintenanceRequest.objects.get(pk=self.requests[0].pk)
+        request.status = 'repaired'
+        request.duration_hours = 3.5
+        request.save()
+        transition(MaintenanceRequest.objects.all(), self.requests[1].id, 'in_progress', assigned_team_id=None)
+        bulk_assign(MaintenanceRequest.objects.all(), {self.requests[2].id: (self.teams[0].id, None)})
+        MaintenanceRequest.objects.filter(pk__in=[self.requests[3].pk, self.requests[4].pk]).delete()
+        RecurrenceRule.objects.create(subject='Oil', equipment=self.equipment[1], interval=30, start_date=date(2026, 1, 1))
+        generate_preventive_requests(horizon_days=60, today=date(2026, 1, 1))
+        self.assertMatchesRebuild()
+
+    def test_occurrences_lost_to_a_concurrent_run_are_not_counted(self):
+        RecurrenceRule.objects.create(subject='Oil', equipment=self.equipment[1], interval=30, start_date=date(2026, 1, 1))
+        generate_preventive_requests(horizon_days=60, today=date(2026, 1, 1))
+        # A second run that read before the first committed tries every
+        # occurrence again and loses all of them to the unique constraint.
+        with mock.patch('maintenance.recurrence.existing_occurrences', return_value=set()):
+            report = generate_preventive_requests(horizon_days=90, today=date(2026, 1, 1))
+        self.assertEqual((report['created'], report['existing']), (1, 3))
+        self.assertMatchesRebuild()
+
+    def test_deleting_a_team_or_user_restamps_requests_and_moves_rollups(self):
+        technician = GearguardUser.objects.create_user(username='tech', password='pw', role='technician')
+        MaintenanceRequest.objects.filter(pk=self.requests[0].pk).update(assigned_to=technician, created_by=technician)
+        seq = MaintenanceRequest.objects.get(pk=self.requests[0].pk).change_seq
+        requests_version = versions(['requests'])['requests']
+        team = MaintenanceTeam.objects.get(pk=self.teams[1].pk)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            team.delete()
+            technician.delete()
+
+        self.assertEqual(versions(['requests'])['requests'], requests_version + 2)
+        first = MaintenanceRequest.objects.get(pk=self.requests[0].pk)
+        self.assertEqual((first.assigned_team_id, first.assigned_to_id, first.created_by_id), (self.teams[0].id, None, None))
+        self.assertEqual(first.version, 1)
+        second = MaintenanceRequest.objects.get(pk=self.requests[1].pk)
+        self.assertIsNone(second.assigned_team_id)
+        self.assertGreater(min(first.change_seq, second.change_seq), seq)
+        self.assertFalse(MaintenanceRequest.objects.filter(assigned_team_id=self.teams[1].id).exists())
+        self.assertMatchesRebuild()
+
+    def test_unchanged_columns_cost_no_rollup_queries(self):
+        request = MaintenanceRequest.objects.get(pk=self.requests[5].pk)
+        request.description = 'Only the text changed'
+        # Savepoint, change sequence value (a counter bump and read outside
+        # PostgreSQL), UPDATE, release.
+        with self.assertNumQueries(3 + (1 if connection.vendor == 'postgresql' else 2)):
+            request.save()
+
+
+class RollupEndpointTests(AnalyticsCacheMixin, RollupFixtureMixin, TestCase):
+
+    def test_summary_reads_one_aggregate(self):
+        with self.assertNumQueries(1):
+            body = self.client.get('/analytics/requests/summary/').json()
+        self.assertEqual(body['total'], 8)
+        self.assertEqual(body['by_status']['new'], 8)
+        self.assertEqual(body['by_type'], {'corrective': 5, 'preventive': 3})
+        self.assertEqual(body['duration_hours'], sum(range(8)))
+
+    def test_summary_filters(self):
+        body = self.client.get('/analytics/requests/summary/', {'department': self.departments[1].id}).json()
+        self.assertEqual(body['total'], 3)
+        self.assertEqual(self.client.get('/analytics/requests/summary/?start=nope').status_code, 400)
+        self.assertEqual(self.client.get('/analytics/requests/summary/?team=x').status_code, 400)
+
+    def test_breakdown_by_team(self):
+        transition(MaintenanceRequest.objects.all(), self.requests[1].id, 'in_progress', assigned_team_id=None)
+        body = self.client.get('/analytics/requests/breakdown/', {'by': 'team'}).json()
+        counts = {row['key']: row['count'] for row in body['results']}
+        self.assertEqual(counts, {0: 1, self.teams[0].id: 4, self.teams[1].id: 3})
+        self.assertEqual(self.client.get('/analytics/requests/breakdown/?by=color').status_code, 400)
+
+
+class ReliabilityTests(AnalyticsCacheMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.departments = [Department.objects.create(name=name) for name in ('Production', 'Logistics')]
+        cls.equipment = [
+            Equipment.objects.create(
+                name=f'Machine {i}', serial_number=f'SN-{i}', department=cls.departments[i],
+                location='Plant A', purchase_date=date(2024, 1, 1), warranty_expiry=date(2027, 1, 1),
+            )
+            for i in range(2)
+        ]
+        start = datetime(2026, 3, 1, tzinfo=dt_timezone.utc)
+        # Machine 0 fails at +0h, +10h and +30h; machine 1 once.
+        failures = [(0, 0, 2.0), (0, 10, None), (0, 30, None), (1, 5, 6.0)]
+        cls.requests = []
+        for index, offset, hours in failures:
+            request = MaintenanceRequest.objects.create(
+                subject='Broken', equipment=cls.equipment[index], request_type='corrective', duration_hours=hours,
+            )
+            MaintenanceRequest.objects.filter(pk=request.pk).update(created_at=start + timedelta(hours=offset))
+            cls.requests.append(request)
+        MaintenanceRequest.objects.create(subject='Service', equipment=cls.equipment[1], request_type='preventive', duration_hours=50)
+        # Without duration_hours, repair time runs until repaired_at.
+        MaintenanceRequest.objects.filter(pk=cls.requests[1].pk).update(repaired_at=start + timedelta(hours=14))
+        MaintenanceRequest.objects.filter(pk=cls.requests[2].pk).update(repaired_at=start + timedelta(hours=31))
+
+    def test_per_equipment_and_department(self):
+        failures = load_failures()
+        by_equipment = {row['id']: row for row in reliability(failures)}
+        self.assertEqual(by_equipment[self.equipment[0].id], {
+            'id': self.equipment[0].id, 'department_id': self.departments[0].id,
+            'failures': 3, 'repairs': 3, 'mttr_hours': round(7 / 3, 3), 'mtbf_hours': 15.0,
+        })
+        self.assertEqual(by_equipment[self.equipment[1].id]['mtbf_hours'], None)
+        self.assertEqual(by_equipment[self.equipment[1].id]['mttr_hours'], 6.0)
+        overall = reliability(failures, by=None)[0]
+        self.assertEqual((overall['failures'], overall['mttr_hours'], overall['mtbf_hours']), (4, 3.25, 15.0))
+        self.assertEqual(reliability(load_failures(MaintenanceRequest.objects.none())), [])
+
+    def test_repair_time_follows_the_transition(self):
+        request = MaintenanceRequest.objects.create(
+            subject='Broken', equipment=self.equipment[1], request_type='corrective', status='in_progress',
+        )
+        transition(MaintenanceRequest.objects.all(), request.pk, 'repaired')
+        transition(MaintenanceRequest.objects.all(), request.pk, 'in_progress')
+        first = MaintenanceRequest.objects.get(pk=request.pk).repaired_at
+        transition(MaintenanceRequest.objects.all(), request.pk, 'repaired')
+        # A repeated repair keeps the first one.
+        self.assertEqual(MaintenanceRequest.objects.get(pk=request.pk).repaired_at, first)
+
+        saved = MaintenanceRequest.objects.create(
+            subject='Broken', equipment=self.equipment[1], request_type='corrective', status='in_progress',
+        )
+        saved.status = 'repaired'
+        saved.save(update_fields=['status'])
+        self.assertIsNotNone(MaintenanceRequest.objects.get(pk=saved.pk).repaired_at)
+
+    def test_migration_backfills_repaired_at_from_logs(self):
+        backfill = import_module('maintenance.migrations.0015_request_repaired_at').backfill_repaired_at
+        start = datetime(2026, 3, 1, tzinfo=dt_timezone.utc)
+        MaintenanceRequest.objects.update(repaired_at=None)
+        MaintenanceLog.objects.create(
+            maintenance_request=self.requests[1], action='Status in_progress -> repaired; Unassigned technician',
+            timestamp=start + timedelta(hours=14),
+        )
+        # Not status changes: neither may stand in for the repair.
+        MaintenanceLog.objects.create(
+            maintenance_request=self.requests[1], action='Assigned to team 1', timestamp=start + timedelta(hours=11),
+        )
+        MaintenanceLog.objects.create(
+            maintenance_request=self.requests[2], action='Note: Status new -> repaired', timestamp=start + timedelta(hours=30),
+        )
+        ArchivedMaintenanceLog.objects.create(
+            id=10 ** 6, maintenance_request_id=self.requests[2].id, action='Status new -> repaired', timestamp=start + timedelta(hours=31),
+        )
+        backfill(django_apps, SimpleNamespace(connection=connection))
+        self.assertEqual(
+            [MaintenanceRequest.objects.get(pk=request.pk).repaired_at for request in self.requests],
+            [None, start + timedelta(hours=14), start + timedelta(hours=31), None],
+        )
+
+    def test_date_bounds_cover_whole_days(self):
+        MaintenanceRequest.objects.filter(pk=self.requests[3].pk).update(
+            created_at=datetime(2026, 3, 5, 23, 30, tzinfo=dt_timezone.utc),
+        )
+        body = self.client.get('/analytics/reliability/', {'start': '2026-03-05', 'end': '2026-03-05'}).json()
+        self.assertEqual(body['overall']['failures'], 1)
+        body = self.client.get('/analytics/reliability/', {'start': '2026-03-06'}).json()
+        self.assertEqual(body['overall'], None)
+
+    def test_matches_a_per_request_computation(self):
+        rng = random.Random(7)
+        size = 2000
+        failures = {
+            'equipment': np.array([rng.randrange(40) for _ in range(size)], dtype=np.int64),
+            'created': np.array([rng.uniform(0, 1e7) for _ in range(size)]),
+            'repair_hours': np.array([rng.choice([np.nan, rng.uniform(0, 50)]) for _ in range(size)]),
+        }
+        failures['department'] = failures['equipment'] % 3
+
+        expected = {}
+        for equipment_id in set(failures['equipment'].tolist()):
+            mask = failures['equipment'] == equipment_id
+            created = sorted(failures['created'][mask].tolist())
+            repairs = [hours for hours in failures['repair_hours'][mask].tolist() if hours == hours]
+            gaps = [(b - a) / 3600 for a, b in zip(created, created[1:])]
+            expected[equipment_id] = (
+                len(created),
+                round(sum(repairs) / len(repairs), 3) if repairs else None,
+                round(sum(gaps) / len(gaps), 3) if gaps else None,
+            )
+        actual = {row['id']: (row['failures'], row['mttr_hours'], row['mtbf_hours']) for row in reliability(failures)}
+        self.assertEqual(actual, expected)
+
+    def test_endpoint(self):
+        with self.assertNumQueries(1):
+            body = self.client.get('/analytics/reliability/', {'by': 'department', 'sort': '-mttr_hours'}).json()
+        self.assertEqual(body['overall']['failures'], 4)
+        self.assertEqual([row['id'] for row in body['results']], [self.departments[1].id, self.departments[0].id])
+
+        body = self.client.get('/analytics/reliability/', {'department': self.departments[1].id}).json()
+        self.assertEqual([row['id'] for row in body['results']], [self.equipment[1].id])
+        body = self.client.get('/analytics/reliability/', {'end': '2000-01-01'}).json()
+        self.assertEqual((body['overall'], body['results']), (None, []))
+        self.assertEqual(self.client.get('/analytics/reliability/?by=team').status_code, 400)
+        self.assertEqual(self.client.get('/analytics/reliability/?sort=name').status_code, 400)
+
+
+class DashboardFixtureMixin(AnalyticsCacheMixin):
+
+    @classmethod
+    def setUpTestData(cls):
+        department = Department.objects.create(name='Production')
+        cls.teams = [MaintenanceTeam.objects.create(name=name) for name in ('Mechanics', 'Electricians')]
+        users = [
+            GearguardUser.objects.create_user(username=f'user{i}', password='x', role=role)
+            for i, role in enumerate(['technician', 'technician', 'technician', 'manager', 'admin'])
+        ]
+        cls.teams[0].members.set(users[:2] + [users[3]])
+        cls.teams[1].members.set(users[2:3])
+        equipment = [
+            Equipment.objects.create(
+                name=f'Machine {i}', serial_number=f'SN-{i}', department=department, is_scrapped=i == 2,
+                location='Plant A', purchase_date=date(2024, 1, 1), warranty_expiry=date(2027, 1, 1),
+            )
+            for i in range(3)
+        ]
+        # (team, status, scheduled date)
+        requests = [
+            (0, 'new', date(2026, 1, 1)),
+            (0, 'in_progress', date(2026, 1, 1)),
+            (0, 'in_progress', date(2026, 6, 1)),
+            (0, 'repaired', date(2026, 1, 1)),
+            (1, 'new', None),
+            (None, 'new', date(2026, 1, 1)),
+            (None, 'scrap', None),
+        ]
+        for team, status, scheduled in requests:
+            MaintenanceRequest.objects.create(
+                subject='Work', equipment=equipment[0], status=status, scheduled_date=scheduled,
+                assigned_team=cls.teams[team] if team is not None else None,
+            )
+
+
+
+class DashboardTests(DashboardFixtureMixin, TestCase):
+
+    def test_summary(self):
+        summary = dashboard_summary(today=date(2026, 3, 1))
+        self.assertEqual(summary['requests'], {
+            'new': 3, 'in_progress': 2, 'repaired': 1, 'scrap': 1, 'overdue': 3, 'open': 5, 'unassigned_backlog': 1,
+        })
+        self.assertEqual(summary['equipment'], {'total': 3, 'scrapped': 1, 'active': 2})
+        self.assertEqual(summary['users'], {'total': 5, 'admin': 1, 'manager': 1, 'technician': 3})
+        self.assertEqual(summary['teams'], [
+            {'id': self.teams[0].id, 'name': 'Mechanics', 'technicians': 2, 'members': 3, 'backlog': 3, 'in_progress': 2, 'overdue': 2},
+            {'id': self.teams[1].id, 'name': 'Electricians', 'technicians': 1, 'members': 1, 'backlog': 1, 'in_progress': 0, 'overdue': 0},
+        ])
+        self.assertEqual(len(dashboard_summary(team_limit=1)['teams']), 1)
+
+    def test_endpoint_is_five_queries_and_small(self):
+        with self.assertNumQueries(5):
+            response = self.client.get('/analytics/dashboard/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content)['teams_total'], 2)
+        self.assertLess(len(response.content), 4096)
+
+    def test_parallel_runner(self):
+        # Tests run inside a transaction on SQLite: queries stay on this connection.
+        self.assertFalse(can_run_in_parallel())
+        results = run_queries({'answer': lambda: 42, 'thread': lambda: threading.current_thread().name}, parallel=True)
+        self.assertEqual(results['answer'], 42)
+        self.assertTrue(results['thread'].startswith('analytics-query'))
+
+
+@override_settings(MAINTENANCE_LOG_CAPTURE=False)
+class ParallelDashboardTests(DashboardFixtureMixin, TransactionTestCase):
+    """
+    Worker threads have their own connections and only see committed rows,
+    so this runs outside a test transaction.
+    """
+
+    def setUp(self):
+        super().setUp()
+        type(self).setUpTestData()
+        self.addCleanup(shutdown_workers)
+        self.opened = []
+        receiver = lambda sender, connection, **kwargs: self.opened.append(threading.current_thread().name)
+        connection_created.connect(receiver, weak=False)
+        self.addCleanup(connection_created.disconnect, receiver)
+
+    def test_parallel_summary_matches_sequential_and_keeps_worker_connections(self):
+        today = date(2026, 3, 1)
+        expected = dashboard_summary(today=today, parallel=False)
+        with mock.patch.dict(connection.settings_dict, {'CONN_MAX_AGE': 60}):
+            for _ in range(5):
+                self.assertEqual(dashboard_summary(today=today, parallel=True), expected)
+        # One connection per worker thread, however many hits.
+        self.assertTrue(all(name.startswith('analytics-query') for name in self.opened))
+        self.assertEqual(len(self.opened), len(set(self.opened)))
+        self.assertLessEqual(len(self.opened), DASHBOARD_WORKERS)
+
+    @skipUnless(connection.vendor == 'postgresql', 'SQLite keeps in-memory test databases open')
+    def test_worker_connections_follow_conn_max_age(self):
+        with mock.patch.dict(connection.settings_dict, {'CONN_MAX_AGE': 0}):
+            for _ in range(2):
+                dashboard_summary(parallel=True)
+        # Closed after every query, like a request thread's connection.
+        self.assertEqual(len(self.opened), 10)
+
+    def test_worker_recovers_after_a_failed_query(self):
+        def broken():
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT * FROM no_such_table')
+
+        with self.assertRaises(DatabaseError):
+            run_queries({name: broken for name in ('a', 'b', 'c', 'd')}, parallel=True)
+        self.assertEqual(dashboard_summary(parallel=True)['equipment']['total'], 3)
+
+
+class AnalyticsCacheTests(DashboardFixtureMixin, TestCase):
+
+    def dashboard(self):
+        return self.client.get('/analytics/dashboard/').json()
+
+    def test_repeat_requests_are_served_from_cache(self):
+        first = self.dashboard()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.dashboard(), first)
+        stats = self.client.get('/analytics/cache/stats/').json()
+        self.assertEqual(stats['results']['dashboard'], {'hits': 1, 'misses': 1, 'hit_ratio': 0.5})
+
+    def test_writes_retire_cached_results_on_commit(self):
+        request = MaintenanceRequest.objects.filter(status='new', assigned_team__isnull=True).get()
+        technician = GearguardUser.objects.filter(role='technician').first()
+        writes = [
+            (lambda: Equipment.objects.filter(is_scrapped=False).first().save(), 'equipment'),
+            (lambda: bulk_update_equipment(Equipment.objects.all(), {'is_scrapped': True}), 'equipment'),
+            (lambda: transition(MaintenanceRequest.objects.all(), request.id, 'in_progress'), 'requests'),
+            (lambda: self.teams[1].members.add(technician), 'teams'),
+            (lambda: GearguardUser.objects.create_user(username='new', password='x', role='manager'), 'users'),
+        ]
+        for write, domain in writes:
+            self.dashboard()
+            with self.captureOnCommitCallbacks(execute=True):
+                write()
+            with self.assertNumQueries(5, msg=domain):
+                self.dashboard()
+        summary = self.dashboard()
+        self.assertEqual(summary['equipment']['scrapped'], 3)
+        self.assertEqual(summary['requests']['in_progress'], 3)
+        self.assertEqual(summary['users']['manager'], 2)
+
+    def test_login_does_not_retire_results(self):
+        self.dashboard()
+        user = GearguardUser.objects.get(username='user0')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.force_login(user)
+        self.assertIsNotNone(GearguardUser.objects.get(pk=user.pk).last_login)
+        with self.assertNumQueries(0):
+            self.dashboard()
+
+
+class WorkloadHeatmapTests(AnalyticsCacheMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        department = Department.objects.create(name='Production')
+        cls.teams = [MaintenanceTeam.objects.create(name=name) for name in ('Mechanics', 'Electricians', 'Idle')]
+        equipment = Equipment.objects.create(
+            name='Machine', serial_number='SN-1', department=department,
+            location='Plant A', purchase_date=date(2024, 1, 1), warranty_expiry=date(2027, 1, 1),
+        )
+        # (team, scheduled date, hours, status); 2026-03-02 is a Monday.
+        work = [
+            (0, date(2026, 3, 2), 2.0, 'new'),
+            (0, date(2026, 3, 8), 1.5, 'new'),
+            (0, date(2026, 3, 16), None, 'repaired'),
+            (1, date(2026, 3, 10), 4.0, 'in_progress'),
+            (1, date(2026, 5, 1), 9.0, 'new'),
+            (None, date(2026, 3, 3), 3.0, 'new'),
+        ]
+        for team, scheduled, hours, status in work:
+            MaintenanceRequest.objects.create(
+                subject='Work', equipment=equipment, scheduled_date=scheduled, duration_hours=hours, status=status,
+                assigned_team=cls.teams[team] if team is not None else None,
+            )
+
+    def test_dense_columnar_matrix_from_one_query(self):
+        with self.assertNumQueries(1):
+            body = self.client.get('/analytics/workload/heatmap/', {'start': '2026-03-04', 'end': '2026-03-22'}).json()
+        self.assertEqual(body, {
+            'teams': [self.teams[0].id, self.teams[1].id],
+            'weeks': ['2026-03-02', '2026-03-09', '2026-03-16'],
+            'counts': [1, 0, 1, 0, 1, 0],
+            'duration_hours': [1.5, 0.0, 0.0, 0.0, 4.0, 0.0],
+        })
+
+    def test_filters(self):
+        params = {'start': '2026-03-02', 'end': '2026-03-22', 'status': 'new,in_progress', 'team': self.teams[0].id}
+        body = self.client.get('/analytics/workload/heatmap/', params).json()
+        self.assertEqual((body['teams'], body['counts']), ([self.teams[0].id], [2, 0, 0]))
+        self.assertEqual(len(self.client.get('/analytics/workload/heatmap/').json()['weeks']), 12)
+        for params in ({'start': 'x'}, {'team': 'x'}, {'status': 'lost'},
+                       {'start': '2026-03-09', 'end': '2026-03-01'}, {'start': '2020-01-01', 'end': '2026-01-01'}):
+            self.assertEqual(self.client.get('/analytics/workload/heatmap/', params).status_code, 400)
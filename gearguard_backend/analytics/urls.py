@@ -1,5 +1,11 @@
 from django.urls import path
+from .views import *
 
 urlpatterns = [
-
-]
\ No newline at end of file
+    path('requests/summary/', request_summary_view, name='analytics-request-summary'),
+    path('requests/breakdown/', request_breakdown_view, name='analytics-request-breakdown'),
+    path('reliability/', reliability_view, name='analytics-reliability'),
+    path('dashboard/', dashboard_view, name='analytics-dashboard'),
+    path('workload/heatmap/', workload_heatmap_view, name='analytics-workload-heatmap'),
+    path('cache/stats/', cache_stats_view, name='analytics-cache-stats'),
+]
@@ -1,3 +1,261 @@
-from django.shortcuts import render
+from datetime import timedelta
+
+from django.db.models import Q, Sum
+from django.http import JsonResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django.views.decorators.csrf import csrf_exempt
+from gearguard_backend.pagination import parse_limit, parse_sort
+from maintenance.aggregates import STATUSES, TYPES
+from maintenance.models import MaintenanceRequest
+from .cache import DOMAINS, cache_stats, cached_result, versions
+from .dashboard import dashboard_summary
+from .models import RequestRollup
+from .reliability import load_failures, reliability
+from .rollups import day_start
+from .workload import DEFAULT_HEATMAP_WEEKS, MAX_HEATMAP_WEEKS, team_week_heatmap, week_start
+
+
+# Query parameters that narrow a rollup read, mapped to rollup columns.
+ROLLUP_ID_FILTERS = {
+    'team': 'team_id',
+    'department': 'department_id',
+    'equipment': 'equipment_id',
+}
+
+# ?by= values accepted by the breakdown view.
+ROLLUP_GROUPS = {
+    'day': 'day',
+    'team': 'team_id',
+    'department': 'department_id',
+    'equipment': 'equipment_id',
+    'status': 'status',
+    'type': 'request_type',
+}
+
+# ?by= values and ?sort= keys accepted by the reliability view.
+RELIABILITY_GROUPS = ('equipment', 'department')
+RELIABILITY_SORTS = ('failures', 'mttr_hours', 'mtbf_hours')
+
+
+def filter_rollups(params):
+    """
+    Applies ?start=/?end= (inclusive ISO dates of request creation) and the
+    ROLLUP_ID_FILTERS to the rollup table. Raises ValueError on bad input.
+    """
+
+    rollups=RequestRollup.objects.all()
+    for param,lookup in (('start','day__gte'),('end','day__lte')):
+        value=params.get(param)
+        if value:
+            day=parse_date(value)
+            if day is None:
+                raise ValueError(f'{param} must be an ISO date')
+            rollups=rollups.filter(**{lookup:day})
+    for param,column in ROLLUP_ID_FILTERS.items():
+        value=params.get(param)
+        if value not in (None,''):
+            rollups=rollups.filter(**{column:int(value)})
+    return rollups
+
+
+def rollup_totals(rollups):
+    """
+    Total count and duration plus per-status and per-type counts, from one
+    conditional aggregate over the (already filtered) rollups.
+    """
+
+    sums={'total':Sum('count'),'duration_hours':Sum('duration_hours')}
+    sums.update({f'status_{status}':Sum('count',filter=Q(status=status)) for status in STATUSES})
+    sums.update({f'type_{request_type}':Sum('count',filter=Q(request_type=request_type)) for request_type in TYPES})
+    row=rollups.aggregate(**sums)
+    return {
+        'total':row['total'] or 0,
+        'duration_hours':row['duration_hours'] or 0.0,
+        'by_status':{status:row[f'status_{status}'] or 0 for status in STATUSES},
+        'by_type':{request_type:row[f'type_{request_type}'] or 0 for request_type in TYPES},
+    }
+
+
+def parse_day(params, name, default):
+    """
+    Reads an ISO date query parameter, or ``default`` when it is absent.
+    Raises ValueError on bad input.
+    """
+
+    value=params.get(name)
+    if not value:
+        return default
+    day=parse_date(value)
+    if day is None:
+        raise ValueError(f'{name} must be an ISO date')
+    return day
+
+
+def filter_failures(params):
+    """
+    Applies ?start=/?end= (inclusive ISO dates of request creation),
+    ?department= and ?equipment= to maintenance requests. Raises ValueError
+    on bad input.
+
+    The dates become an aware [start, end + 1 day) range on created_at, so
+    the filter is a range scan of request_created_idx rather than a
+    per-row date conversion.
+    """
+
+    requests=MaintenanceRequest.objects.all()
+    for param,lookup,offset in (('start','created_at__gte',0),('end','created_at__lt',1)):
+        value=params.get(param)
+        if value:
+            day=parse_date(value)
+            if day is None:
+                raise ValueError(f'{param} must be an ISO date')
+            requests=requests.filter(**{lookup:day_start(day+timedelta(days=offset))})
+    for param,lookup in (('department','equipment__department_id'),('equipment','equipment_id')):
+        value=params.get(param)
+        if value not in (None,''):
+            requests=requests.filter(**{lookup:int(value)})
+    return requests
 
 # Create your views here.
+
+@csrf_exempt
+def request_summary_view(request):
+    """
+    Maintenance request totals read from the rollup table.
+    Query params : start, end (creation dates), team (0 = unassigned), department, equipment
+    Returns total, duration_hours, by_status and by_type.
+    """
+
+    if not request.method=='GET':
+        return JsonResponse({'error':'Invalid HTTP method'},status=405)
+
+    try:
+        rollups=filter_rollups(request.GET)
+    except ValueError as e:
+        return JsonResponse({'error':str(e)},status=400)
+
+    data=cached_result('request_summary',('requests',),lambda:rollup_totals(rollups),request.GET.dict())
+    return JsonResponse(data,status=200)
+
+@csrf_exempt
+def request_breakdown_view(request):
+    """
+    Maintenance request counts grouped by one rollup dimension.
+    Query params : by (day, team, department, equipment, status or type), plus the summary filters
+    Returns one row per group: key, count, duration_hours; groups that net to zero are left out.
+    """
+
+    if not request.method=='GET':
+        return JsonResponse({'error':'Invalid HTTP method'},status=405)
+
+    column=ROLLUP_GROUPS.get(request.GET.get('by','day'))
+    if column is None:
+        return JsonResponse({'error':f'by must be one of {", ".join(ROLLUP_GROUPS)}'},status=400)
+    try:
+        rollups=filter_rollups(request.GET)
+    except ValueError as e:
+        return JsonResponse({'error':str(e)},status=400)
+
+    def breakdown():
+        groups=rollups.values(column).annotate(total=Sum('count'),hours=Sum('duration_hours')).order_by(column)
+        return [
+            {'key':group[column],'count':group['total'],'duration_hours':group['hours']}
+            for group in groups if group['total']
+        ]
+
+    data=cached_result('request_breakdown',('requests',),breakdown,request.GET.dict())
+    return JsonResponse({'by':request.GET.get('by','day'),'results':data},status=200)
+
+@csrf_exempt
+def reliability_view(request):
+    """
+    MTTR and MTBF (hours) from corrective requests, per equipment or department.
+    Query params : by (equipment or department), start, end (creation dates), department, equipment,
+                   sort (failures, mttr_hours, mtbf_hours; prefix - for descending), limit
+    Returns the fleet-wide figures and the top groups; groups without a value sort last.
+    """
+
+    if not request.method=='GET':
+        return JsonResponse({'error':'Invalid HTTP method'},status=405)
+
+    by=request.GET.get('by','equipment')
+    if by not in RELIABILITY_GROUPS:
+        return JsonResponse({'error':f'by must be one of {", ".join(RELIABILITY_GROUPS)}'},status=400)
+    try:
+        requests=filter_failures(request.GET)
+        field,descending=parse_sort(request.GET.get('sort'),RELIABILITY_SORTS,'-failures')
+        limit=parse_limit(request.GET.get('limit'))
+    except ValueError as e:
+        return JsonResponse({'error':str(e)},status=400)
+
+    def compute():
+        failures=load_failures(requests)
+        return reliability(failures,by=None),reliability(failures,by=by)
+
+    # Cached per filter set; every sort and limit is served from the same entry.
+    filters={param:request.GET.get(param,'') for param in ('by','start','end','department','equipment')}
+    overall,rows=cached_result('reliability',('requests','equipment'),compute,filters)
+    ranked=sorted((row for row in rows if row[field] is not None),key=lambda row:row[field],reverse=descending)
+    ranked+=[row for row in rows if row[field] is None]
+
+    data={
+        'overall':{key:value for key,value in overall[0].items() if key!='id'} if overall else None,
+        'by':by,
+        'groups':len(rows),
+        'results':ranked[:limit],
+    }
+    return JsonResponse(data,status=200)
+
+@csrf_exempt
+def dashboard_view(request):
+    """
+    Admin dashboard KPIs in one response.
+    Returns request counts per status plus open and overdue work, equipment totals,
+    user counts per role and the teams with the largest backlog (technicians, backlog, overdue).
+    """
+
+    if not request.method=='GET':
+        return JsonResponse({'error':'Invalid HTTP method'},status=405)
+
+    today=timezone.localdate()
+    data=cached_result('dashboard',DOMAINS,lambda:dashboard_summary(today=today),{'today':today.isoformat()})
+    return JsonResponse(data,status=200)
+
+@csrf_exempt
+def workload_heatmap_view(request):
+    """
+    Requests and scheduled duration_hours per team and week, as a dense columnar matrix.
+    Query params : start, end (scheduled dates; default this week and the next 11), team, status (comma separated)
+    Returns teams, weeks (Monday starts) and flat counts / duration_hours arrays, row-major by team.
+    """
+
+    if not request.method=='GET':
+        return JsonResponse({'error':'Invalid HTTP method'},status=405)
+
+    try:
+        start=parse_day(request.GET,'start',week_start(timezone.localdate()))
+        end=parse_day(request.GET,'end',start+timedelta(weeks=DEFAULT_HEATMAP_WEEKS,days=-1))
+        team=int(request.GET['team']) if request.GET.get('team') else None
+    except ValueError as e:
+        return JsonResponse({'error':str(e)},status=400)
+    if end<start or (end-week_start(start)).days>=MAX_HEATMAP_WEEKS*7:
+        return JsonResponse({'error':f'end must be on or after start and within {MAX_HEATMAP_WEEKS} weeks'},status=400)
+    statuses=[status for status in request.GET.get('status','').split(',') if status]
+    if set(statuses)-set(STATUSES):
+        return JsonResponse({'error':f'status must be among {", ".join(STATUSES)}'},status=400)
+
+    params={'start':start.isoformat(),'end':end.isoformat(),'team':team,'status':','.join(sorted(statuses))}
+    data=cached_result('workload_heatmap',('requests',),lambda:team_week_heatmap(start,end,team,statuses),params)
+    return JsonResponse(data,status=200)
+
+@csrf_exempt
+def cache_stats_view(request):
+    """
+    Returns this process's analytics result cache counters (hits, misses, hit ratio, per result)
+    and the current version of each invalidation domain.
+    """
+
+    if not request.method=='GET':
+        return JsonResponse({'error':'Invalid HTTP method'},status=405)
+    return JsonResponse({**cache_stats.snapshot(),'versions':versions(DOMAINS)},status=200)
@@ -0,0 +1,62 @@
+from datetime import timedelta
+
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncWeek
+
+from maintenance.models import MaintenanceRequest
+
+
+DEFAULT_HEATMAP_WEEKS = 12
+MAX_HEATMAP_WEEKS = 156
+
+
+def week_start(day):
+    return day - timedelta(days=day.weekday())
+
+
+def team_week_heatmap(start, end, team_id=None, statuses=None):
+    """
+    Request counts and scheduled ``duration_hours`` per team and week
+    (Monday starts) for work scheduled between ``start`` and ``end``, from a
+    single GROUP BY assigned team, week query. Unassigned requests are left
+    out.
+
+    The result is columnar: ``teams`` (ids with any work in range, sorted)
+    and ``weeks`` (every week in range, empty ones included) index the flat
+    ``counts`` and ``duration_hours`` arrays row-major, so the value for
+    team ``t`` and week ``w`` is at ``t * len(weeks) + w``.
+    """
+
+    first_week = week_start(start)
+    weeks = [first_week + timedelta(weeks=i) for i in range((end - first_week).days // 7 + 1)]
+
+    requests = MaintenanceRequest.objects.filter(
+        assigned_team__isnull=False, scheduled_date__range=(start, end),
+    )
+    if team_id is not None:
+        requests = requests.filter(assigned_team_id=team_id)
+    if statuses:
+        requests = requests.filter(status__in=statuses)
+    cells = list(
+        requests
+        .values('assigned_team_id', week=TruncWeek('scheduled_date'))
+        .annotate(total=Count('id'), hours=Sum('duration_hours'))
+        .order_by()
+    )
+
+    teams = sorted({cell['assigned_team_id'] for cell in cells})
+    team_index = {team: i for i, team in enumerate(teams)}
+    week_index = {week: i for i, week in enumerate(weeks)}
+    counts = [0] * (len(teams) * len(weeks))
+    hours = [0.0] * len(counts)
+    for cell in cells:
+        position = team_index[cell['assigned_team_id']] * len(weeks) + week_index[cell['week']]
+        counts[position] = cell['total']
+        hours[position] = round(cell['hours'] or 0.0, 2)
+
+    return {
+        'teams': teams,
+        'weeks': [week.isoformat() for week in weeks],
+        'counts': counts,
+        'duration_hours': hours,
+    }
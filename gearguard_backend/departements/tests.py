@@ -1,3 +1,13 @@
 from django.test import TestCase
 
-# Create your tests here.
+from .models import Department
+
+
+class DepartmentQueryCountTests(TestCase):
+
+    def test_list_runs_one_query(self):
+        for i in range(3):
+            Department.objects.create(name=f'Department {i}')
+        with self.assertNumQueries(1):
+            rows = self.client.get('/departments/list/').json()
+        self.assertEqual(len(rows), 3)
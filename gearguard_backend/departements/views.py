@@ -1,10 +1,20 @@
 from django.shortcuts import render
 from django.http import JsonResponse
 from .models import Department
+from gearguard_backend.projections import Projection
 
 import json
 
 
+DEPARTMENT_ROW = Projection(
+    id='id',
+    name='name',
+    created_at='created_at',
+    description='description',
+    updated_at='updated_at',
+)
+
+
 # Create your views here.
 
 def list_department_view(request):
@@ -20,23 +30,7 @@ def list_department_view(request):
 
     if not request.method=='GET':
         return JsonResponse({'error':'Invalid HTTP method'},status=405)
-    data=[]
-    equipments=Department.objects.all()
-    for equipment in equipments:
-        data.append({
-            'id':equipment.id,
-            'name':equipment.name,
-            'created_at':equipment.created_at,
-            'description':equipment.description,
-            'updated_at':equipment.updated_at,
-            # 'department':equipment.department.id,
-            # 'assigned_to':equipment.assigned_to.id if equipment.assigned_to else None,
-            # 'maintenance_team':equipment.maintenance_team.id if equipment.maintenance_team else None,
-            # 'location':equipment.location,
-            # 'purchase_date':equipment.purchase_date,
-            # 'warranty_expiry':equipment.warranty_expiry,
-            # 'is_scrapped':equipment.is_scrapped
-        })
+    data=DEPARTMENT_ROW.rows(DEPARTMENT_ROW.values(Department.objects.all()))
     return JsonResponse(data,safe=False)
 
 
@@ -1,6 +1,7 @@
 from django.contrib import admin
-from .models import Equipment
+from .models import Equipment, EquipmentDeletionJob
 
 # Register your models here.
 # admin.site.register(Department)
-admin.site.register(Equipment)
\ No newline at end of file
+admin.site.register(Equipment)
+admin.site.register(EquipmentDeletionJob)
\ No newline at end of file
@@ -0,0 +1,66 @@
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from .cache import serial_cache
+from .events import equipment_changed
+from .imports import FK_MODELS
+from .models import Equipment
+
+
+BULK_PATCH_FIELDS = ('department', 'assigned_to', 'maintenance_team', 'location', 'is_scrapped')
+BULK_ID_CHUNK_SIZE = 1000
+
+
+def clean_patch(patch):
+    """
+    Validates a bulk field patch and returns it keyed by column name.
+    Foreign keys are checked with one existence query each.
+    """
+
+    if not isinstance(patch, dict) or not patch:
+        raise ValidationError('patch must be a non-empty object')
+    unknown = set(patch) - set(BULK_PATCH_FIELDS)
+    if unknown:
+        raise ValidationError(f'Fields cannot be bulk updated: {", ".join(sorted(unknown))}')
+
+    values = {}
+    for name, value in patch.items():
+        field = Equipment._meta.get_field(name)
+        if name in FK_MODELS:
+            if value is None:
+                if not field.null:
+                    raise ValidationError(f'{name} cannot be null')
+            else:
+                value = field.target_field.to_python(value)
+                if not FK_MODELS[name].objects.filter(id=value).exists():
+                    raise ValidationError(f'Unknown {name}')
+        else:
+            value = field.clean(value, None)
+        values[field.attname] = value
+    return values
+
+
+def bulk_update_equipment(queryset, values, ids=None):
+    """
+    Applies ``values`` with set-based UPDATE statements in one transaction
+    and returns the number of rows changed. An id list is split into chunks
+    so no single statement carries an unbounded IN list.
+
+    queryset.update() sends no signals, so the serial lookup cache is
+    cleared wholesale once the transaction commits, and the write is
+    announced with ``equipment_changed``.
+    """
+
+    with transaction.atomic():
+        # Registered inside the block, so a rolled-back update clears nothing
+        # and outside a transaction the clear waits for this commit.
+        transaction.on_commit(serial_cache.clear)
+        if ids is None:
+            updated = queryset.update(**values)
+        else:
+            updated = 0
+            for start in range(0, len(ids), BULK_ID_CHUNK_SIZE):
+                updated += queryset.filter(id__in=ids[start:start + BULK_ID_CHUNK_SIZE]).update(**values)
+        if updated:
+            equipment_changed.send(sender=Equipment, ids=ids)
+        return updated
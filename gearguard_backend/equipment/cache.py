@@ -0,0 +1,90 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+
+
+class LRUCache:
+    """
+    Bounded, thread-safe LRU cache with a per-entry TTL and hit/miss counters.
+
+    Entries are keyed by serial number; ``ids`` maps an equipment id back to
+    the serial it is cached under, so a save that renames the serial still
+    drops the stale key. The cache is per process: signal invalidation only
+    reaches the process that did the write, and the TTL bounds how long other
+    workers can serve an outdated row.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.ids = {}
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None or entry[1] < time.monotonic():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, pk, value):
+        with self.lock:
+            old_key = self.ids.get(pk)
+            if old_key is not None and old_key != key:
+                self._remove(old_key)
+            self.entries[key] = (value, time.monotonic() + self.ttl, pk)
+            self.entries.move_to_end(key)
+            self.ids[pk] = key
+            while len(self.entries) > self.maxsize:
+                self._remove(next(iter(self.entries)))
+                self.evictions += 1
+
+    def invalidate(self, key=None, pk=None):
+        with self.lock:
+            for stale in {key, self.ids.get(pk)} - {None}:
+                if stale in self.entries:
+                    self._remove(stale)
+                    self.invalidations += 1
+
+    def clear(self):
+        with self.lock:
+            self.invalidations += len(self.entries)
+            self.entries.clear()
+            self.ids.clear()
+
+    def _remove(self, key):
+        _, _, pk = self.entries.pop(key)
+        if self.ids.get(pk) == key:
+            del self.ids[pk]
+
+    def stats(self):
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self.entries),
+                'maxsize': self.maxsize,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_ratio': self.hits / lookups if lookups else None,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+            }
+
+
+serial_cache = LRUCache(
+    maxsize=getattr(settings, 'EQUIPMENT_SERIAL_CACHE_SIZE', 10000),
+    ttl=getattr(settings, 'EQUIPMENT_SERIAL_CACHE_TTL', 300),
+)
@@ -0,0 +1,7 @@
+from django.dispatch import Signal
+
+
+# Sent by set-based Equipment writers (queryset.update(), bulk_create()) that
+# bypass post_save, with ``ids``: the written ids, or None when a filtered
+# update does not know them. Sent inside the writer's transaction.
+equipment_changed = Signal()
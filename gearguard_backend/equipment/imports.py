@@ -0,0 +1,188 @@
+import csv
+import json
+from itertools import islice
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+
+from departements.models import Department
+from teams.models import MaintenanceTeam
+from users.models import GearguardUser
+from .events import equipment_changed
+from .models import Equipment
+
+
+IMPORT_CHUNK_SIZE = 1000
+MAX_REPORTED_ERRORS = 1000
+
+IMPORT_FIELDS = (
+    'name', 'serial_number', 'department', 'assigned_to', 'maintenance_team',
+    'location', 'purchase_date', 'warranty_expiry', 'is_scrapped',
+)
+
+BOOLEAN_STRINGS = {'true': True, 'yes': True, '1': True, 'false': False, 'no': False, '0': False}
+
+# Foreign keys are checked per chunk with one IN query each instead of the
+# per-row lookups Model.full_clean() would run.
+FK_MODELS = {
+    'department': Department,
+    'assigned_to': GearguardUser,
+    'maintenance_team': MaintenanceTeam,
+}
+
+
+def decoded_lines(source):
+    for line in source:
+        yield line.decode('utf-8-sig') if isinstance(line, bytes) else line
+
+
+def read_csv(source):
+    yield from csv.DictReader(decoded_lines(source))
+
+
+def read_ndjson(source):
+    for line in decoded_lines(source):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield row if isinstance(row, dict) else {'__error__': 'Invalid JSON object'}
+
+
+READERS = {
+    'csv': read_csv,
+    'ndjson': read_ndjson,
+}
+
+
+def build_equipment(row):
+    """
+    Returns an unsaved Equipment for one import row, or raises ValidationError.
+    Field values are validated without touching the database.
+    """
+
+    if '__error__' in row:
+        raise ValidationError(row['__error__'])
+
+    values = {}
+    for field in IMPORT_FIELDS:
+        value = row.get(field)
+        if isinstance(value, str):
+            value = value.strip()
+        values[field] = None if value == '' else value
+
+    is_scrapped = values['is_scrapped']
+    if is_scrapped is None:
+        values['is_scrapped'] = False
+    elif isinstance(is_scrapped, str) and is_scrapped.lower() in BOOLEAN_STRINGS:
+        values['is_scrapped'] = BOOLEAN_STRINGS[is_scrapped.lower()]
+    for field in FK_MODELS:
+        values[f'{field}_id'] = values.pop(field)
+
+    equipment = Equipment(**values)
+    equipment.clean_fields(exclude=list(FK_MODELS))
+    for field in FK_MODELS:
+        attname = f'{field}_id'
+        value = getattr(equipment, attname)
+        if value is not None:
+            setattr(equipment, attname, Equipment._meta.get_field(field).target_field.to_python(value))
+    if equipment.department_id is None:
+        raise ValidationError({'department': ['This field cannot be null.']})
+    return equipment
+
+
+def error_message(error):
+    if hasattr(error, 'message_dict'):
+        return '; '.join(f'{field}: {" ".join(messages)}' for field, messages in error.message_dict.items())
+    return ' '.join(error.messages)
+
+
+class ImportReport:
+
+    def __init__(self):
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+
+    def fail(self, row_number, serial_number, message):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({'row': row_number, 'serial_number': serial_number, 'error': message})
+
+    def as_dict(self):
+        return {
+            'created': self.created,
+            'failed': self.failed,
+            'errors': sorted(self.errors, key=lambda error: error['row']),
+            'errors_truncated': self.failed > len(self.errors),
+        }
+
+
+def import_chunk(chunk, report):
+    """
+    Validates one chunk of (row number, row) pairs and inserts the valid
+    rows with a single bulk_create. Costs one IN query for serial numbers,
+    one per foreign key and the insert itself, whatever the chunk holds.
+    """
+
+    candidates = []
+    for row_number, row in chunk:
+        try:
+            candidates.append((row_number, build_equipment(row)))
+        except ValidationError as e:
+            report.fail(row_number, row.get('serial_number'), error_message(e))
+
+    existing = set(Equipment.objects.filter(
+        serial_number__in=[equipment.serial_number for _, equipment in candidates]
+    ).values_list('serial_number', flat=True))
+    known_ids = {}
+    for field, model in FK_MODELS.items():
+        ids = {getattr(equipment, f'{field}_id') for _, equipment in candidates} - {None}
+        known_ids[field] = set(model.objects.filter(id__in=ids).values_list('id', flat=True)) if ids else set()
+
+    valid = []
+    for row_number, equipment in candidates:
+        if equipment.serial_number in existing:
+            report.fail(row_number, equipment.serial_number, 'serial_number already exists')
+            continue
+        missing = [
+            field for field in FK_MODELS
+            if getattr(equipment, f'{field}_id') is not None and getattr(equipment, f'{field}_id') not in known_ids[field]
+        ]
+        if missing:
+            report.fail(row_number, equipment.serial_number, f'Unknown {", ".join(missing)}')
+            continue
+        existing.add(equipment.serial_number)
+        valid.append((row_number, equipment))
+
+    if not valid:
+        return
+    try:
+        with transaction.atomic():
+            created = Equipment.objects.bulk_create([equipment for _, equipment in valid])
+            equipment_changed.send(sender=Equipment, ids=[equipment.pk for equipment in created])
+    except IntegrityError as e:
+        # A concurrent writer took one of the serial numbers; report the chunk.
+        for row_number, equipment in valid:
+            report.fail(row_number, equipment.serial_number, str(e))
+        return
+    report.created += len(valid)
+
+
+def import_equipment(source, fmt, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Streams ``source`` (an iterable of lines, e.g. an uploaded file) in
+    ``fmt`` ('csv' or 'ndjson') into Equipment rows, ``chunk_size`` rows at a
+    time. Only one chunk is held in memory; returns the report dict.
+    """
+
+    rows = enumerate(READERS[fmt](source), start=1)
+    report = ImportReport()
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            break
+        import_chunk(chunk, report)
+    return report.as_dict()
@@ -0,0 +1,133 @@
+import threading
+
+from django.db import IntegrityError, connections, transaction
+from django.utils import timezone
+
+from maintenance.changes import delete_requests
+from maintenance.models import ArchivedMaintenanceLog, MaintenanceLog, MaintenanceRequest
+from .models import Equipment, EquipmentDeletionJob
+
+
+DELETE_BATCH_SIZE = 500
+
+ACTIVE_STATUSES = ('pending', 'running')
+
+
+def schedule_equipment_deletion(equipment):
+    """
+    Creates (or returns the already active) deletion job for ``equipment``
+    and starts it in a background thread once the current transaction commits.
+    The deletion_job_active_uniq constraint settles concurrent calls: the
+    one that loses the insert returns the winner's job.
+    """
+
+    active = EquipmentDeletionJob.objects.filter(equipment_id=equipment.id, status__in=ACTIVE_STATUSES)
+    job = active.first()
+    if job:
+        return job
+    try:
+        with transaction.atomic():
+            job = EquipmentDeletionJob.objects.create(
+                equipment_id=equipment.id,
+                equipment_name=equipment.name,
+                total_requests=MaintenanceRequest.objects.filter(equipment_id=equipment.id).count(),
+            )
+    except IntegrityError:
+        # Scheduled by a concurrent call since the lookup above.
+        return active.get()
+    transaction.on_commit(lambda: launch(job.id))
+    return job
+
+
+def launch(job_id):
+    threading.Thread(target=run_in_thread, args=(job_id,), daemon=True).start()
+
+
+def run_in_thread(job_id):
+    try:
+        run_deletion_job(job_id)
+    finally:
+        connections.close_all()
+
+
+def delete_in_batches(queryset, batch_size, delete=None):
+    """
+    Deletes ``queryset`` one id batch at a time, each in its own short
+    transaction, yielding the number of rows removed per batch.
+    ``delete(ids)`` replaces the default queryset delete() of a batch.
+    """
+
+    while True:
+        ids = list(queryset.values_list('id', flat=True)[:batch_size])
+        if not ids:
+            return
+        with transaction.atomic():
+            if delete is None:
+                queryset.model.objects.filter(id__in=ids).delete()
+            else:
+                delete(ids)
+        yield len(ids)
+
+
+def delete_dependents(job, batch_size):
+    """
+    One batched pass over the equipment's maintenance logs (hot and
+    archived), then its requests, saving progress after each batch.
+    """
+
+    for model in (MaintenanceLog, ArchivedMaintenanceLog):
+        logs = model.objects.filter(maintenance_request__equipment_id=job.equipment_id)
+        for deleted in delete_in_batches(logs, batch_size):
+            job.deleted_logs += deleted
+            job.save(update_fields=['deleted_logs'])
+
+    requests = MaintenanceRequest.objects.filter(equipment_id=job.equipment_id)
+    for deleted in delete_in_batches(requests, batch_size, delete=delete_requests):
+        job.deleted_requests += deleted
+        job.save(update_fields=['deleted_requests'])
+
+
+def delete_equipment_row(equipment_id):
+    """
+    Deletes the equipment row if no request refers to it any more and
+    returns whether it did. The row is locked first: a new request's
+    foreign key check needs a share lock on it, so none can be added
+    between the check and the delete.
+    """
+
+    with transaction.atomic():
+        list(Equipment.objects.select_for_update().filter(id=equipment_id).values_list('id', flat=True))
+        if MaintenanceRequest.objects.filter(equipment_id=equipment_id).exists():
+            return False
+        Equipment.objects.filter(id=equipment_id).delete()
+        return True
+
+
+def run_deletion_job(job_id, batch_size=DELETE_BATCH_SIZE):
+    """
+    Removes the equipment's maintenance logs (hot and archived), then its
+    requests, then the equipment row, in batches of ``batch_size``. Progress
+    is saved after each batch, so a job interrupted by a restart can simply
+    be run again.
+
+    Requests created for the equipment while the job runs get another
+    batched pass, so the final delete never cascades over them in one
+    transaction.
+    """
+
+    job = EquipmentDeletionJob.objects.get(id=job_id)
+    job.status = 'running'
+    job.save(update_fields=['status'])
+
+    try:
+        delete_dependents(job, batch_size)
+        while not delete_equipment_row(job.equipment_id):
+            delete_dependents(job, batch_size)
+    except Exception as e:
+        job.status = 'failed'
+        job.error = str(e)
+    else:
+        job.status = 'done'
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'error', 'finished_at'])
+    return job
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from equipment.jobs import ACTIVE_STATUSES, run_deletion_job
+from equipment.models import EquipmentDeletionJob
+
+
+class Command(BaseCommand):
+    help = "Runs equipment deletion jobs left pending or running, e.g. after a server restart."
+
+    def handle(self, *args, **options):
+        for job_id in EquipmentDeletionJob.objects.filter(status__in=ACTIVE_STATUSES).values_list('id', flat=True):
+            job = run_deletion_job(job_id)
+            self.stdout.write(
+                f'job {job.id}: {job.status}, {job.deleted_requests} requests and {job.deleted_logs} logs deleted'
+            )
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:15
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('departements', '0001_initial'),
+        ('equipment', '0002_initial'),
+        ('teams', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='equipment',
+            index=models.Index(fields=['created_at', 'id'], name='equipment_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipment',
+            index=models.Index(fields=['location'], name='equipment_location_idx'),
+        ),
+    ]
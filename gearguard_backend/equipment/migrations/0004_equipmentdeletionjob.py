@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0003_equipment_list_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EquipmentDeletionJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('equipment_id', models.BigIntegerField(db_index=True)),
+                ('equipment_name', models.CharField(max_length=100)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('total_requests', models.PositiveIntegerField(default=0)),
+                ('deleted_requests', models.PositiveIntegerField(default=0)),
+                ('deleted_logs', models.PositiveIntegerField(default=0)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+            ],
+        ),
+    ]
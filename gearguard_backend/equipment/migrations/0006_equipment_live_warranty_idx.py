@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:26
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('departements', '0001_initial'),
+        ('equipment', '0005_equipment_search_indexes'),
+        ('teams', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='equipment',
+            index=models.Index(condition=models.Q(('is_scrapped', False)), fields=['warranty_expiry'], name='equipment_live_warranty_idx'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:47
+
+import django.contrib.postgres.indexes
+from django.contrib.postgres.operations import TrigramExtension
+import django.db.models.functions.text
+import equipment.models
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('departements', '0001_initial'),
+        ('equipment', '0006_equipment_live_warranty_idx'),
+        ('teams', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        # Already created by 0005 on PostgreSQL; a no-op elsewhere.
+        TrigramExtension(),
+        # 0005's raw-SQL indexes over the bare columns, which icontains
+        # (UPPER(column) LIKE ...) cannot use. DROP INDEX IF EXISTS runs on
+        # every backend; the indexes only ever existed on PostgreSQL.
+        migrations.RunSQL(
+            [
+                'DROP INDEX IF EXISTS equipment_name_trgm_idx',
+                'DROP INDEX IF EXISTS equipment_serial_number_trgm_idx',
+                'DROP INDEX IF EXISTS equipment_location_trgm_idx',
+            ],
+            migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name='equipment',
+            index=equipment.models.TrigramIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('name'), name='gin_trgm_ops'), name='equipment_name_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipment',
+            index=equipment.models.TrigramIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('serial_number'), name='gin_trgm_ops'), name='equipment_serial_trgm_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipment',
+            index=equipment.models.TrigramIndex(django.contrib.postgres.indexes.OpClass(django.db.models.functions.text.Upper('location'), name='gin_trgm_ops'), name='equipment_location_trgm_idx'),
+        ),
+    ]
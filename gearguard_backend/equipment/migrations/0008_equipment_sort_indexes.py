@@ -0,0 +1,37 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:51
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('departements', '0001_initial'),
+        ('equipment', '0007_equipment_search_upper_trgm'),
+        ('teams', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='equipment',
+            name='equipment_location_idx',
+        ),
+        migrations.AddIndex(
+            model_name='equipment',
+            index=models.Index(fields=['name', 'id'], name='equipment_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipment',
+            index=models.Index(fields=['location', 'id'], name='equipment_location_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipment',
+            index=models.Index(fields=['purchase_date', 'id'], name='equipment_purchase_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='equipment',
+            index=models.Index(fields=['warranty_expiry', 'id'], name='equipment_warranty_id_idx'),
+        ),
+    ]
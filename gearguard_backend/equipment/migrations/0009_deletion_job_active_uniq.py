@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-18 07:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0008_equipment_sort_indexes'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='equipmentdeletionjob',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['pending', 'running'])), fields=('equipment_id',), name='deletion_job_active_uniq'),
+        ),
+    ]
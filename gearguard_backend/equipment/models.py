@@ -1,7 +1,27 @@
+from django.contrib.postgres.indexes import GinIndex, OpClass
 from django.db import models
+from django.db.models.functions import Upper
 
 # Create your models here.
 
+class TrigramIndex(GinIndex):
+    """
+    GIN index for pg_trgm lookups. It only exists on PostgreSQL; other
+    databases (SQLite in tests) get no index and equipment search falls
+    back to substring scans there.
+    """
+
+    def create_sql(self, model, schema_editor, using='', **kwargs):
+        if schema_editor.connection.vendor != 'postgresql':
+            return ''
+        return super().create_sql(model, schema_editor, using=using, **kwargs)
+
+    def remove_sql(self, model, schema_editor, **kwargs):
+        if schema_editor.connection.vendor != 'postgresql':
+            return ''
+        return super().remove_sql(model, schema_editor, **kwargs)
+
+
 class Equipment(models.Model):
     name = models.CharField(max_length=100)
     serial_number = models.CharField(max_length=100, unique=True)
@@ -32,8 +52,72 @@ class Equipment(models.Model):
 
     is_scrapped = models.BooleanField(default=False)
     created_at = models.DateTimeField(auto_now_add=True)
-    
+
+    class Meta:
+        indexes = [
+            # Keyset pagination for the equipment list walks (sort key, id),
+            # one index per key in EQUIPMENT_SORT_FIELDS. serial_number is
+            # unique, so its own index already orders (serial_number, id).
+            # (location, id) also serves the location filter.
+            models.Index(fields=['created_at', 'id'], name='equipment_created_id_idx'),
+            models.Index(fields=['name', 'id'], name='equipment_name_id_idx'),
+            models.Index(fields=['location', 'id'], name='equipment_location_id_idx'),
+            models.Index(fields=['purchase_date', 'id'], name='equipment_purchase_id_idx'),
+            models.Index(fields=['warranty_expiry', 'id'], name='equipment_warranty_id_idx'),
+            # Warranty horizon queries only ever look at live assets, so
+            # scrapped history is left out of the index entirely.
+            models.Index(
+                fields=['warranty_expiry'],
+                condition=models.Q(is_scrapped=False),
+                name='equipment_live_warranty_idx',
+            ),
+            # Search: on PostgreSQL icontains compares UPPER(column), so the
+            # trigram indexes are built over that expression.
+            TrigramIndex(OpClass(Upper('name'), name='gin_trgm_ops'), name='equipment_name_trgm_idx'),
+            TrigramIndex(OpClass(Upper('serial_number'), name='gin_trgm_ops'), name='equipment_serial_trgm_idx'),
+            TrigramIndex(OpClass(Upper('location'), name='gin_trgm_ops'), name='equipment_location_trgm_idx'),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.serial_number})"
 
+
+
+class EquipmentDeletionJob(models.Model):
+    """
+    Tracks a background cascade delete of one equipment row. The equipment
+    id is stored as a plain column because the row is gone once the job ends.
+    """
+
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    equipment_id = models.BigIntegerField(db_index=True)
+    equipment_name = models.CharField(max_length=100)
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+
+    total_requests = models.PositiveIntegerField(default=0)
+    deleted_requests = models.PositiveIntegerField(default=0)
+    deleted_logs = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            # At most one pending or running job per equipment, however
+            # many delete requests race to schedule one.
+            models.UniqueConstraint(
+                fields=['equipment_id'],
+                condition=models.Q(status__in=['pending', 'running']),
+                name='deletion_job_active_uniq',
+            ),
+        ]
+
+    def __str__(self):
+        return f"Delete {self.equipment_name} ({self.status})"
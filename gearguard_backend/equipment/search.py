@@ -0,0 +1,58 @@
+from django.contrib.postgres.search import TrigramSimilarity
+from django.db import connection
+from django.db.models import Case, IntegerField, Q, Value, When
+from django.db.models.functions import Greatest, Upper
+
+from .models import Equipment
+
+
+SEARCH_FIELDS = ('name', 'serial_number', 'location')
+DEFAULT_SEARCH_LIMIT = 20
+MAX_SEARCH_LIMIT = 100
+
+
+def contains_any(query):
+    condition = Q()
+    for field in SEARCH_FIELDS:
+        condition |= Q(**{f'{field}__icontains': query})
+    return condition
+
+
+def postgres_search(queryset, query):
+    """
+    Ranks by the best pg_trgm similarity over the searched columns. Both the
+    icontains (``UPPER(column) LIKE``) and the ``%`` (trigram_similar)
+    conditions are on UPPER(column), which the GIN trigram indexes in
+    Equipment.Meta cover, so partial serial numbers and misspelled names
+    stay bitmap index scans. Trigram similarity ignores case, so comparing
+    upper-cased names matches the same rows.
+    """
+
+    rank = Greatest(*(TrigramSimilarity(field, query) for field in SEARCH_FIELDS))
+    return (
+        queryset
+        .alias(upper_name=Upper('name'))
+        .filter(contains_any(query) | Q(upper_name__trigram_similar=query.upper()))
+        .annotate(rank=rank)
+    )
+
+
+def fallback_search(queryset, query):
+    """
+    Substring search for databases without pg_trgm (SQLite in tests):
+    exact serial number first, then prefix matches, then any substring.
+    """
+
+    rank = Case(
+        When(serial_number__iexact=query, then=Value(3)),
+        When(Q(serial_number__istartswith=query) | Q(name__istartswith=query), then=Value(2)),
+        default=Value(1),
+        output_field=IntegerField(),
+    )
+    return queryset.filter(contains_any(query)).annotate(rank=rank)
+
+
+def search_equipment(query, limit=DEFAULT_SEARCH_LIMIT, queryset=None):
+    queryset = Equipment.objects.all() if queryset is None else queryset
+    search = postgres_search if connection.vendor == 'postgresql' else fallback_search
+    return search(queryset, query).order_by('-rank', 'id')[:limit]
@@ -0,0 +1,16 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .cache import serial_cache
+from .models import Equipment
+
+
+@receiver(post_save, sender=Equipment)
+@receiver(post_delete, sender=Equipment)
+def invalidate_serial_cache(sender, instance, **kwargs):
+    # Drop the entry now and again after commit, so a lookup racing the
+    # transaction cannot re-cache the pre-commit row.
+    serial_number, pk = instance.serial_number, instance.pk
+    serial_cache.invalidate(key=serial_number, pk=pk)
+    transaction.on_commit(lambda: serial_cache.invalidate(key=serial_number, pk=pk))
@@ -1,3 +1,461 @@
+from datetime import date, timedelta
+from unittest import mock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from departements.models import Department
+from gearguard_backend.pagination import encode_cursor
+from maintenance.models import MaintenanceRequest
+from teams.models import MaintenanceTeam
+from users.models import GearguardUser
+from maintenance.changes import delete_requests
+from maintenance.models import MaintenanceLog, MaintenanceRequestTombstone
+from analytics.models import RequestRollup
+from .bulk import bulk_update_equipment
+from .cache import LRUCache, serial_cache
+from .imports import import_equipment
+from .jobs import delete_dependents as real_delete_dependents, run_deletion_job, schedule_equipment_deletion
+from .models import Equipment, EquipmentDeletionJob
+
+
+def make_equipment(department, index, **fields):
+    values = {
+        'name': f'Machine {index}',
+        'serial_number': f'SN-{index:05d}',
+        'department': department,
+        'location': 'Plant A',
+        'purchase_date': date(2024, 1, 1),
+        'warranty_expiry': date(2027, 1, 1),
+    }
+    values.update(fields)
+    return Equipment.objects.create(**values)
+
+
+class EquipmentListTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.department = Department.objects.create(name='Production')
+        cls.other_department = Department.objects.create(name='Logistics')
+        cls.team = MaintenanceTeam.objects.create(name='Mechanics')
+        for i in range(7):
+            make_equipment(cls.department, i, maintenance_team=cls.team if i % 2 else None)
+        make_equipment(cls.other_department, 100, location='Plant B', is_scrapped=True)
+
+    def test_cursor_walks_every_row_once(self):
+        seen = []
+        cursor = None
+        while True:
+            params = {'limit': 3}
+            if cursor:
+                params['cursor'] = cursor
+            body = self.client.get('/equipment/list/', params).json()
+            seen.extend(row['id'] for row in body['results'])
+            cursor = body['next_cursor']
+            if not cursor:
+                break
+        self.assertEqual(seen, list(Equipment.objects.order_by('created_at', 'id').values_list('id', flat=True)))
+
+    def test_cursor_walks_ties_in_a_descending_sort(self):
+        # Seven rows share location 'Plant A': the walk must page through
+        # the tie on id without skipping or repeating any of them.
+        seen = []
+        cursor = None
+        while True:
+            params = {'sort': '-location', 'limit': 2}
+            if cursor:
+                params['cursor'] = cursor
+            body = self.client.get('/equipment/list/', params).json()
+            seen.extend(row['id'] for row in body['results'])
+            cursor = body['next_cursor']
+            if not cursor:
+                break
+        self.assertEqual(seen, list(Equipment.objects.order_by('-location', '-id').values_list('id', flat=True)))
+
+    def test_filters(self):
+        url = '/equipment/list/'
+        self.assertEqual(len(self.client.get(url, {'department': self.other_department.id}).json()['results']), 1)
+        self.assertEqual(len(self.client.get(url, {'maintenance_team': self.team.id}).json()['results']), 3)
+        self.assertEqual(len(self.client.get(url, {'is_scrapped': 'false'}).json()['results']), 7)
+        self.assertEqual(len(self.client.get(url, {'location': 'Plant B'}).json()['results']), 1)
+
+    def test_descending_sort(self):
+        rows = self.client.get('/equipment/list/', {'sort': '-serial_number', 'limit': 2}).json()['results']
+        self.assertEqual([row['serial_number'] for row in rows], ['SN-00100', 'SN-00006'])
+
+    def test_invalid_params(self):
+        url = '/equipment/list/'
+        self.assertEqual(self.client.get(url, {'sort': 'description'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'cursor': 'not-a-cursor'}).status_code, 400)
+        for values in (['2024-13-45', 1], [{}, 1], [None, 1], ['2024-01-01T00:00:00Z', 'x'], ['2024-01-01T00:00:00Z', True]):
+            self.assertEqual(self.client.get(url, {'cursor': encode_cursor(values)}).status_code, 400, values)
+        self.assertEqual(self.client.get(url, {'limit': '0'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'department': '0'}).status_code, 400)
+        self.assertEqual(len(self.client.get(url, {'department': ''}).json()['results']), 8)
+
+
+class EquipmentQueryCountTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        department = Department.objects.create(name='Production')
+        team = MaintenanceTeam.objects.create(name='Mechanics')
+        user = GearguardUser.objects.create_user(username='tech', password='pw', role='technician')
+        cls.equipment = [
+            make_equipment(department, i, assigned_to=user, maintenance_team=team) for i in range(5)
+        ]
+        for i in range(5):
+            MaintenanceRequest.objects.create(
+                subject=f'Request {i}', equipment=cls.equipment[0], request_type='corrective',
+                assigned_to=user, assigned_team=team, created_by=user,
+            )
+
+    def test_list_runs_one_query(self):
+        with self.assertNumQueries(1):
+            rows = self.client.get('/equipment/list/').json()['results']
+        self.assertEqual(rows[0]['department'], self.equipment[0].department_id)
+
+    def test_detail_runs_one_query(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(f'/equipment/{self.equipment[0].id}/').status_code, 200)
+
+    def test_maintenance_requests_run_two_queries(self):
+        with self.assertNumQueries(2):
+            rows = self.client.get(f'/equipment/{self.equipment[0].id}/maintenancerequests/').json()
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(rows[0]['created_by'], self.equipment[0].assigned_to_id)
+
+
+class EquipmentImportTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.department = Department.objects.create(name='Production')
+        make_equipment(cls.department, 1)
+
+    def test_csv_upload_reports_row_errors(self):
+        body = (
+            'name,serial_number,department,location,purchase_date,warranty_expiry,is_scrapped\n'
+            f'Lathe,SN-NEW-1,{self.department.id},Plant A,2024-01-01,2027-01-01,false\n'
+            f'Drill,SN-00001,{self.department.id},Plant A,2024-01-01,2027-01-01,\n'
+            f'Press,SN-NEW-2,{self.department.id},Plant A,not-a-date,2027-01-01,\n'
+            f'Saw,SN-NEW-3,999,Plant A,2024-01-01,2027-01-01,\n'
+            f'Lathe again,SN-NEW-1,{self.department.id},Plant A,2024-01-01,2027-01-01,\n'
+        )
+        report = self.client.post('/equipment/import/', body, content_type='text/csv').json()
+        self.assertEqual(report['created'], 1)
+        self.assertEqual([error['row'] for error in report['errors']], [2, 3, 4, 5])
+        self.assertTrue(Equipment.objects.filter(serial_number='SN-NEW-1', is_scrapped=False).exists())
+
+    def test_ndjson_file_is_written_in_chunks(self):
+        lines = '\n'.join(
+            '{"name": "Pump %d", "serial_number": "P-%d", "department": %d, "location": "Plant B",'
+            ' "purchase_date": "2024-01-01", "warranty_expiry": "2027-01-01"}' % (i, i, self.department.id)
+            for i in range(25)
+        )
+        with self.assertNumQueries(3 * 5):
+            report = import_equipment(SimpleUploadedFile('assets.ndjson', lines.encode()), 'ndjson', chunk_size=10)
+        self.assertEqual(report['created'], 25)
+
+        upload = SimpleUploadedFile('assets.ndjson', b'{"name": "broken"\n', content_type='application/x-ndjson')
+        report = self.client.post('/equipment/import/', {'file': upload}).json()
+        self.assertEqual(report['errors'][0]['error'], 'Invalid JSON object')
+
+
+class EquipmentBulkUpdateTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.department = Department.objects.create(name='Production')
+        cls.team = MaintenanceTeam.objects.create(name='Line 3')
+        cls.equipment = [
+            make_equipment(cls.department, i, maintenance_team=cls.team if i < 4 else None) for i in range(6)
+        ]
+
+    def post(self, payload):
+        return self.client.post('/equipment/bulk-update/', payload, content_type='application/json')
+
+    def test_filter_scraps_in_one_update(self):
+        with self.assertNumQueries(3):
+            response = self.post({'filter': {'maintenance_team': self.team.id}, 'patch': {'is_scrapped': True}})
+        self.assertEqual(response.json(), {'updated': 4})
+        self.assertEqual(Equipment.objects.filter(is_scrapped=True).count(), 4)
+
+    def test_ids_move_location_and_team(self):
+        ids = [self.equipment[4].id, self.equipment[5].id]
+        response = self.post({'ids': ids, 'patch': {'location': 'Plant C', 'maintenance_team': self.team.id}})
+        self.assertEqual(response.json(), {'updated': 2})
+        self.assertEqual(Equipment.objects.filter(location='Plant C', maintenance_team=self.team).count(), 2)
+
+    def test_rejects_invalid_requests(self):
+        self.assertEqual(self.post({'patch': {'location': 'X'}}).status_code, 400)
+        self.assertEqual(self.post({'ids': [1], 'patch': {'serial_number': 'X'}}).status_code, 400)
+        self.assertEqual(self.post({'ids': [1], 'patch': {'maintenance_team': 999}}).status_code, 400)
+        self.assertEqual(self.post({'filter': {'team': 1}, 'patch': {'location': 'X'}}).status_code, 400)
+        self.assertFalse(Equipment.objects.filter(location='X').exists())
+
+    def test_filters_that_select_nothing_are_rejected(self):
+        for filters in ({'department': 0}, {'maintenance_team': ''}, {'location': ''}, {'is_scrapped': None}):
+            self.assertEqual(self.post({'filter': filters, 'patch': {'is_scrapped': True}}).status_code, 400, filters)
+        for filters in ({'department': -1}, {'maintenance_team': 'x'}, {'assigned_to': True}, {'maintenance_team': 1.5}):
+            self.assertEqual(self.post({'filter': filters, 'patch': {'is_scrapped': True}}).status_code, 400, filters)
+        self.assertEqual(self.post({'ids': [0], 'patch': {'is_scrapped': True}}).status_code, 400)
+        self.assertFalse(Equipment.objects.filter(is_scrapped=True).exists())
+
+    def test_null_filter_selects_equipment_without_one(self):
+        response = self.post({'filter': {'maintenance_team': None}, 'patch': {'location': 'Spare'}})
+        self.assertEqual(response.json(), {'updated': 2})
+        self.assertEqual(set(Equipment.objects.filter(location='Spare')), set(self.equipment[4:]))
+
+
+class EquipmentDeletionJobTests(TestCase):
+
+    def setUp(self):
+        department = Department.objects.create(name='Production')
+        self.equipment = make_equipment(department, 1)
+        self.survivor = make_equipment(department, 2)
+        for equipment in (self.equipment, self.survivor):
+            for i in range(5):
+                request = MaintenanceRequest.objects.create(
+                    subject=f'Request {i}', equipment=equipment, request_type='corrective',
+                )
+                MaintenanceLog.objects.create(maintenance_request=request, action='created')
+
+    def test_delete_returns_job_and_runs_in_batches(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            response = self.client.post(f'/equipment/{self.equipment.id}/delete/')
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(len(callbacks), 1)
+        job_id = response.json()['job_id']
+        self.assertTrue(Equipment.objects.filter(id=self.equipment.id).exists())
+
+        run_deletion_job(job_id, batch_size=2)
+
+        job = self.client.get(f'/equipment/delete-jobs/{job_id}/').json()
+        self.assertEqual(
+            (job['status'], job['total_requests'], job['deleted_requests'], job['deleted_logs']),
+            ('done', 5, 5, 5),
+        )
+        self.assertFalse(Equipment.objects.filter(id=self.equipment.id).exists())
+        self.assertEqual(MaintenanceRequest.objects.count(), 5)
+        self.assertEqual(MaintenanceLog.objects.count(), 5)
+
+    def test_concurrent_schedules_share_one_job(self):
+        first = schedule_equipment_deletion(self.equipment)
+        # The second call misses the first job in its lookup, as it would
+        # if both had looked before either inserted.
+        with mock.patch('django.db.models.query.QuerySet.first', return_value=None):
+            second = schedule_equipment_deletion(self.equipment)
+        self.assertEqual(second.id, first.id)
+        self.assertEqual(EquipmentDeletionJob.objects.filter(equipment_id=self.equipment.id).count(), 1)
+
+    def test_requests_created_during_the_job_are_deleted_in_batches(self):
+        job = schedule_equipment_deletion(self.equipment)
+        passes = []
+
+        def delete_dependents(job, batch_size):
+            real_delete_dependents(job, batch_size)
+            passes.append(job.deleted_requests)
+            if len(passes) == 1:
+                MaintenanceRequest.objects.create(subject='Late', equipment=self.equipment, request_type='corrective')
+
+        with mock.patch('equipment.jobs.delete_dependents', side_effect=delete_dependents):
+            job = run_deletion_job(job.id, batch_size=2)
+        self.assertEqual((job.status, job.deleted_requests, passes), ('done', 6, [5, 6]))
+        self.assertFalse(Equipment.objects.filter(id=self.equipment.id).exists())
+
+    def test_request_batches_are_tombstoned_and_rolled_up_set_based(self):
+        ids = list(MaintenanceRequest.objects.order_by('id').values_list('id', flat=True))
+        with CaptureQueriesContext(connection) as one:
+            delete_requests(ids[:1])
+        with CaptureQueriesContext(connection) as many:
+            delete_requests(ids[1:])
+        self.assertEqual(len(one), len(many))
+
+        self.assertFalse(MaintenanceRequest.objects.exists())
+        self.assertFalse(MaintenanceLog.objects.exists())
+        tombstones = MaintenanceRequestTombstone.objects.all()
+        self.assertEqual(sorted(tombstone.id for tombstone in tombstones), ids)
+        self.assertEqual(len({tombstone.change_seq for tombstone in tombstones}), 2)
+        self.assertEqual(sum(RequestRollup.objects.values_list('count', flat=True)), 0)
+
+    def test_repeated_delete_reuses_active_job(self):
+        first = self.client.post(f'/equipment/{self.equipment.id}/delete/').json()['job_id']
+        second = self.client.post(f'/equipment/{self.equipment.id}/delete/').json()['job_id']
+        self.assertEqual(first, second)
+        self.assertEqual(EquipmentDeletionJob.objects.count(), 1)
+
+
+class EquipmentSearchTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        department = Department.objects.create(name='Production')
+        make_equipment(department, 1, name='Hydraulic press', serial_number='HP-2231', location='Bay 4')
+        make_equipment(department, 2, name='Press brake', serial_number='PB-2231-X', location='Bay 1')
+        make_equipment(department, 3, name='Lathe', serial_number='LT-0001', location='Press shop')
+
+    def search(self, **params):
+        return self.client.get('/equipment/search/', params).json()['results']
+
+    def test_partial_serial_ranks_exact_match_first(self):
+        rows = self.search(q='hp-2231')
+        self.assertEqual([row['serial_number'] for row in rows], ['HP-2231'])
+        rows = self.search(q='2231')
+        self.assertEqual(len(rows), 2)
+
+    def test_name_and_location_with_limit(self):
+        rows = self.search(q='press')
+        # pg_trgm ranks by similarity ("Press shop" is closest); the
+        # substring fallback puts name prefixes first.
+        if connection.vendor == 'postgresql':
+            expected = ['LT-0001', 'PB-2231-X', 'HP-2231']
+        else:
+            expected = ['PB-2231-X', 'HP-2231', 'LT-0001']
+        self.assertEqual([row['serial_number'] for row in rows], expected)
+        self.assertEqual(len(self.search(q='press', limit=1)), 1)
+
+    def test_misspelled_name_matches_on_postgresql(self):
+        if connection.vendor != 'postgresql':
+            self.skipTest('Trigram matching needs pg_trgm')
+        self.assertEqual([row['serial_number'] for row in self.search(q='hydrualic pres')], ['HP-2231'])
+
+    def test_query_required(self):
+        self.assertEqual(self.client.get('/equipment/search/').status_code, 400)
+
+
+class SerialLookupTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        department = Department.objects.create(name='Production')
+        cls.equipment = [make_equipment(department, i) for i in range(3)]
+
+    def setUp(self):
+        serial_cache.clear()
+
+    def test_second_lookup_is_served_from_cache(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get('/equipment/lookup/', {'serial': 'SN-00001'}).json()['id'], self.equipment[1].id)
+        with self.assertNumQueries(0):
+            self.client.get('/equipment/lookup/', {'serial': 'SN-00001'})
+        self.assertEqual(self.client.get('/equipment/lookup/', {'serial': 'nope'}).status_code, 404)
+
+    def test_save_and_delete_invalidate(self):
+        self.client.get('/equipment/lookup/', {'serial': 'SN-00001'})
+        equipment = self.equipment[1]
+        equipment.serial_number = 'SN-RENAMED'
+        equipment.save()
+        self.assertEqual(self.client.get('/equipment/lookup/', {'serial': 'SN-00001'}).status_code, 404)
+        self.assertEqual(self.client.get('/equipment/lookup/', {'serial': 'SN-RENAMED'}).status_code, 200)
+        equipment.delete()
+        self.assertEqual(self.client.get('/equipment/lookup/', {'serial': 'SN-RENAMED'}).status_code, 404)
+
+    def test_bulk_update_clears_only_after_its_commit(self):
+        self.client.get('/equipment/lookup/', {'serial': 'SN-00001'})
+        with self.captureOnCommitCallbacks() as callbacks:
+            with mock.patch('equipment.bulk.equipment_changed.send', side_effect=RuntimeError):
+                with self.assertRaises(RuntimeError):
+                    bulk_update_equipment(Equipment.objects.all(), {'location': 'Plant B'})
+        self.assertEqual(callbacks, [])
+        with self.assertNumQueries(0):
+            self.client.get('/equipment/lookup/', {'serial': 'SN-00001'})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk_update_equipment(Equipment.objects.all(), {'location': 'Plant B'})
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get('/equipment/lookup/', {'serial': 'SN-00001'}).json()['location'], 'Plant B')
+
+    def test_batch_fetches_misses_in_one_query(self):
+        self.client.get('/equipment/lookup/', {'serial': 'SN-00000'})
+        with self.assertNumQueries(1):
+            body = self.client.post(
+                '/equipment/lookup/batch/', {'serials': ['SN-00000', 'SN-00001', 'SN-00002', 'nope']},
+                content_type='application/json',
+            ).json()
+        self.assertEqual(sorted(body['found']), ['SN-00000', 'SN-00001', 'SN-00002'])
+        self.assertEqual(body['missing'], ['nope'])
+        stats = self.client.get('/equipment/lookup/stats/').json()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 4))
+
+    def test_lru_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2, ttl=60)
+        cache.set('a', 1, 'A')
+        cache.set('b', 2, 'B')
+        cache.get('a')
+        cache.set('c', 3, 'C')
+        self.assertIsNone(cache.get('b'))
+        self.assertEqual(cache.get('a'), 'A')
+        self.assertEqual(cache.stats()['evictions'], 1)
+
+
+class WarrantyExpiringTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        today = timezone.localdate()
+        cls.production = Department.objects.create(name='Production')
+        cls.logistics = Department.objects.create(name='Logistics')
+        for i, days in enumerate([1, 5, 20, 45]):
+            make_equipment(cls.production, i, warranty_expiry=today + timedelta(days=days))
+        make_equipment(cls.logistics, 10, warranty_expiry=today + timedelta(days=3))
+        make_equipment(cls.logistics, 11, warranty_expiry=today + timedelta(days=2), is_scrapped=True)
+        make_equipment(cls.logistics, 12, warranty_expiry=today - timedelta(days=2))
+
+    def test_counts_per_department_and_pages(self):
+        body = self.client.get('/equipment/warranty-expiring/', {'days': 30, 'limit': 2}).json()
+        self.assertEqual(body['departments'], [
+            {'department': self.production.id, 'count': 3},
+            {'department': self.logistics.id, 'count': 1},
+        ])
+        self.assertEqual([row['serial_number'] for row in body['results']], ['SN-00000', 'SN-00010'])
+        body = self.client.get(
+            '/equipment/warranty-expiring/', {'days': 30, 'limit': 2, 'cursor': body['next_cursor']}
+        ).json()
+        self.assertEqual([row['serial_number'] for row in body['results']], ['SN-00001', 'SN-00002'])
+        self.assertIsNone(body['next_cursor'])
+
+    def test_department_filter_and_validation(self):
+        body = self.client.get('/equipment/warranty-expiring/', {'department': self.logistics.id}).json()
+        self.assertEqual([row['serial_number'] for row in body['results']], ['SN-00010'])
+        self.assertEqual(self.client.get('/equipment/warranty-expiring/', {'days': -1}).status_code, 400)
+
+
+class EquipmentHistoryTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        department = Department.objects.create(name='Production')
+        cls.equipment = make_equipment(department, 1)
+        other = make_equipment(department, 2)
+        statuses = ['new', 'in_progress', 'repaired', 'repaired', 'scrap']
+        for i, status in enumerate(statuses):
+            MaintenanceRequest.objects.create(
+                subject=f'Request {i}', equipment=cls.equipment, status=status,
+                request_type='preventive' if i % 2 else 'corrective', duration_hours=1.5,
+            )
+        MaintenanceRequest.objects.create(subject='Other', equipment=other, request_type='corrective')
+
+    def test_first_page_has_summary(self):
+        with self.assertNumQueries(3):
+            body = self.client.get(f'/equipment/{self.equipment.id}/history/', {'limit': 2}).json()
+        self.assertEqual([row['subject'] for row in body['results']], ['Request 4', 'Request 3'])
+        summary = body['summary']
+        self.assertEqual(summary['total'], 5)
+        self.assertEqual(summary['by_status'], {'new': 1, 'in_progress': 1, 'repaired': 2, 'scrap': 1})
+        self.assertEqual(summary['by_type'], {'corrective': 3, 'preventive': 2})
+        self.assertEqual(summary['duration_hours'], 7.5)
+        self.assertIsNotNone(summary['last_repair_at'])
+
+        body = self.client.get(
+            f'/equipment/{self.equipment.id}/history/', {'limit': 2, 'cursor': body['next_cursor']}
+        ).json()
+        self.assertNotIn('summary', body)
+        self.assertEqual([row['subject'] for row in body['results']], ['Request 2', 'Request 1'])
 
-# Create your tests here.
+    def test_missing_equipment(self):
+        self.assertEqual(self.client.get('/equipment/0/history/').status_code, 404)
@@ -4,10 +4,19 @@ from .views import *
 urlpatterns = [
 
     path('create/', equipment_create_view, name='equipment-create'),
+    path('import/', equipment_import_view, name='equipment-import'),
+    path('bulk-update/', equipment_bulk_update_view, name='equipment-bulk-update'),
+    path('search/', equipment_search_view, name='equipment-search'),
+    path('lookup/', equipment_serial_lookup_view, name='equipment-serial-lookup'),
+    path('lookup/batch/', equipment_serial_batch_lookup_view, name='equipment-serial-batch-lookup'),
+    path('lookup/stats/', equipment_serial_cache_stats_view, name='equipment-serial-cache-stats'),
+    path('warranty-expiring/', equipment_warranty_expiring_view, name='equipment-warranty-expiring'),
     path('list/', list_equipment_view, name='equipment-list'),
     path('<int:pk>/', equipment_detail_view, name='equipment-detail'),
     path('<int:pk>/update/', equipment_update_view, name='equipment-update'),
     path('<int:pk>/delete/', equipment_delete_view, name='equipment-delete'),
+    path('delete-jobs/<int:job_id>/', equipment_delete_job_view, name='equipment-delete-job'),
     path('<int:pk>/maintenancerequests/', getmaintancerequestforequipment_view, name='get-maintenance-requests-for-equipment'),
+    path('<int:pk>/history/', equipment_history_view, name='equipment-history'),
 
 ]
\ No newline at end of file
@@ -1,8 +1,63 @@
 from django.shortcuts import render
 from django.http import JsonResponse
-from .models import Equipment
-
+from django.core.exceptions import ValidationError
+from django.db.models import Count
+from django.utils import timezone
+from .models import Equipment, EquipmentDeletionJob
+from maintenance.aggregates import request_summary
+from maintenance.models import MaintenanceRequest
+from .jobs import schedule_equipment_deletion
+from .cache import serial_cache
+from .search import MAX_SEARCH_LIMIT, DEFAULT_SEARCH_LIMIT, search_equipment
+from .imports import READERS, import_equipment
+from .bulk import bulk_update_equipment, clean_patch
+from gearguard_backend.pagination import keyset_paginate, parse_limit, parse_sort
+from gearguard_backend.projections import Projection
+
+import csv
 import json
+from datetime import timedelta
+
+
+EQUIPMENT_ROW = Projection(
+    id='id',
+    name='name',
+    serial_number='serial_number',
+    department='department_id',
+    assigned_to='assigned_to_id',
+    maintenance_team='maintenance_team_id',
+    location='location',
+    purchase_date='purchase_date',
+    warranty_expiry='warranty_expiry',
+    is_scrapped='is_scrapped',
+)
+
+EQUIPMENT_MAINTENANCE_REQUEST_ROW = Projection(
+    id='id',
+    subject='subject',
+    description='description',
+    request_type='request_type',
+    status='status',
+    assigned_to='assigned_to_id',
+    assigned_team='assigned_team_id',
+    scheduled_date='scheduled_date',
+    duration_hours='duration_hours',
+    created_by='created_by_id',
+    created_at='created_at',
+)
+
+DELETION_JOB_ROW = Projection(
+    id='id',
+    equipment_id='equipment_id',
+    equipment_name='equipment_name',
+    status='status',
+    total_requests='total_requests',
+    deleted_requests='deleted_requests',
+    deleted_logs='deleted_logs',
+    error='error',
+    created_at='created_at',
+    finished_at='finished_at',
+)
 
 
 # Create your views here.
@@ -44,21 +99,139 @@ def equipment_create_view(request):
         location=location,purchase_date=purchase_date,
         warranty_expiry=warranty_expiry,is_scrapped=is_scrapped)
 
-        return JsonResponse({'id':equipment.id,'name':equipment.name,
-        'serial_number':equipment.serial_number,
-        'department':equipment.department.id,
-        'assigned_to':equipment.assigned_to.id if equipment.assigned_to else None,
-        'maintenance_team':equipment.maintenance_team.id if equipment.maintenance_team else None,
-        'location':equipment.location,
-        'purchase_date':equipment.purchase_date,
-        'warranty_expiry':equipment.warranty_expiry,
-        'is_scrapped':equipment.is_scrapped},status=201)     
+        return JsonResponse(EQUIPMENT_ROW.row(equipment),status=201)     
 
 
     except Exception as e:
         return JsonResponse({'error': str(e)}, status=400)    
    
 
+EQUIPMENT_SORT_FIELDS = ('created_at', 'name', 'serial_number', 'location', 'purchase_date', 'warranty_expiry')
+EQUIPMENT_FILTER_PARAMS = ('department', 'maintenance_team', 'assigned_to', 'is_scrapped', 'location')
+
+
+def parse_id(name, value):
+    if isinstance(value, bool) or not str(value).isdigit() or int(value) < 1:
+        raise ValueError(f'{name} must be a positive integer id')
+    return int(value)
+
+
+def filter_equipment(queryset, params, required=False):
+    """
+    Applies the server-side list filters taken from the query string
+    (or from the "filter" object of a bulk update).
+
+    Supported params : department, maintenance_team, assigned_to, is_scrapped, location
+
+    Ids must be positive integers; an explicit null id (JSON filters) selects
+    equipment without one. Empty values are ignored, unless ``required`` and
+    nothing else is left to filter on: a bulk update must never fall back to
+    the whole table, so that raises ValueError like any invalid value.
+    """
+
+    conditions = {}
+    for param in ('department', 'maintenance_team', 'assigned_to'):
+        if param in params and params[param] is None:
+            conditions[f'{param}__isnull'] = True
+        elif params.get(param) not in (None, ''):
+            conditions[f'{param}_id'] = parse_id(param, params[param])
+
+    is_scrapped = params.get('is_scrapped')
+    if is_scrapped not in (None, ''):
+        is_scrapped = str(is_scrapped).lower()
+        if is_scrapped not in ('true', 'false'):
+            raise ValueError('is_scrapped must be true or false')
+        conditions['is_scrapped'] = is_scrapped == 'true'
+
+    location = params.get('location')
+    if location:
+        conditions['location'] = location
+
+    if required and not conditions:
+        raise ValueError('filter must select on at least one non-empty value')
+    return queryset.filter(**conditions)
+
+
+def equipment_import_view(request):
+
+    """
+    Docstring for equipment_import_view
+
+    :param request: Description of request parameter
+    :return: Description of return value
+
+    Bulk-creates equipment from a CSV or NDJSON upload, sent either as the
+    multipart field "file" or as the raw request body.
+    Query params : format (csv or ndjson; defaults from the upload's content type)
+    Columns : name,serial_number,department,assigned_to,maintenance_team,location,purchase_date,warranty_expiry,is_scrapped
+
+    The upload is streamed in chunks, so memory stays flat whatever the file size.
+    Returns created/failed counts and a per-row error report.
+
+    """
+
+    if not request.method=='POST':
+        return JsonResponse({'error':'Invalid HTTP method'},status=405)
+
+    upload=request.FILES.get('file') if request.content_type=='multipart/form-data' else None
+    content_type=upload.content_type if upload else request.content_type
+    fmt=request.GET.get('format') or ('ndjson' if 'json' in (content_type or '') else 'csv')
+    if fmt not in READERS:
+        return JsonResponse({'error':'format must be csv or ndjson'},status=400)
+
+    try:
+        report=import_equipment(upload if upload else request,fmt)
+    except (csv.Error,UnicodeDecodeError) as e:
+        return JsonResponse({'error':str(e)},status=400)
+    return JsonResponse(report,status=200)
+
+
+def equipment_bulk_update_view(request):
+
+    """
+    Docstring for equipment_bulk_update_view
+
+    :param request: Description of request parameter
+    :return: Description of return value
+
+    Requested data : ids (list of equipment ids) or filter (department, maintenance_team, assigned_to, is_scrapped, location),
+    patch (any of department, assigned_to, maintenance_team, location, is_scrapped)
+
+    e.g. {"filter": {"maintenance_team": 3}, "patch": {"is_scrapped": true}} scraps a whole line.
+    Applies the patch with set-based UPDATE statements in one transaction.
+    Returns the number of updated rows.
+
+    """
+
+    if not request.method=='POST':
+        return JsonResponse({'error':'Invalid HTTP method'},status=405)
+
+    try:
+        data=json.loads(request.body)
+        ids=data.get('ids')
+        filters=data.get('filter')
+        if (ids is None)==(filters is None):
+            return JsonResponse({'error':'Provide exactly one of ids or filter'},status=400)
+        if ids is not None:
+            if not isinstance(ids,list) or not ids:
+                return JsonResponse({'error':'ids must be a non-empty list'},status=400)
+            ids=[parse_id('ids',pk) for pk in ids]
+        elif not isinstance(filters,dict) or not filters:
+            return JsonResponse({'error':'filter must be a non-empty object'},status=400)
+        elif set(filters)-set(EQUIPMENT_FILTER_PARAMS):
+            return JsonResponse({'error':f'filter supports only {", ".join(EQUIPMENT_FILTER_PARAMS)}'},status=400)
+
+        values=clean_patch(data.get('patch'))
+        equipments=Equipment.objects.all() if ids is not None else filter_equipment(Equipment.objects.all(),filters,required=True)
+        updated=bulk_update_equipment(equipments,values,ids)
+    except ValidationError as e:
+        return JsonResponse({'error':' '.join(e.messages)},status=400)
+    except (ValueError,TypeError) as e:
+        return JsonResponse({'error':str(e)},status=400)
+
+    return JsonResponse({'updated':updated},status=200)
+
+
 def list_equipment_view(request):
 
     """
@@ -66,30 +239,199 @@ def list_equipment_view(request):
     
     :param request: Description
     :return: Description of return value
-    Returns a list of all equipment objects.
+    Returns one page of equipment objects.
+
+    Query params : department, maintenance_team, assigned_to, is_scrapped, location,
+    sort (created_at, name, serial_number, location, purchase_date, warranty_expiry, prefix with - for descending),
+    cursor (next_cursor of the previous page), limit
+
+    Returns {'results': [...], 'next_cursor': ...}; next_cursor is null on the last page.
 
     """
 
     if not request.method=='GET':
         return JsonResponse({'error':'Invalid HTTP method'},status=405)
+
+    try:
+        field,descending=parse_sort(request.GET.get('sort'),EQUIPMENT_SORT_FIELDS,'created_at')
+        limit=parse_limit(request.GET.get('limit'))
+        equipments=filter_equipment(Equipment.objects.all(),request.GET)
+        equipments=EQUIPMENT_ROW.values(equipments,field)
+        page,next_cursor=keyset_paginate(equipments,field,descending,request.GET.get('cursor'),limit)
+    except ValueError as e:
+        return JsonResponse({'error':str(e)},status=400)
+
+    return JsonResponse({'results':EQUIPMENT_ROW.rows(page),'next_cursor':next_cursor})
+
+
+
+
+def equipment_search_view(request):
+
+    """
+    Docstring for equipment_search_view
+
+    :param request: Description
+    :return: Description of return value
+    Query params : q (part of a name, serial number or location), limit
+    Returns the best matching equipment objects, best match first.
+
+    """
+
+    if not request.method=='GET':
+        return JsonResponse({'error':'Invalid HTTP method'},status=405)
+
+    query=request.GET.get('q','').strip()
+    if not query:
+        return JsonResponse({'error':'q is required'},status=400)
+    try:
+        limit=parse_limit(request.GET.get('limit'),DEFAULT_SEARCH_LIMIT,MAX_SEARCH_LIMIT)
+    except ValueError as e:
+        return JsonResponse({'error':str(e)},status=400)
+
+    results=EQUIPMENT_ROW.values(search_equipment(query,limit),'rank')
     data=[]
-    equipments=Equipment.objects.all()
-    for equipment in equipments:
-        data.append({
-            'id':equipment.id,
-            'name':equipment.name,
-            'serial_number':equipment.serial_number,
-            'department':equipment.department.id,
-            'assigned_to':equipment.assigned_to.id if equipment.assigned_to else None,
-            'maintenance_team':equipment.maintenance_team.id if equipment.maintenance_team else None,
-            'location':equipment.location,
-            'purchase_date':equipment.purchase_date,
-            'warranty_expiry':equipment.warranty_expiry,
-            'is_scrapped':equipment.is_scrapped
-        })
-    return JsonResponse(data,safe=False)
+    for row in results:
+        item=EQUIPMENT_ROW.row(row)
+        item['rank']=row['rank']
+        data.append(item)
+    return JsonResponse({'results':data},status=200)
+
+
+MAX_SERIAL_BATCH = 500
+
+
+def lookup_serials(serials):
+    """
+    Resolves serial numbers to equipment rows, serving from the LRU cache and
+    fetching all misses with one IN query.
+    """
+
+    found={}
+    misses=[]
+    for serial in serials:
+        row=serial_cache.get(serial)
+        if row is None:
+            misses.append(serial)
+        else:
+            found[serial]=row
+    if misses:
+        for row in EQUIPMENT_ROW.values(Equipment.objects.filter(serial_number__in=misses)):
+            row=EQUIPMENT_ROW.row(row)
+            serial_cache.set(row['serial_number'],row['id'],row)
+            found[row['serial_number']]=row
+    return found
+
+
+def equipment_serial_lookup_view(request):
 
+    """
+    Docstring for equipment_serial_lookup_view
+
+    :param request: Description
+    :return: Description of return value
+    Query params : serial
+    Returns the equipment object with that serial number or error message.
+    Served from an in-process LRU cache.
+
+    """
+
+    if not request.method=='GET':
+        return JsonResponse({'error':'Invalid HTTP method'},status=405)
+
+    serial=request.GET.get('serial')
+    if not serial:
+        return JsonResponse({'error':'serial is required'},status=400)
+    row=lookup_serials([serial]).get(serial)
+    if row is None:
+        return JsonResponse({'error':'Equipment not found'},status=404)
+    return JsonResponse(row,status=200)
+
+
+def equipment_serial_batch_lookup_view(request):
+
+    """
+    Docstring for equipment_serial_batch_lookup_view
+
+    :param request: Description
+    :return: Description of return value
+    Requested data : serials (list of serial numbers, at most 500)
+    Returns {'found': {serial: equipment}, 'missing': [serials]}.
+
+    """
+
+    if not request.method=='POST':
+        return JsonResponse({'error':'Invalid HTTP method'},status=405)
+
+    try:
+        serials=json.loads(request.body).get('serials')
+    except (ValueError,AttributeError):
+        return JsonResponse({'error':'Invalid JSON body'},status=400)
+    if not isinstance(serials,list) or not all(isinstance(serial,str) for serial in serials):
+        return JsonResponse({'error':'serials must be a list of strings'},status=400)
+    if len(serials)>MAX_SERIAL_BATCH:
+        return JsonResponse({'error':f'At most {MAX_SERIAL_BATCH} serials per batch'},status=400)
+
+    serials=list(dict.fromkeys(serials))
+    found=lookup_serials(serials)
+    return JsonResponse({'found':found,'missing':[serial for serial in serials if serial not in found]},status=200)
+
+
+def equipment_serial_cache_stats_view(request):
+
+    """
+    Returns this process's serial lookup cache counters (size, hits, misses, hit ratio, evictions).
+    """
+
+    if not request.method=='GET':
+        return JsonResponse({'error':'Invalid HTTP method'},status=405)
+    return JsonResponse(serial_cache.stats(),status=200)
+
+
+WARRANTY_DEFAULT_DAYS = 30
+WARRANTY_MAX_DAYS = 3650
+
+
+def equipment_warranty_expiring_view(request):
+
+    """
+    Docstring for equipment_warranty_expiring_view
+
+    :param request: Description
+    :return: Description of return value
+    Query params : days (horizon, default 30), department, cursor, limit
+    Returns live (not scrapped) equipment whose warranty expires between today and today + days:
+    per-department counts for the whole horizon and one page of equipment ordered by warranty_expiry.
 
+    """
+
+    if not request.method=='GET':
+        return JsonResponse({'error':'Invalid HTTP method'},status=405)
+
+    try:
+        days=int(request.GET.get('days') or WARRANTY_DEFAULT_DAYS)
+        if not 0<=days<=WARRANTY_MAX_DAYS:
+            raise ValueError(f'days must be between 0 and {WARRANTY_MAX_DAYS}')
+        limit=parse_limit(request.GET.get('limit'))
+        today=timezone.localdate()
+        until=today+timedelta(days=days)
+
+        # Matches the partial index predicate, so both queries stay on it.
+        expiring=Equipment.objects.filter(is_scrapped=False,warranty_expiry__gte=today,warranty_expiry__lte=until)
+        departments=list(expiring.values('department_id').annotate(count=Count('id')).order_by('department_id'))
+        if request.GET.get('department'):
+            expiring=expiring.filter(department_id=int(request.GET['department']))
+        page,next_cursor=keyset_paginate(EQUIPMENT_ROW.values(expiring),'warranty_expiry',False,request.GET.get('cursor'),limit)
+    except ValueError as e:
+        return JsonResponse({'error':str(e)},status=400)
+
+    return JsonResponse({
+        'from':today,
+        'until':until,
+        'departments':[{'department':row['department_id'],'count':row['count']} for row in departments],
+        'results':EQUIPMENT_ROW.rows(page),
+        'next_cursor':next_cursor,
+    },status=200)
 
 
 def equipment_detail_view(request,pk):
@@ -110,20 +452,8 @@ def equipment_detail_view(request,pk):
         return JsonResponse({'error':'Invalid HTTP method'},status=405)
     
     try:
-        equipment=Equipment.objects.get(id=pk)
-        data={
-            'id':equipment.id,
-            'name':equipment.name,
-            'serial_number':equipment.serial_number,
-            'department':equipment.department.id,
-            'assigned_to':equipment.assigned_to.id if equipment.assigned_to else None,
-            'maintenance_team':equipment.maintenance_team.id if equipment.maintenance_team else None,
-            'location':equipment.location,
-            'purchase_date':equipment.purchase_date,
-            'warranty_expiry':equipment.warranty_expiry,
-            'is_scrapped':equipment.is_scrapped
-        }
-        return JsonResponse(data,status=200)
+        data=EQUIPMENT_ROW.values(Equipment.objects.filter(id=pk)).get()
+        return JsonResponse(EQUIPMENT_ROW.row(data),status=200)
     except Equipment.DoesNotExist:
         return JsonResponse({'error':'Equipment not found'},status=404)
 
@@ -152,9 +482,9 @@ def equipment_update_view(request, pk):
 
         equipment.name=data.get('name',equipment.name)
         equipment.serial_number=data.get('serial_number',equipment.serial_number)
-        equipment.department_id=data.get('department',equipment.department.id)
-        equipment.assigned_to_id=data.get('assigned_to',equipment.assigned_to.id if equipment.assigned_to else None)
-        equipment.maintenance_team_id=data.get('maintenance_team',equipment.maintenance_team.id if equipment.maintenance_team else None)
+        equipment.department_id=data.get('department',equipment.department_id)
+        equipment.assigned_to_id=data.get('assigned_to',equipment.assigned_to_id)
+        equipment.maintenance_team_id=data.get('maintenance_team',equipment.maintenance_team_id)
         equipment.location=data.get('location',equipment.location)
         equipment.purchase_date=data.get('purchase_date',equipment.purchase_date)
         equipment.warranty_expiry=data.get('warranty_expiry',equipment.warranty_expiry)
@@ -164,9 +494,9 @@ def equipment_update_view(request, pk):
 
         return JsonResponse({'id':equipment.id,'name':equipment.name,
         'serial_number':equipment.serial_number,
-        'department':equipment.department.id,
-        'assigned_to':equipment.assigned_to.id if equipment.assigned_to else None,
-        'maintenance_team':equipment.maintenance_team.id if equipment.maintenance_team else None,
+        'department':equipment.department_id,
+        'assigned_to':equipment.assigned_to_id,
+        'maintenance_team':equipment.maintenance_team_id,
     })
     except Equipment.DoesNotExist:
         return JsonResponse({'error':'Equipment not found'},status=404)
@@ -180,8 +510,9 @@ def equipment_delete_view(request, pk):
     :param equipment_id: Description
     
     :return: Description of return value
-    Deletes a specific equipment object by ID.
-    Returns success message or error message.
+    Deletes a specific equipment object by ID, together with its maintenance
+    requests and logs, in a background job.
+    Returns the job id right away (poll equipment/delete-jobs/<job_id>/) or error message.
 
     """
 
@@ -189,12 +520,34 @@ def equipment_delete_view(request, pk):
         return JsonResponse({'error':'Invalid HTTP method'},status=405)
     
     try:
-        equipment=Equipment.objects.get(id=pk)
-        equipment.delete()  
-        return JsonResponse({'message':'Equipment deleted successfully'},status=200)
+        equipment=Equipment.objects.only('id','name').get(id=pk)
+        job=schedule_equipment_deletion(equipment)
+        return JsonResponse({'message':'Equipment deletion started','job_id':job.id,'status':job.status},status=202)
     except Equipment.DoesNotExist:
         return JsonResponse({'error':'Equipment not found'},status=404)
 
+def equipment_delete_job_view(request, job_id):
+
+    """
+    Docstring for equipment_delete_job_view
+
+    :param request: Description
+    :param job_id: Description
+
+    :return: Description of return value
+    Returns the status and progress of a background equipment deletion.
+
+    """
+
+    if not request.method=='GET':
+        return JsonResponse({'error':'Invalid HTTP method'},status=405)
+
+    try:
+        job=EquipmentDeletionJob.objects.get(id=job_id)
+        return JsonResponse(DELETION_JOB_ROW.row(job),status=200)
+    except EquipmentDeletionJob.DoesNotExist:
+        return JsonResponse({'error':'Job not found'},status=404)
+
 def getmaintancerequestforequipment_view(request, pk):
     
     """
@@ -214,34 +567,43 @@ def getmaintancerequestforequipment_view(request, pk):
 
     
     try:
-        equipment=Equipment.objects.get(id=pk)
-        maintenancerequests=equipment.maintenancerequest_set.all()
-        data=[]
-        for mr in maintenancerequests:
-            data.append({
-                'id':mr.id,
-                'subject':mr.subject,
-                'description':mr.description,
-                'request_type':mr.request_type,
-                'status':mr.status,
-                'assigned_to':mr.assigned_to.id if mr.assigned_to else None,
-                'assigned_team':mr.assigned_team.id if mr.assigned_team else None,
-                'scheduled_date':mr.scheduled_date,
-                'duration_hours':mr.duration_hours,
-                'created_by':mr.created_by.id if mr.created_by else None,
-                'created_at':mr.created_at,
-            })
-        return JsonResponse(data,safe=False,status=200)
+        equipment=Equipment.objects.only('id').get(id=pk)
+        maintenancerequests=EQUIPMENT_MAINTENANCE_REQUEST_ROW.values(equipment.maintenancerequest_set.all())
+        return JsonResponse(EQUIPMENT_MAINTENANCE_REQUEST_ROW.rows(maintenancerequests),safe=False,status=200)
     except Equipment.DoesNotExist:
         return JsonResponse({'error':'Equipment not found'},status=404)
     
-def getName(pk):
-    # try:
-    equipment=Equipment.objects.get(id=pk)
-    data={ 
-        'name':equipment.name,
-    }
-    return data
-        # return Json(data,status=200)
-    # except Equipment.DoesNotExist:
-        # return JsonResponse({'error':'Equipment not found'},status=404)
\ No newline at end of file
+def equipment_history_view(request, pk):
+
+    """
+    Docstring for equipment_history_view
+
+    :param request: Description
+    :param equipment_id: Description
+
+    :return: Description of return value
+    Query params : sort (created_at or -created_at, default newest first), cursor, limit
+    Returns one page of the equipment's maintenance requests. The first page (no cursor)
+    also carries a summary: counts by status and type, total duration_hours, last repair.
+
+    """
+
+    if not request.method=='GET':
+        return JsonResponse({'error':'Invalid HTTP method'},status=405)
+
+    if not Equipment.objects.filter(id=pk).exists():
+        return JsonResponse({'error':'Equipment not found'},status=404)
+
+    try:
+        field,descending=parse_sort(request.GET.get('sort'),('created_at',),'-created_at')
+        limit=parse_limit(request.GET.get('limit'))
+        cursor=request.GET.get('cursor')
+        history=MaintenanceRequest.objects.filter(equipment_id=pk)
+        page,next_cursor=keyset_paginate(EQUIPMENT_MAINTENANCE_REQUEST_ROW.values(history),field,descending,cursor,limit)
+    except ValueError as e:
+        return JsonResponse({'error':str(e)},status=400)
+
+    data={'equipment':pk,'results':EQUIPMENT_MAINTENANCE_REQUEST_ROW.rows(page),'next_cursor':next_cursor}
+    if not cursor:
+        data['summary']=request_summary(history)
+    return JsonResponse(data,status=200)
@@ -0,0 +1,41 @@
+import time
+from contextlib import contextmanager
+
+from django.db import connection, transaction
+
+
+class Rollback(Exception):
+    pass
+
+
+@contextmanager
+def rolled_back():
+    """
+    Runs the block in a transaction that is always rolled back, so benchmark
+    commands can seed synthetic rows into a dev database without leaving them.
+    """
+
+    try:
+        with transaction.atomic():
+            yield
+            raise Rollback
+    except Rollback:
+        pass
+
+
+def measure(fn):
+    """
+    Calls ``fn`` once and returns ``(seconds, query count, result)``.
+    """
+
+    queries = []
+
+    def count(execute, sql, params, many, context):
+        queries.append(sql)
+        return execute(sql, params, many, context)
+
+    with connection.execute_wrapper(count):
+        started = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - started
+    return elapsed, len(queries), result
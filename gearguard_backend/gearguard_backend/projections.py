@@ -0,0 +1,31 @@
+class Projection:
+    """
+    Maps response keys to model column names (attnames such as
+    ``department_id``) so a row can be built without touching related objects.
+
+    The same projection serializes a ``.values()`` row or a model instance;
+    either way foreign keys are read from their ``*_id`` column and never
+    trigger a lazy load.
+    """
+
+    def __init__(self, **columns):
+        self.columns = columns
+
+    def values(self, queryset, *extra):
+        """
+        Selects only the projected columns, plus any ``extra`` ones needed by
+        the caller (e.g. a sort key for keyset pagination).
+        """
+
+        return queryset.values(*dict.fromkeys([*self.columns.values(), *extra]))
+
+    def row(self, source):
+        if isinstance(source, dict):
+            return {key: source[column] for key, column in self.columns.items()}
+        return {key: getattr(source, column) for key, column in self.columns.items()}
+
+    def rows(self, sources):
+        return [self.row(source) for source in sources]
+
+    def extend(self, **columns):
+        return Projection(**{**self.columns, **columns})
@@ -89,6 +89,7 @@ INSTALLED_APPS = [
     'django.contrib.sessions',
     'django.contrib.messages',
     'django.contrib.staticfiles',
+    'django.contrib.postgres',
     'rest_framework',
 ]
 
@@ -149,10 +150,26 @@ DATABASES = {
         'OPTIONS': {
             'sslmode': os.getenv('sslmode'),
         },
+        # Persistent connections, for request threads and the analytics
+        # query workers alike; checked before reuse.
+        'CONN_MAX_AGE': int(os.getenv('conn_max_age', 60)),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
 
 
+# Shared cache for every worker process. Without it each process falls
+# back to its own locmem cache, so team membership is not cached at all
+# (see teams.membership) and analytics results are cached per process.
+if os.getenv('redis_url'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.getenv('redis_url'),
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
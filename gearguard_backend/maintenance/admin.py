@@ -1,6 +1,8 @@
 from django.contrib import admin
-from .models import MaintenanceLog,MaintenanceRequest
+from .models import ArchivedMaintenanceLog,MaintenanceLog,MaintenanceRequest,RecurrenceRule
 # Register your models here.
 
 admin.site.register(MaintenanceLog)
-admin.site.register(MaintenanceRequest)
\ No newline at end of file
+admin.site.register(ArchivedMaintenanceLog)
+admin.site.register(MaintenanceRequest)
+admin.site.register(RecurrenceRule)
@@ -0,0 +1,31 @@
+from django.db.models import Count, Max, Q, Sum
+
+from .models import MaintenanceRequest
+
+
+STATUSES = [value for value, _ in MaintenanceRequest.STATUS_CHOICES]
+TYPES = [value for value, _ in MaintenanceRequest.TYPE_CHOICES]
+
+
+def request_summary(queryset):
+    """
+    Summarizes a MaintenanceRequest queryset in a single aggregate query:
+    counts per status and per type, total duration_hours and the creation
+    time of the latest repaired request.
+    """
+
+    aggregates = {'total': Count('id'), 'duration_hours': Sum('duration_hours')}
+    for status in STATUSES:
+        aggregates[f'status_{status}'] = Count('id', filter=Q(status=status))
+    for request_type in TYPES:
+        aggregates[f'type_{request_type}'] = Count('id', filter=Q(request_type=request_type))
+    aggregates['last_repair_at'] = Max('created_at', filter=Q(status='repaired'))
+
+    row = queryset.aggregate(**aggregates)
+    return {
+        'total': row['total'],
+        'by_status': {status: row[f'status_{status}'] for status in STATUSES},
+        'by_type': {request_type: row[f'type_{request_type}'] for request_type in TYPES},
+        'duration_hours': row['duration_hours'] or 0,
+        'last_repair_at': row['last_repair_at'],
+    }
@@ -0,0 +1,86 @@
+import heapq
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from gearguard_backend.pagination import DEFAULT_PAGE_SIZE, encode_cursor, keyset_paginate
+from gearguard_backend.projections import Projection
+from .models import ArchivedMaintenanceLog, MaintenanceLog
+
+
+LOG_RETENTION_DAYS = getattr(settings, 'MAINTENANCE_LOG_RETENTION_DAYS', 365)
+ARCHIVE_BATCH_SIZE = 5000
+
+LOG_ROW = Projection(
+    id='id',
+    maintenance_request_id='maintenance_request_id',
+    action='action',
+    performed_by_id='performed_by_id',
+    timestamp='timestamp',
+)
+
+
+def retention_cutoff(days=None):
+    return timezone.now() - timedelta(days=LOG_RETENTION_DAYS if days is None else days)
+
+
+def archive_logs(before, batch_size=ARCHIVE_BATCH_SIZE, max_batches=None):
+    """
+    Moves MaintenanceLog rows with ``timestamp < before`` to the archive
+    table, oldest first, ``batch_size`` rows per short transaction: one
+    indexed read, one bulk insert and one delete by id. Yields the number
+    of rows moved per batch; stops after ``max_batches`` when given.
+
+    Archived rows keep their id and the insert ignores conflicts, so a run
+    interrupted between batches can simply be started again.
+    """
+
+    columns = list(LOG_ROW.columns.values())
+    batches = 0
+    while max_batches is None or batches < max_batches:
+        with transaction.atomic():
+            rows = list(
+                MaintenanceLog.objects
+                .filter(timestamp__lt=before)
+                .order_by('timestamp', 'id')
+                .values(*columns)[:batch_size]
+            )
+            if not rows:
+                return
+            ArchivedMaintenanceLog.objects.bulk_create(
+                [ArchivedMaintenanceLog(**row) for row in rows], ignore_conflicts=True,
+            )
+            MaintenanceLog.objects.filter(id__in=[row['id'] for row in rows]).delete()
+        batches += 1
+        yield len(rows)
+
+
+def log_history(request_id, full=False, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    Returns one page of a request's logs, newest first, and the next cursor.
+
+    By default only the hot table is read. With ``full`` the page spans hot
+    and archived logs: both tables are paged with the same (timestamp, id)
+    keyset, which stays valid across them because archived logs keep their
+    ids, and the two sorted pages are merged. That is still one indexed
+    range read per table, whatever page is asked for.
+    """
+
+    hot = LOG_ROW.values(MaintenanceLog.objects.filter(maintenance_request_id=request_id))
+    rows, next_cursor = keyset_paginate(hot, 'timestamp', True, cursor, limit)
+    if not full:
+        return [{**row, 'archived': False} for row in rows], next_cursor
+
+    archived = LOG_ROW.values(ArchivedMaintenanceLog.objects.filter(maintenance_request_id=request_id))
+    archived_rows, archived_cursor = keyset_paginate(archived, 'timestamp', True, cursor, limit)
+    merged = list(heapq.merge(
+        ({**row, 'archived': False} for row in rows),
+        ({**row, 'archived': True} for row in archived_rows),
+        key=lambda row: (row['timestamp'], row['id']),
+        reverse=True,
+    ))
+    page = merged[:limit]
+    more = len(merged) > limit or next_cursor or archived_cursor
+    return page, encode_cursor([page[-1]['timestamp'], page[-1]['id']]) if more else None
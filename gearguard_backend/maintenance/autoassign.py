@@ -0,0 +1,86 @@
+import heapq
+
+from django.db.models import Count, F, Sum
+from django.db.models.functions import Coalesce
+
+from users.models import GearguardUser
+from .models import MaintenanceRequest
+
+
+OPEN_STATUSES = ('new', 'in_progress')
+DEFAULT_DURATION_HOURS = 1.0
+MAX_AUTO_ASSIGN_BATCH = 10000
+
+
+def team_technician_ids(team_id):
+    return list(
+        GearguardUser.objects.filter(teams=team_id, role='technician').order_by('id').values_list('id', flat=True)
+    )
+
+
+def technician_loads(technician_ids):
+    """
+    Returns {technician id: (scheduled hours, open request count)} for
+    every technician, from one aggregate query over their open requests.
+    Requests without a duration count DEFAULT_DURATION_HOURS, as in
+    plan_assignments.
+    """
+
+    loads = {technician_id: (0.0, 0) for technician_id in technician_ids}
+    rows = (
+        MaintenanceRequest.objects
+        .filter(assigned_to_id__in=technician_ids, status__in=OPEN_STATUSES)
+        .values('assigned_to_id')
+        .annotate(open=Count('id'), hours=Sum(Coalesce('duration_hours', DEFAULT_DURATION_HOURS)))
+    )
+    for row in rows:
+        loads[row['assigned_to_id']] = (row['hours'] or 0.0, row['open'])
+    return loads
+
+
+def plan_assignments(requests, loads):
+    """
+    Spreads ``requests`` ((id, duration_hours) pairs, in priority order)
+    over technicians with a min-heap keyed by (scheduled hours, open count,
+    id): each request goes to the currently least loaded technician, whose
+    load then grows by the request's duration. O(n log t) for n requests
+    and t technicians. Returns {request id: technician id}.
+    """
+
+    heap = [(hours, count, technician_id) for technician_id, (hours, count) in loads.items()]
+    heapq.heapify(heap)
+    plan = {}
+    if not heap:
+        return plan
+    for request_id, duration in requests:
+        hours, count, technician_id = heap[0]
+        plan[request_id] = technician_id
+        heapq.heapreplace(heap, (hours + (DEFAULT_DURATION_HOURS if duration is None else duration), count + 1, technician_id))
+    return plan
+
+
+def pending_requests(queryset, team_id, limit):
+    """
+    Unassigned new requests of the team, earliest scheduled first (unscheduled
+    ones last), then oldest first.
+    """
+
+    return list(
+        queryset
+        .filter(assigned_team_id=team_id, assigned_to__isnull=True, status='new')
+        .order_by(F('scheduled_date').asc(nulls_last=True), 'created_at', 'id')
+        .values_list('id', 'duration_hours')[:limit]
+    )
+
+
+def auto_assign_plan(queryset, team_id, limit=MAX_AUTO_ASSIGN_BATCH):
+    """
+    Three queries regardless of batch size: the roster, the roster's open
+    load, and the pending requests. Returns {request id: technician id}.
+    """
+
+    technician_ids = team_technician_ids(team_id)
+    if not technician_ids:
+        return {}
+    loads = technician_loads(technician_ids)
+    return plan_assignments(pending_requests(queryset, team_id, limit), loads)
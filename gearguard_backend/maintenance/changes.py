@@ -0,0 +1,80 @@
+import heapq
+
+from django.db import transaction
+
+from gearguard_backend.pagination import DEFAULT_PAGE_SIZE, encode_cursor, keyset_paginate
+from .events import requests_changed
+from .models import (
+    ArchivedMaintenanceLog, ChangeSequence, MaintenanceLog, MaintenanceRequest, MaintenanceRequestTombstone,
+)
+
+
+def changes_since(queryset, projection, cursor=None, limit=DEFAULT_PAGE_SIZE):
+    """
+    Returns the rows of ``queryset`` written after ``cursor`` and the ids of
+    requests deleted after it, in change order, at most ``limit`` in total:
+    ``(rows, deleted ids, next cursor, has more)``.
+
+    The cursor is the (change_seq, id) of the last change delivered, so each
+    poll is one range read over the (change_seq, id) index of the requests
+    and one over the tombstones. Both reads are bounded by
+    ``ChangeSequence.current``, read first: a write still running, or
+    committing between the reads, is left for the next poll instead of
+    being skipped by a cursor that moved past it. Without a cursor the
+    feed starts from the beginning, which doubles as the initial sync. The next cursor is only
+    None when nothing has changed yet; clients keep polling with the last
+    one they got.
+
+    Tombstones carry ids only and are not scoped; a request that leaves the
+    caller's scope (e.g. reassigned to another team) is not reported.
+    """
+
+    upto = ChangeSequence.current(MaintenanceRequest.CHANGE_FEED)
+    requests = projection.values(queryset.filter(change_seq__lte=upto), 'change_seq')
+    rows, rows_cursor = keyset_paginate(requests, 'change_seq', False, cursor, limit)
+    tombstones = MaintenanceRequestTombstone.objects.filter(change_seq__lte=upto).values('id', 'change_seq')
+    deleted, deleted_cursor = keyset_paginate(tombstones, 'change_seq', False, cursor, limit)
+
+    merged = list(heapq.merge(
+        ((row['change_seq'], row['id'], row) for row in rows),
+        ((tombstone['change_seq'], tombstone['id'], None) for tombstone in deleted),
+    ))
+    page = merged[:limit]
+    has_more = bool(len(merged) > limit or rows_cursor or deleted_cursor)
+    next_cursor = encode_cursor([page[-1][0], page[-1][1]]) if page else cursor
+    return (
+        [projection.row(row) for _, _, row in page if row is not None],
+        [pk for _, pk, row in page if row is None],
+        next_cursor,
+        has_more,
+    )
+
+
+def delete_requests(ids):
+    """
+    Deletes the requests ``ids`` set-based, for batch jobs: one sequence
+    advance, one locking read, one DELETE per log table and for the
+    requests, one bulk insert of tombstones and one ``requests_changed``
+    announcement (rollups, cache), however many rows the batch holds. A
+    plain queryset delete() runs the per-instance pre_delete receivers
+    instead, a dozen queries per row. Returns the number of rows deleted.
+    """
+
+    with transaction.atomic():
+        change_seq = ChangeSequence.advance(MaintenanceRequest.CHANGE_FEED)
+        rows = list(MaintenanceRequest.objects.select_for_update().filter(id__in=ids).values())
+        if not rows:
+            return 0
+        ids = [row['id'] for row in rows]
+        for model in (MaintenanceLog, ArchivedMaintenanceLog):
+            model.objects.filter(maintenance_request_id__in=ids).delete()
+        MaintenanceRequestTombstone.objects.bulk_create(
+            [MaintenanceRequestTombstone(id=pk, change_seq=change_seq) for pk in ids],
+            update_conflicts=True, unique_fields=['id'], update_fields=['change_seq', 'deleted_at'],
+        )
+        # The rows are announced and tombstoned above; deleting them without
+        # the collector skips the per-instance signals that would do it again.
+        requests = MaintenanceRequest.objects.filter(id__in=ids)
+        requests._raw_delete(requests.db)
+        requests_changed.send(sender=MaintenanceRequest, changes=[(row, None) for row in rows])
+    return len(rows)
@@ -0,0 +1,157 @@
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import Case, F, Q, When
+
+from teams.models import MaintenanceTeam
+from users.models import GearguardUser
+from .events import requests_changed
+from .models import ChangeSequence, MaintenanceLog, MaintenanceRequest
+
+
+MAX_BULK_ASSIGNMENTS = 1000
+
+# Statuses from which assigning (-> in_progress) is allowed.
+ASSIGNABLE_STATUSES = sorted(
+    status for status, targets in MaintenanceRequest.TRANSITIONS.items() if 'in_progress' in targets
+)
+
+
+class DispatchError(Exception):
+    pass
+
+
+def parse_assignments(items):
+    """
+    Normalizes [{"id", "team_id", "technician_id"}, ...] into
+    {request id: (team id or None, technician id or None)}.
+    """
+
+    if not isinstance(items, list) or not items:
+        raise DispatchError('assignments must be a non-empty list')
+    if len(items) > MAX_BULK_ASSIGNMENTS:
+        raise DispatchError(f'At most {MAX_BULK_ASSIGNMENTS} assignments per call')
+
+    assignments = {}
+    try:
+        for item in items:
+            team_id = item.get('team_id')
+            technician_id = item.get('technician_id')
+            assignments[int(item['id'])] = (
+                int(team_id) if team_id is not None else None,
+                int(technician_id) if technician_id is not None else None,
+            )
+    except (AttributeError, KeyError, TypeError, ValueError):
+        raise DispatchError('Each assignment needs an integer id and optional integer team_id/technician_id')
+    return assignments
+
+
+def assignment_log(team_id, technician_id):
+    parts = []
+    if team_id is not None:
+        parts.append(f'team {team_id}')
+    if technician_id is not None:
+        parts.append(f'technician {technician_id}')
+    return 'Assigned to ' + ' and '.join(parts) if parts else 'Moved to in progress'
+
+
+def bulk_assign(queryset, assignments, performed_by=None):
+    """
+    Applies {request id: (team id, technician id)} in one transaction:
+    one locking read of the targeted rows, one existence check per
+    referenced model, one UPDATE per distinct (team, technician) pair and
+    one bulk_create for the MaintenanceLog rows. The changed rows are
+    announced with ``requests_changed``; the lock keeps concurrent writers
+    from changing them between the read and the UPDATE, so the announced
+    before-images stay true.
+
+    ``queryset`` is the caller's role-scoped queryset; ids outside it, and
+    requests whose status cannot move to in_progress, are rejected.
+    Returns (assigned ids, {rejected id: reason}).
+    """
+
+    rejected = {}
+    team_ids = {team for team, _ in assignments.values()} - {None}
+    technician_ids = {technician for _, technician in assignments.values()} - {None}
+    known_teams = set(MaintenanceTeam.objects.filter(id__in=team_ids).values_list('id', flat=True)) if team_ids else set()
+    known_technicians = (
+        set(GearguardUser.objects.filter(id__in=technician_ids).values_list('id', flat=True)) if technician_ids else set()
+    )
+
+    with transaction.atomic():
+        # The whole dispatch commits at once, so it shares one change sequence.
+        change_seq = ChangeSequence.advance(MaintenanceRequest.CHANGE_FEED)
+        rows = {
+            row['id']: row
+            for row in queryset.select_for_update().filter(id__in=list(assignments)).order_by('id').values()
+        }
+        statuses = {pk: row['status'] for pk, row in rows.items()}
+
+        groups = defaultdict(list)
+        for pk, (team_id, technician_id) in assignments.items():
+            if pk not in statuses:
+                rejected[pk] = 'Maintenance Request not found'
+            elif statuses[pk] not in ASSIGNABLE_STATUSES:
+                rejected[pk] = f'Cannot move a request from {statuses[pk]} to in_progress'
+            elif team_id is not None and team_id not in known_teams:
+                rejected[pk] = 'Unknown team'
+            elif technician_id is not None and technician_id not in known_technicians:
+                rejected[pk] = 'Unknown technician'
+            else:
+                groups[(team_id, technician_id)].append(pk)
+
+        assigned = []
+        logs = []
+        changed = []
+        for (team_id, technician_id), ids in groups.items():
+            changes = {'status': 'in_progress', 'version': F('version') + 1, 'change_seq': change_seq}
+            if team_id is not None:
+                changes['assigned_team_id'] = team_id
+            if technician_id is not None:
+                changes['assigned_to_id'] = technician_id
+            MaintenanceRequest.objects.filter(id__in=ids).update(**changes)
+            assigned.extend(ids)
+            after = {key: value for key, value in changes.items() if key != 'version'}
+            changed.extend((rows[pk], {**rows[pk], **after, 'version': rows[pk]['version'] + 1}) for pk in ids)
+            action = assignment_log(team_id, technician_id)
+            logs.extend(MaintenanceLog(maintenance_request_id=pk, action=action, performed_by=performed_by) for pk in ids)
+
+        MaintenanceLog.objects.bulk_create(logs)
+        if changed:
+            requests_changed.send(sender=MaintenanceRequest, changes=changed)
+    return assigned, rejected
+
+
+def release_references(fields, pk):
+    """
+    Clears the ``fields`` foreign keys that point at ``pk`` before that
+    team or user is deleted, in one UPDATE that also bumps ``version`` and
+    stamps a new ``change_seq``. The database's SET_NULL would clear them
+    too but bypass the change feed and the ``requests_changed`` receivers,
+    which is why the cleared rows are announced here.
+
+    Call it from pre_delete, inside the delete's transaction. The rows are
+    locked as they are read, so the announced before-images stay true.
+    """
+
+    matches = Q()
+    for field in fields:
+        matches |= Q(**{field: pk})
+    with transaction.atomic():
+        change_seq = ChangeSequence.advance(MaintenanceRequest.CHANGE_FEED)
+        rows = list(MaintenanceRequest.objects.select_for_update().filter(matches).values())
+        if not rows:
+            return
+        cleared = {field: Case(When(**{field: pk}, then=None), default=F(field)) for field in fields}
+        MaintenanceRequest.objects.filter(id__in=[row['id'] for row in rows]).update(
+            **cleared, version=F('version') + 1, change_seq=change_seq,
+        )
+        changed = []
+        for row in rows:
+            after = {**row, 'version': row['version'] + 1, 'change_seq': change_seq}
+            for field in fields:
+                attname = MaintenanceRequest._meta.get_field(field).attname
+                if after[attname] == pk:
+                    after[attname] = None
+            changed.append((row, after))
+        requests_changed.send(sender=MaintenanceRequest, changes=changed)
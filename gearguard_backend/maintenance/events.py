@@ -0,0 +1,12 @@
+from django.dispatch import Signal
+
+
+# Sent by set-based writers (queryset.update(), bulk_create()) that bypass
+# post_save, with ``changes``: a list of (before, after) row dicts keyed by
+# attname. ``before`` is None for inserted rows. Sent inside the writer's
+# transaction.
+#
+# Writers inserting many rows that share their columns may instead send
+# ``inserted``: a list of (row, count) pairs, each standing for ``count``
+# new rows equal to ``row`` on the columns it carries.
+requests_changed = Signal()
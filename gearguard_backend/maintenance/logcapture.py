@@ -0,0 +1,207 @@
+import atexit
+import logging
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DatabaseError, connections, transaction
+from django.utils import timezone
+
+from .dispatch import assignment_log
+from .models import MaintenanceLog, MaintenanceRequest
+
+
+logger = logging.getLogger(__name__)
+
+LOG_FLUSH_SIZE = 500
+LOG_FLUSH_INTERVAL = 2.0
+MAX_PENDING_LOGS = 50000
+
+
+class LogBuffer:
+    """
+    In-process queue of MaintenanceLog entries, written with one bulk_create
+    per flush instead of one INSERT per change.
+
+    A daemon thread flushes every ``flush_interval`` seconds, or as soon as
+    ``flush_size`` entries are waiting. With ``flush_interval=None`` no
+    thread is started and the owner calls ``flush()`` itself. At most
+    ``max_pending`` entries are held; beyond that new entries are dropped
+    and counted, so a database outage cannot exhaust memory.
+    """
+
+    def __init__(self, flush_size=LOG_FLUSH_SIZE, flush_interval=LOG_FLUSH_INTERVAL, max_pending=MAX_PENDING_LOGS):
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.pending = []
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+        self.wakeup = threading.Event()
+        self.stopping = False
+        self.thread = None
+        self.recorded = 0
+        self.written = 0
+        self.dropped = 0
+        self.flushes = 0
+
+    def record(self, request_id, action, performed_by_id=None, timestamp=None):
+        with self.lock:
+            if len(self.pending) >= self.max_pending:
+                self.dropped += 1
+                return
+            self.pending.append((request_id, action, performed_by_id, timestamp or timezone.now()))
+            self.recorded += 1
+            full = len(self.pending) >= self.flush_size
+        self.start()
+        if full:
+            self.wakeup.set()
+
+    def start(self):
+        if self.flush_interval is None or self.stopping or (self.thread and self.thread.is_alive()):
+            return
+        with self.lock:
+            if self.thread and self.thread.is_alive():
+                return
+            self.thread = threading.Thread(target=self.run, name='maintenance-log-writer', daemon=True)
+            self.thread.start()
+
+    def run(self):
+        while not self.stopping:
+            self.wakeup.wait(self.flush_interval)
+            self.wakeup.clear()
+            self.flush()
+            # Also after a flush that skipped every entry: the lookup of
+            # live requests has opened a connection all the same.
+            connections.close_all()
+
+    def flush(self):
+        """
+        Writes every pending entry with one bulk_create and returns how many
+        rows were inserted. Entries whose request has been deleted since are
+        skipped; on a database error the batch is put back for the next flush.
+        """
+
+        with self.flush_lock:
+            with self.lock:
+                entries, self.pending = self.pending, []
+            if not entries:
+                return 0
+            try:
+                live = set(
+                    MaintenanceRequest.objects
+                    .filter(id__in={entry[0] for entry in entries})
+                    .values_list('id', flat=True)
+                )
+                logs = [
+                    MaintenanceLog(
+                        maintenance_request_id=request_id, action=action,
+                        performed_by_id=performed_by_id, timestamp=timestamp,
+                    )
+                    for request_id, action, performed_by_id, timestamp in entries
+                    if request_id in live
+                ]
+                MaintenanceLog.objects.bulk_create(logs, batch_size=self.flush_size)
+            except DatabaseError:
+                logger.exception('Could not write %d maintenance log entries', len(entries))
+                with self.lock:
+                    keep = entries[:max(self.max_pending - len(self.pending), 0)]
+                    self.dropped += len(entries) - len(keep)
+                    self.pending[:0] = keep
+                return 0
+            self.written += len(logs)
+            self.flushes += 1
+            return len(logs)
+
+    def close(self):
+        """
+        Stops the flusher thread and writes whatever is still queued.
+        Registered with atexit for the process-wide buffer.
+        """
+
+        self.stopping = True
+        self.wakeup.set()
+        if self.thread and self.thread.is_alive() and self.thread is not threading.current_thread():
+            self.thread.join(timeout=5)
+        self.flush()
+
+    def stats(self):
+        with self.lock:
+            pending = len(self.pending)
+        return {
+            'pending': pending,
+            'recorded': self.recorded,
+            'written': self.written,
+            'dropped': self.dropped,
+            'flushes': self.flushes,
+        }
+
+
+log_buffer = LogBuffer(
+    flush_size=getattr(settings, 'MAINTENANCE_LOG_FLUSH_SIZE', LOG_FLUSH_SIZE),
+    flush_interval=getattr(settings, 'MAINTENANCE_LOG_FLUSH_INTERVAL', LOG_FLUSH_INTERVAL),
+)
+atexit.register(log_buffer.close)
+
+
+_performed_by = ContextVar('maintenance_log_performed_by', default=None)
+
+
+@contextmanager
+def performed_by(user):
+    """
+    Attributes the changes saved inside the block to ``user``; used where
+    the save happens behind a serializer and no user can be passed down.
+    """
+
+    token = _performed_by.set(user.id if user is not None else None)
+    try:
+        yield
+    finally:
+        _performed_by.reset(token)
+
+
+def describe_change(before, after):
+    """
+    Returns the log action for the logged fields that differ between
+    ``before`` and ``after`` (dicts keyed by column name), or None.
+    Fields missing from ``after`` are treated as unchanged.
+    """
+
+    parts = []
+    status = after.get('status')
+    if status is not None and status != before.get('status'):
+        parts.append(f"Status {before['status']} -> {status}" if before.get('status') else f'Created as {status}')
+
+    changed = {
+        field for field in ('assigned_team_id', 'assigned_to_id')
+        if field in after and after[field] != before.get(field)
+    }
+    team_id = after['assigned_team_id'] if 'assigned_team_id' in changed else None
+    technician_id = after['assigned_to_id'] if 'assigned_to_id' in changed else None
+    if team_id is not None or technician_id is not None:
+        parts.append(assignment_log(team_id, technician_id))
+    if 'assigned_team_id' in changed and team_id is None and before.get('assigned_team_id') is not None:
+        parts.append('Unassigned team')
+    if 'assigned_to_id' in changed and technician_id is None and before.get('assigned_to_id') is not None:
+        parts.append('Unassigned technician')
+    return '; '.join(parts) or None
+
+
+def record_change(request_id, before, after, performed_by_id=None):
+    """
+    Queues a log entry for the change, once the surrounding transaction
+    commits. The write path only pays for the on_commit registration; the
+    INSERT happens later, batched with other entries.
+    """
+
+    if not getattr(settings, 'MAINTENANCE_LOG_CAPTURE', True):
+        return
+    action = describe_change(before, after)
+    if action is None:
+        return
+    if performed_by_id is None:
+        performed_by_id = _performed_by.get()
+    timestamp = timezone.now()
+    transaction.on_commit(lambda: log_buffer.record(request_id, action, performed_by_id, timestamp))
@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from maintenance.archive import ARCHIVE_BATCH_SIZE, LOG_RETENTION_DAYS, archive_logs, retention_cutoff
+
+
+class Command(BaseCommand):
+    help = (
+        "Moves maintenance logs older than the retention window to the archive table in "
+        "bounded batches. Safe to interrupt and re-run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=LOG_RETENTION_DAYS, help='Retention window in days.')
+        parser.add_argument('--batch-size', type=int, default=ARCHIVE_BATCH_SIZE)
+        parser.add_argument('--max-batches', type=int, default=None, help='Stop after this many batches.')
+
+    def handle(self, *args, **options):
+        if options['days'] < 0:
+            raise CommandError('--days must not be negative')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be a positive integer')
+
+        cutoff = retention_cutoff(options['days'])
+        started = time.perf_counter()
+        moved = sum(archive_logs(cutoff, options['batch_size'], options['max_batches']))
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f'{moved} logs older than {cutoff:%Y-%m-%d} archived in {elapsed:.2f}s')
@@ -0,0 +1,72 @@
+import random
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+
+from departements.models import Department
+from equipment.models import Equipment
+from gearguard_backend.benchmarking import measure, rolled_back
+from maintenance.autoassign import auto_assign_plan, team_technician_ids, technician_loads
+from maintenance.dispatch import bulk_assign
+from maintenance.models import MaintenanceRequest
+from teams.models import MaintenanceTeam
+from users.models import GearguardUser
+
+
+class Command(BaseCommand):
+    help = (
+        "Plans and applies auto-assignment for a synthetic roster with existing open load. "
+        "Runs in a rolled-back transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--technicians', type=int, default=50)
+        parser.add_argument('--pending', type=int, default=5000)
+        parser.add_argument('--open', type=int, default=20000)
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            team = self.seed(options['technicians'], options['pending'], options['open'])
+            self.run(team)
+
+    def seed(self, technician_count, pending_count, open_count):
+        rng = random.Random(16)
+        department = Department.objects.create(name='bench')
+        equipment = Equipment.objects.create(
+            name='bench', serial_number='bench-autoassign', department=department,
+            location='bench', purchase_date=date(2024, 1, 1), warranty_expiry=date(2027, 1, 1),
+        )
+        team = MaintenanceTeam.objects.create(name='bench')
+        technicians = GearguardUser.objects.bulk_create(
+            GearguardUser(username=f'bench-technician-{i}', role='technician') for i in range(technician_count)
+        )
+        team.members.add(*technicians)
+
+        def request(**fields):
+            return MaintenanceRequest(
+                subject='bench', equipment=equipment, request_type='corrective', assigned_team=team,
+                duration_hours=rng.choice([None, 0.5, 1.0, 2.0, 4.0, 8.0]),
+                scheduled_date=date(2026, 1, 1) + timedelta(days=rng.randrange(60)), **fields
+            )
+
+        MaintenanceRequest.objects.bulk_create(
+            (request(assigned_to=rng.choice(technicians), status='in_progress') for _ in range(open_count)),
+            batch_size=5000,
+        )
+        MaintenanceRequest.objects.bulk_create((request() for _ in range(pending_count)), batch_size=5000)
+        return team
+
+    def run(self, team):
+        queryset = MaintenanceRequest.objects.all()
+        plan_seconds, plan_queries, plan = measure(lambda: auto_assign_plan(queryset, team.id))
+        apply_seconds, apply_queries, (assigned, rejected) = measure(
+            lambda: bulk_assign(queryset, {pk: (None, technician) for pk, technician in plan.items()})
+        )
+
+        hours = [row[0] for row in self.loads(team)]
+        self.stdout.write(f'plan:  {len(plan)} requests in {plan_seconds * 1000:.1f}ms, {plan_queries} queries')
+        self.stdout.write(f'apply: {len(assigned)} assigned, {len(rejected)} rejected in {apply_seconds * 1000:.1f}ms, {apply_queries} queries')
+        self.stdout.write(f'open hours per technician after: min {min(hours):.1f}, max {max(hours):.1f}')
+
+    def loads(self, team):
+        return technician_loads(team_technician_ids(team.id)).values()
@@ -0,0 +1,63 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.test import override_settings
+
+from departements.models import Department
+from equipment.models import Equipment
+from gearguard_backend.benchmarking import measure, rolled_back
+from maintenance.logcapture import LogBuffer
+from maintenance.models import MaintenanceLog, MaintenanceRequest
+from maintenance.transitions import transition
+
+
+class Command(BaseCommand):
+    help = (
+        "Times assign transitions with no logging, with a synchronous MaintenanceLog INSERT per "
+        "change and with buffered capture, then times flushing the buffer. Runs in a rolled-back "
+        "transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--changes', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        count = options['changes']
+        with rolled_back():
+            ids = self.seed(count * 3)
+            batches = [ids[i * count:(i + 1) * count] for i in range(3)]
+
+            with override_settings(MAINTENANCE_LOG_CAPTURE=False):
+                self.report('no logging', count, *measure(lambda: self.assign(batches[0])))
+                self.report('sync INSERT', count, *measure(lambda: self.assign(batches[1], sync_log=True)))
+            # Entries are queued on commit, which never comes inside the
+            # rolled-back block: this is exactly the cost left on the request path.
+            self.report('buffered', count, *measure(lambda: self.assign(batches[2])))
+
+            buffer = LogBuffer(flush_interval=None)
+            seconds, queries, _ = measure(lambda: [buffer.record(pk, 'Assigned') for pk in batches[2]])
+            self.report('buffer.record', count, seconds, queries)
+            seconds, queries, written = measure(buffer.flush)
+            self.stdout.write(f'flush: {written} rows in {seconds * 1000:.1f}ms, {queries} queries')
+
+    def report(self, label, count, seconds, queries, result=None):
+        self.stdout.write(f'{label}: {seconds / count * 1e6:.0f}us per change, {queries / count:.2f} queries per change')
+
+    def assign(self, ids, sync_log=False):
+        queryset = MaintenanceRequest.objects.all()
+        for pk in ids:
+            transition(queryset, pk, 'in_progress', assigned_to_id=None)
+            if sync_log:
+                MaintenanceLog.objects.create(maintenance_request_id=pk, action='Status new -> in_progress')
+
+    def seed(self, count):
+        department = Department.objects.create(name='bench')
+        equipment = Equipment.objects.create(
+            name='bench', serial_number='bench-log-capture', department=department,
+            location='bench', purchase_date=date(2024, 1, 1), warranty_expiry=date(2027, 1, 1),
+        )
+        requests = MaintenanceRequest.objects.bulk_create(
+            (MaintenanceRequest(subject='bench', equipment=equipment, request_type='corrective') for _ in range(count)),
+            batch_size=5000,
+        )
+        return [request.id for request in requests]
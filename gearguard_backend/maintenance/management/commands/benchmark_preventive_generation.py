@@ -0,0 +1,52 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from departements.models import Department
+from equipment.models import Equipment
+from gearguard_backend.benchmarking import measure, rolled_back
+from maintenance.models import RecurrenceRule
+from maintenance.recurrence import generate_preventive_requests
+from teams.models import MaintenanceTeam
+
+
+class Command(BaseCommand):
+    help = (
+        "Generates a year of monthly preventive requests for a synthetic fleet, then re-runs "
+        "the generator on the same and a later day to time the idempotent path. Runs in a rolled-back transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--assets', type=int, default=50000)
+        parser.add_argument('--days', type=int, default=365)
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            self.seed(options['assets'])
+            runs = [('first run', date(2026, 1, 1)), ('re-run', date(2026, 1, 1)), ('next day', date(2026, 1, 2))]
+            for label, today in runs:
+                seconds, queries, report = measure(
+                    lambda: generate_preventive_requests(options['days'], today=today)
+                )
+                self.stdout.write(
+                    f"{label}: {report['created']} created, {report['existing']} existing "
+                    f"in {seconds:.2f}s, {queries} queries"
+                )
+
+    def seed(self, asset_count):
+        department = Department.objects.create(name='bench')
+        team = MaintenanceTeam.objects.create(name='bench')
+        Equipment.objects.bulk_create(
+            (
+                Equipment(
+                    name=f'bench-{i}', serial_number=f'bench-preventive-{i}', department=department,
+                    maintenance_team=team, location='bench', purchase_date=date(2024, 1, 1),
+                    warranty_expiry=date(2027, 1, 1),
+                )
+                for i in range(asset_count)
+            ),
+            batch_size=5000,
+        )
+        RecurrenceRule.objects.create(
+            subject='Monthly inspection', team=team, frequency='months', interval=1, start_date=date(2025, 1, 10),
+        )
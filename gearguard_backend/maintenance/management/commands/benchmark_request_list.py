@@ -0,0 +1,74 @@
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.test import RequestFactory
+
+from departements.models import Department
+from equipment.models import Equipment
+from gearguard_backend.benchmarking import measure, rolled_back
+from maintenance.models import MaintenanceRequest
+from maintenance.views import list_maintenance_requests
+from teams.models import MaintenanceTeam
+from users.models import GearguardUser
+
+
+class Command(BaseCommand):
+    help = (
+        "Times /maintenance/list/ against the old per-row lookups on synthetic data. "
+        "Everything runs in a transaction that is rolled back; point it at a dev database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=100000)
+        parser.add_argument('--equipment', type=int, default=2000)
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            self.seed(options['requests'], options['equipment'])
+            self.run()
+
+    def seed(self, request_count, equipment_count):
+        department = Department.objects.create(name='bench')
+        team = MaintenanceTeam.objects.create(name='bench')
+        user = GearguardUser.objects.create(username='bench-technician', role='technician')
+        equipment = Equipment.objects.bulk_create(
+            Equipment(
+                name=f'bench {i}', serial_number=f'bench-{i}', department=department,
+                location='bench', purchase_date=date(2024, 1, 1), warranty_expiry=date(2027, 1, 1),
+            )
+            for i in range(equipment_count)
+        )
+        MaintenanceRequest.objects.bulk_create(
+            (
+                MaintenanceRequest(
+                    subject=f'bench {i}', equipment=equipment[i % equipment_count], request_type='corrective',
+                    assigned_to=user, assigned_team=team, created_by=user,
+                )
+                for i in range(request_count)
+            ),
+            batch_size=5000,
+        )
+
+    def run(self):
+        request = RequestFactory().get('/maintenance/list/')
+
+        legacy_seconds, legacy_queries, _ = measure(self.legacy_list)
+        seconds, queries, _ = measure(lambda: list_maintenance_requests(request))
+
+        self.stdout.write(f'legacy per-row lookups: {legacy_seconds:.2f}s, {legacy_queries} queries')
+        self.stdout.write(f'joined projection:      {seconds:.2f}s, {queries} queries')
+        self.stdout.write(f'speedup: {legacy_seconds / seconds:.1f}x')
+
+    def legacy_list(self):
+        # The row building list_maintenance_requests did before the join:
+        # one Equipment lookup plus three lazy FK loads per request.
+        data = []
+        for mr in MaintenanceRequest.objects.all():
+            data.append({
+                'id': mr.id,
+                'equipment_name': Equipment.objects.get(id=mr.equipment_id).name,
+                'assigned_to_id': mr.assigned_to.id if mr.assigned_to else None,
+                'assigned_team_id': mr.assigned_team.id if mr.assigned_team else None,
+                'created_by_id': mr.created_by.id if mr.created_by else None,
+            })
+        return data
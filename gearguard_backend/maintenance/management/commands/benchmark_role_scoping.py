@@ -0,0 +1,84 @@
+from datetime import date
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+
+from departements.models import Department
+from equipment.models import Equipment
+from gearguard_backend.benchmarking import measure, rolled_back
+from maintenance.models import MaintenanceRequest
+from teams.membership import team_ids_for_user
+from teams.models import MaintenanceTeam
+from users.models import GearguardUser
+
+
+class Command(BaseCommand):
+    help = (
+        "Compares manager scoping through the team members join with the cached team-id IN filter, "
+        "for a manager who belongs to many teams. Runs in a rolled-back transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=100000)
+        parser.add_argument('--teams', type=int, default=500)
+        parser.add_argument('--manager-teams', type=int, default=200)
+        parser.add_argument('--repeat', type=int, default=20)
+
+    def handle(self, *args, **options):
+        with rolled_back():
+            manager = self.seed(options['requests'], options['teams'], options['manager_teams'])
+            self.run(manager, options['repeat'])
+
+    def seed(self, request_count, team_count, manager_team_count):
+        department = Department.objects.create(name='bench')
+        equipment = Equipment.objects.create(
+            name='bench', serial_number='bench-scope', department=department,
+            location='bench', purchase_date=date(2024, 1, 1), warranty_expiry=date(2027, 1, 1),
+        )
+        manager = GearguardUser.objects.create(username='bench-manager', role='manager')
+        technicians = GearguardUser.objects.bulk_create(
+            GearguardUser(username=f'bench-technician-{i}', role='technician') for i in range(20)
+        )
+        teams = MaintenanceTeam.objects.bulk_create(MaintenanceTeam(name=f'bench {i}') for i in range(team_count))
+        Membership = MaintenanceTeam.members.through
+        Membership.objects.bulk_create(
+            [Membership(maintenanceteam_id=team.id, gearguarduser_id=manager.id) for team in teams[:manager_team_count]]
+            + [Membership(maintenanceteam_id=team.id, gearguarduser_id=technician.id)
+               for team in teams for technician in technicians[:5]]
+        )
+        MaintenanceRequest.objects.bulk_create(
+            (
+                MaintenanceRequest(
+                    subject=f'bench {i}', equipment=equipment, request_type='corrective',
+                    assigned_team=teams[i % team_count],
+                )
+                for i in range(request_count)
+            ),
+            batch_size=5000,
+        )
+        return manager
+
+    def run(self, manager, repeat):
+        cache.clear()
+
+        scopes = {
+            'members join': lambda: MaintenanceRequest.objects.filter(assigned_team__members=manager),
+            'cached team ids': lambda: MaintenanceRequest.objects.filter(
+                assigned_team_id__in=team_ids_for_user(manager.id)
+            ),
+        }
+        workloads = {
+            'full scope': lambda queryset: len(queryset.values_list('id', flat=True)),
+            'first page': lambda queryset: len(queryset.order_by('-created_at', '-id').values_list('id', flat=True)[:50]),
+            'count': lambda queryset: queryset.count(),
+        }
+        for workload, run in workloads.items():
+            timings = {}
+            for scope, build in scopes.items():
+                seconds, queries, rows = measure(lambda: [run(build()) for _ in range(repeat)][-1])
+                timings[scope] = seconds
+                self.stdout.write(
+                    f'{workload:<11} {scope:<16} {seconds / repeat * 1000:8.2f}ms/request '
+                    f'{queries / repeat:5.2f} queries/request {rows} rows'
+                )
+            self.stdout.write(f'{workload:<11} speedup {timings["members join"] / timings["cached team ids"]:.1f}x')
@@ -0,0 +1,32 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from maintenance.recurrence import (
+    DEFAULT_HORIZON_DAYS, GENERATION_CHUNK_SIZE, MAX_HORIZON_DAYS, generate_preventive_requests,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Materializes upcoming preventive maintenance requests from active recurrence rules. "
+        "Safe to re-run (e.g. daily from cron): existing occurrences are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=DEFAULT_HORIZON_DAYS, help='Rolling horizon in days.')
+        parser.add_argument('--chunk-size', type=int, default=GENERATION_CHUNK_SIZE)
+
+    def handle(self, *args, **options):
+        if not 0 < options['days'] <= MAX_HORIZON_DAYS:
+            raise CommandError(f'--days must be between 1 and {MAX_HORIZON_DAYS}')
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be a positive integer')
+
+        started = time.perf_counter()
+        report = generate_preventive_requests(options['days'], chunk_size=options['chunk_size'])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(
+            f"{report['rules']} rules, {report['from']} to {report['until']}: "
+            f"{report['created']} created, {report['existing']} already present in {elapsed:.2f}s"
+        )
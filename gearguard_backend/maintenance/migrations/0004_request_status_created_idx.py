@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:27
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0006_equipment_live_warranty_idx'),
+        ('maintenance', '0003_request_equipment_created_idx'),
+        ('teams', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='maintenancerequest',
+            index=models.Index(fields=['status', 'created_at'], name='request_status_created_idx'),
+        ),
+    ]
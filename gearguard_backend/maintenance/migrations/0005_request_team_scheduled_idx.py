@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0006_equipment_live_warranty_idx'),
+        ('maintenance', '0004_request_status_created_idx'),
+        ('teams', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='maintenancerequest',
+            index=models.Index(fields=['assigned_team', 'scheduled_date'], name='request_team_scheduled_idx'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('maintenance', '0005_request_team_scheduled_idx'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='maintenancerequest',
+            name='version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
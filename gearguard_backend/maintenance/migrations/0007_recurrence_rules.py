@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0006_equipment_live_warranty_idx'),
+        ('maintenance', '0006_maintenancerequest_version'),
+        ('teams', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='maintenancerequest',
+            name='occurrence_date',
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='RecurrenceRule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('subject', models.CharField(max_length=255)),
+                ('description', models.TextField(blank=True)),
+                ('frequency', models.CharField(choices=[('days', 'Every N days'), ('months', 'Every N months')], default='days', max_length=10)),
+                ('interval', models.PositiveIntegerField(default=30)),
+                ('start_date', models.DateField()),
+                ('end_date', models.DateField(blank=True, null=True)),
+                ('duration_hours', models.FloatField(blank=True, null=True)),
+                ('is_active', models.BooleanField(default=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('equipment', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='recurrence_rules', to='equipment.equipment')),
+                ('team', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='recurrence_rules', to='teams.maintenanceteam')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='maintenancerequest',
+            name='recurrence_rule',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='requests', to='maintenance.recurrencerule'),
+        ),
+        migrations.AddConstraint(
+            model_name='maintenancerequest',
+            constraint=models.UniqueConstraint(condition=models.Q(('recurrence_rule__isnull', False)), fields=('recurrence_rule', 'occurrence_date', 'equipment'), name='request_rule_occurrence_uniq'),
+        ),
+        migrations.AddConstraint(
+            model_name='recurrencerule',
+            constraint=models.CheckConstraint(condition=models.Q(('equipment__isnull', False), ('team__isnull', False), _connector='OR'), name='recurrence_rule_has_target'),
+        ),
+        migrations.AddConstraint(
+            model_name='recurrencerule',
+            constraint=models.CheckConstraint(condition=models.Q(('interval__gte', 1)), name='recurrence_rule_interval_positive'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:44
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('maintenance', '0007_recurrence_rules'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='maintenancelog',
+            name='timestamp',
+            field=models.DateTimeField(default=django.utils.timezone.now, editable=False),
+        ),
+    ]
@@ -0,0 +1,51 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:48
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('maintenance', '0008_maintenancelog_timestamp_default'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedMaintenanceLog',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('action', models.CharField(max_length=255)),
+                ('timestamp', models.DateTimeField()),
+            ],
+        ),
+        migrations.AlterField(
+            model_name='maintenancelog',
+            name='maintenance_request',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='logs', to='maintenance.maintenancerequest'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenancelog',
+            index=models.Index(fields=['maintenance_request', 'timestamp'], name='log_request_time_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenancelog',
+            index=models.Index(fields=['timestamp'], name='log_timestamp_idx'),
+        ),
+        migrations.AddField(
+            model_name='archivedmaintenancelog',
+            name='maintenance_request',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='archived_logs', to='maintenance.maintenancerequest'),
+        ),
+        migrations.AddField(
+            model_name='archivedmaintenancelog',
+            name='performed_by',
+            field=models.ForeignKey(null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='archivedmaintenancelog',
+            index=models.Index(fields=['maintenance_request', 'timestamp'], name='archived_log_request_time_idx'),
+        ),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 04:52
+
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0006_equipment_live_warranty_idx'),
+        ('maintenance', '0009_maintenance_log_archive'),
+        ('teams', '0002_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ChangeSequence',
+            fields=[
+                ('name', models.CharField(max_length=50, primary_key=True, serialize=False)),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='MaintenanceRequestTombstone',
+            fields=[
+                ('id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('change_seq', models.BigIntegerField()),
+                ('deleted_at', models.DateTimeField(default=django.utils.timezone.now)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='maintenancerequest',
+            name='change_seq',
+            field=models.BigIntegerField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='maintenancerequest',
+            index=models.Index(fields=['change_seq', 'id'], name='request_change_seq_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='maintenancerequesttombstone',
+            index=models.Index(fields=['change_seq', 'id'], name='tombstone_change_seq_idx'),
+        ),
+    ]
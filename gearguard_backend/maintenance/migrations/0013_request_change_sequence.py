@@ -0,0 +1,30 @@
+from django.db import migrations
+
+
+# ChangeSequence.sequence_name(MaintenanceRequest.CHANGE_FEED)
+SEQUENCE = 'maintenance_request_change_seq'
+
+
+def create_sequence(apps, schema_editor):
+    # Only PostgreSQL feeds are stamped from a database sequence; other
+    # backends keep using the ChangeSequence row.
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(f'CREATE SEQUENCE IF NOT EXISTS {SEQUENCE}')
+
+
+def drop_sequence(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(f'DROP SEQUENCE IF EXISTS {SEQUENCE}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('maintenance', '0012_request_scheduled_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_sequence, drop_sequence),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 06:56
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('equipment', '0008_equipment_sort_indexes'),
+        ('maintenance', '0013_request_change_sequence'),
+        ('teams', '0002_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='maintenancerequest',
+            name='assigned_team',
+            field=models.ForeignKey(db_index=False, null=True, on_delete=django.db.models.deletion.SET_NULL, to='teams.maintenanceteam'),
+        ),
+        migrations.AlterField(
+            model_name='maintenancerequest',
+            name='equipment',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to='equipment.equipment'),
+        ),
+    ]
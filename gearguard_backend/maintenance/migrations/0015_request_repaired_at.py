@@ -0,0 +1,46 @@
+from django.db import migrations, models
+from django.db.models import Exists, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+# Logs written before repaired_at existed lead with the status change
+# ("Status in_progress -> repaired; Unassigned technician").
+REPAIRED_ACTION = r'^Status [a-z_]+ -> repaired(;|$)'
+
+
+def repaired_logs(log_model):
+    return log_model.objects.filter(maintenance_request_id=OuterRef('pk'), action__regex=REPAIRED_ACTION)
+
+
+def first_repaired_log(log_model):
+    return Subquery(repaired_logs(log_model).order_by('timestamp').values('timestamp')[:1])
+
+
+def backfill_repaired_at(apps, schema_editor):
+    # One pass over the logs, hot then archived, for the requests repaired
+    # before the transition started recording the time itself.
+    MaintenanceRequest = apps.get_model('maintenance', 'MaintenanceRequest')
+    MaintenanceLog = apps.get_model('maintenance', 'MaintenanceLog')
+    ArchivedMaintenanceLog = apps.get_model('maintenance', 'ArchivedMaintenanceLog')
+    repaired = MaintenanceRequest.objects.using(schema_editor.connection.alias).filter(
+        Exists(repaired_logs(MaintenanceLog)) | Exists(repaired_logs(ArchivedMaintenanceLog))
+    )
+    repaired.update(
+        repaired_at=Coalesce(first_repaired_log(MaintenanceLog), first_repaired_log(ArchivedMaintenanceLog)),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('maintenance', '0014_request_fk_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='maintenancerequest',
+            name='repaired_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_repaired_at, migrations.RunPython.noop),
+    ]
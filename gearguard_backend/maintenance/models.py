@@ -1,9 +1,26 @@
 from django.conf import settings
-from django.db import models
+from django.db import connections, models, router, transaction
+from django.db.transaction import TransactionManagementError
+from django.db.models import F
+from django.utils import timezone
 
 # Create your models here.
+class VersionConflict(Exception):
+    """
+    The request was written by someone else since it was read. ``current``
+    holds its status and version now, so the caller can re-read and retry.
+    """
+
+    def __init__(self, current):
+        super().__init__('Maintenance request was modified by someone else')
+        self.current = current
+
+
 class MaintenanceRequest(models.Model):
 
+    # ChangeSequence counter behind the request change feed.
+    CHANGE_FEED = 'maintenance_request'
+
     STATUS_CHOICES = [
         ('new', 'New'),
         ('in_progress', 'In Progress'),
@@ -11,6 +28,14 @@ class MaintenanceRequest(models.Model):
         ('scrap', 'Scrap'),
     ]
 
+    # Allowed status changes. in_progress -> in_progress is a reassignment.
+    TRANSITIONS = {
+        'new': {'in_progress', 'scrap'},
+        'in_progress': {'in_progress', 'new', 'repaired', 'scrap'},
+        'repaired': {'in_progress'},
+        'scrap': set(),
+    }
+
     TYPE_CHOICES = [
         ('corrective', 'Corrective'),
         ('preventive', 'Preventive'),
@@ -19,9 +44,12 @@ class MaintenanceRequest(models.Model):
     subject = models.CharField(max_length=255)
     description = models.TextField(blank=True)
 
+    # Both foreign keys lead composite indexes below, which serve their
+    # lookups and cascades, so they get no single-column index of their own.
     equipment = models.ForeignKey(
         'equipment.Equipment',
-        on_delete=models.CASCADE
+        on_delete=models.CASCADE,
+        db_index=False
     )
 
     request_type = models.CharField(max_length=20, choices=TYPE_CHOICES)
@@ -37,11 +65,15 @@ class MaintenanceRequest(models.Model):
     assigned_team = models.ForeignKey(
         'teams.MaintenanceTeam',
         on_delete=models.SET_NULL,
-        null=True
+        null=True,
+        db_index=False
     )
 
     scheduled_date = models.DateField(null=True, blank=True)
     duration_hours = models.FloatField(null=True, blank=True)
+    # When the request first moved to repaired; reliability reads repair
+    # times from it when no duration was recorded.
+    repaired_at = models.DateTimeField(null=True, blank=True, editable=False)
 
     created_by = models.ForeignKey(
         settings.AUTH_USER_MODEL,
@@ -52,15 +84,130 @@ class MaintenanceRequest(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    # Bumped by every write; writers update WHERE version = <read version>.
+    version = models.PositiveIntegerField(default=0)
+
+    # Set on preventive requests materialized from a RecurrenceRule.
+    recurrence_rule = models.ForeignKey(
+        'RecurrenceRule',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='requests'
+    )
+    occurrence_date = models.DateField(null=True, blank=True)
+
+    # Value of the CHANGE_FEED counter at the last write of this row.
+    change_seq = models.BigIntegerField(default=0)
+
+    class Meta:
+        indexes = [
+            # Change feed: rows written after a client's (change_seq, id) cursor.
+            models.Index(fields=['change_seq', 'id'], name='request_change_seq_idx'),
+            # Creation-time windows (analytics rollup rebuilds).
+            models.Index(fields=['created_at'], name='request_created_idx'),
+            # Per-equipment history pages walk (equipment_id, created_at).
+            models.Index(fields=['equipment', 'created_at'], name='request_equipment_created_idx'),
+            # Status board columns: newest cards of one status.
+            models.Index(fields=['status', 'created_at'], name='request_status_created_idx'),
+            # Team calendars: a scheduled_date range within one team.
+            models.Index(fields=['assigned_team', 'scheduled_date'], name='request_team_scheduled_idx'),
+            # Scheduled-date windows across every team (workload heatmap).
+            models.Index(fields=['scheduled_date'], name='request_scheduled_idx'),
+        ]
+        constraints = [
+            # One materialized request per rule, asset and occurrence, so the
+            # generator can be re-run with bulk_create(ignore_conflicts=True).
+            models.UniqueConstraint(
+                fields=['recurrence_rule', 'occurrence_date', 'equipment'],
+                condition=models.Q(recurrence_rule__isnull=False),
+                name='request_rule_occurrence_uniq',
+            ),
+        ]
+
     def __str__(self):
         return f"{self.subject} - {self.get_status_display()}"
 
+    def save(self, *args, **kwargs):
+        """
+        Writes existing rows with UPDATE ... WHERE version = <loaded version>
+        and bumps ``version``, like ``transition()``; a stale instance raises
+        VersionConflict instead of overwriting a newer write. The change
+        sequence is taken in the same transaction as the row write. The
+        first save that moves the request to repaired stamps ``repaired_at``.
+        """
+
+        checked = not self._state.adding and 'version' in self.__dict__
+        loaded_status = (getattr(self, '_loaded_values', None) or {}).get('status')
+        stamp_repair = (
+            self.__dict__.get('status') == 'repaired' and loaded_status != 'repaired'
+            and 'repaired_at' in self.__dict__ and self.repaired_at is None
+        )
+        if stamp_repair:
+            self.repaired_at = timezone.now()
+        if checked:
+            self._expected_version = self.version
+            self.version += 1
+        try:
+            with transaction.atomic():
+                self.change_seq = ChangeSequence.advance(self.CHANGE_FEED)
+                if kwargs.get('update_fields') is not None:
+                    kwargs['update_fields'] = {
+                        *kwargs['update_fields'], 'change_seq',
+                        *(['version'] if checked else []), *(['repaired_at'] if stamp_repair else []),
+                    }
+                super().save(*args, **kwargs)
+        except Exception:
+            if checked:
+                self.version = self._expected_version
+            if stamp_repair:
+                self.repaired_at = None
+            raise
+        finally:
+            self._expected_version = None
+        self._loaded_values = self.snapshot()
+
+    def _do_update(self, base_qs, using, pk_val, values, update_fields, forced_update):
+        expected = getattr(self, '_expected_version', None)
+        if expected is None:
+            return super()._do_update(base_qs, using, pk_val, values, update_fields, forced_update)
+        if super()._do_update(base_qs.filter(version=expected), using, pk_val, values, update_fields, forced_update):
+            return True
+        current = base_qs.filter(pk=pk_val).values('status', 'version').first()
+        if current is None:
+            # Deleted meanwhile: fall back to Django's usual insert.
+            return False
+        raise VersionConflict(current)
+
+    # Columns whose changes are written to MaintenanceLog on save.
+    LOGGED_FIELDS = ('status', 'assigned_team_id', 'assigned_to_id')
+
+    def snapshot(self):
+        """
+        The loaded column values keyed by attname, without fetching
+        deferred ones.
+        """
+
+        return {
+            field.attname: self.__dict__[field.attname]
+            for field in self._meta.concrete_fields if field.attname in self.__dict__
+        }
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        # Remember the row as loaded so post_save receivers can see what
+        # changed without re-reading it.
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = instance.snapshot()
+        return instance
+
 
 class MaintenanceLog(models.Model):
     maintenance_request = models.ForeignKey(
         MaintenanceRequest,
         on_delete=models.CASCADE,
-        related_name='logs'
+        related_name='logs',
+        db_index=False
     )
     action = models.CharField(max_length=255)
     performed_by = models.ForeignKey(
@@ -68,7 +215,198 @@ class MaintenanceLog(models.Model):
         on_delete=models.SET_NULL,
         null=True
     )
-    timestamp = models.DateTimeField(auto_now_add=True)
+    # Set when the change happens, not when a buffered row is flushed.
+    timestamp = models.DateTimeField(default=timezone.now, editable=False)
+
+    class Meta:
+        indexes = [
+            # A request's recent activity, newest first; replaces the plain FK index.
+            models.Index(fields=['maintenance_request', 'timestamp'], name='log_request_time_idx'),
+            # Archival scans for rows older than the retention window.
+            models.Index(fields=['timestamp'], name='log_timestamp_idx'),
+        ]
 
     def __str__(self):
         return f"Log for {self.maintenance_request.subject} at {self.timestamp}"
+
+
+class MaintenanceRequestTombstone(models.Model):
+    """
+    Marks a deleted MaintenanceRequest in the change feed. ``id`` is the
+    deleted request's id.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    change_seq = models.BigIntegerField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['change_seq', 'id'], name='tombstone_change_seq_idx'),
+        ]
+
+    def __str__(self):
+        return f"Deleted request {self.id}"
+
+
+class ArchivedMaintenanceLog(models.Model):
+    """
+    MaintenanceLog rows older than the retention window, moved here by
+    archive_maintenance_logs. A log keeps its id when it is archived.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    maintenance_request = models.ForeignKey(
+        MaintenanceRequest,
+        on_delete=models.CASCADE,
+        related_name='archived_logs',
+        db_index=False
+    )
+    action = models.CharField(max_length=255)
+    performed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='+'
+    )
+    timestamp = models.DateTimeField()
+
+    class Meta:
+        # Only read for full-history requests, so one index is enough.
+        indexes = [
+            models.Index(fields=['maintenance_request', 'timestamp'], name='archived_log_request_time_idx'),
+        ]
+
+    def __str__(self):
+        return f"Archived log {self.id} at {self.timestamp}"
+
+
+class RecurrenceRule(models.Model):
+    """
+    A preventive maintenance schedule for one piece of equipment, or for every
+    live piece of equipment maintained by a team.
+    """
+
+    FREQUENCY_CHOICES = [
+        ('days', 'Every N days'),
+        ('months', 'Every N months'),
+    ]
+
+    subject = models.CharField(max_length=255)
+    description = models.TextField(blank=True)
+
+    equipment = models.ForeignKey(
+        'equipment.Equipment',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='recurrence_rules'
+    )
+    team = models.ForeignKey(
+        'teams.MaintenanceTeam',
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='recurrence_rules'
+    )
+
+    frequency = models.CharField(max_length=10, choices=FREQUENCY_CHOICES, default='days')
+    interval = models.PositiveIntegerField(default=30)
+    start_date = models.DateField()
+    end_date = models.DateField(null=True, blank=True)
+    duration_hours = models.FloatField(null=True, blank=True)
+    is_active = models.BooleanField(default=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(equipment__isnull=False) | models.Q(team__isnull=False),
+                name='recurrence_rule_has_target',
+            ),
+            models.CheckConstraint(condition=models.Q(interval__gte=1), name='recurrence_rule_interval_positive'),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} every {self.interval} {self.frequency}"
+
+
+class ChangeSequence(models.Model):
+    """
+    Named counters for change feeds.
+
+    On PostgreSQL a value is the writing transaction's id in the high bits
+    and the feed's database sequence in the low ones, so writers take no
+    lock to get one, and readers bound the feed by the snapshot xmin: no
+    transaction still running can commit a value below it. Elsewhere (a
+    single writer at a time) the value comes from this table's row for
+    the feed, bumped by every write.
+    """
+
+    name = models.CharField(max_length=50, primary_key=True)
+    value = models.BigIntegerField(default=0)
+
+    # Low bits of a PostgreSQL value, taken from the feed's sequence.
+    SEQUENCE_BITS = 20
+
+    @staticmethod
+    def sequence_name(name):
+        return f'{name}_change_seq'
+
+    @classmethod
+    def advance(cls, name):
+        """
+        Returns the next value of counter ``name``. Call it inside the
+        writer's transaction: values increase in commit order, as seen by
+        ``current``, only for the transaction that takes them.
+        """
+
+        connection = connections[router.db_for_write(cls)]
+        if not connection.in_atomic_block:
+            raise TransactionManagementError('A change sequence value must be taken inside the writing transaction.')
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'SELECT (pg_current_xact_id()::text::bigint << %s) | (nextval(%s) & %s)',
+                    [cls.SEQUENCE_BITS, cls.sequence_name(name), (1 << cls.SEQUENCE_BITS) - 1],
+                )
+                return cursor.fetchone()[0]
+
+        if not cls.objects.filter(name=name).update(value=F('value') + 1):
+            cls.objects.get_or_create(name=name)
+            cls.objects.filter(name=name).update(value=F('value') + 1)
+        return cls.objects.filter(name=name).values_list('value', flat=True).get()
+
+    @classmethod
+    def current(cls, name):
+        """
+        Returns a value of counter ``name`` such that every change stamped
+        with a value up to it is already visible and no later commit can
+        take one below it (0 before the first write).
+
+        On PostgreSQL that is just below the oldest running transaction's
+        range, plus this transaction's own values so far when it is that
+        oldest one. Elsewhere, the counter row's committed value: writers
+        there advance it under a row lock held until they commit.
+        """
+
+        connection = connections[router.db_for_read(cls)]
+        if connection.vendor == 'postgresql':
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    """
+                    SELECT CASE WHEN pg_current_xact_id_if_assigned() = snapshot.xmin
+                        THEN (snapshot.xmin::text::bigint << %s) | COALESCE(pg_sequence_last_value(%s) & %s, 0)
+                        ELSE (snapshot.xmin::text::bigint << %s) - 1
+                    END
+                    FROM (SELECT pg_snapshot_xmin(pg_current_snapshot()) AS xmin) snapshot
+                    """,
+                    [
+                        cls.SEQUENCE_BITS, cls.sequence_name(name), (1 << cls.SEQUENCE_BITS) - 1,
+                        cls.SEQUENCE_BITS,
+                    ],
+                )
+                return cursor.fetchone()[0]
+
+        return cls.objects.filter(name=name).values_list('value', flat=True).first() or 0
@@ -0,0 +1,273 @@
+import calendar
+from datetime import date, timedelta
+from itertools import groupby, islice
+
+from django.db import connection, transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from equipment.models import Equipment
+from .events import requests_changed
+from .models import ChangeSequence, MaintenanceRequest, RecurrenceRule
+
+
+DEFAULT_HORIZON_DAYS = 365
+MAX_HORIZON_DAYS = 3 * 365
+GENERATION_CHUNK_SIZE = 5000
+
+
+def add_months(day, months):
+    """
+    Moves ``day`` forward by ``months``, clamping to the end of shorter months
+    (Jan 31 + 1 month is Feb 28/29).
+    """
+
+    month_index = day.month - 1 + months
+    year, month = day.year + month_index // 12, month_index % 12 + 1
+    return date(year, month, min(day.day, calendar.monthrange(year, month)[1]))
+
+
+def occurrences(rule, window_start, window_end):
+    """
+    Yields the rule's occurrence dates that fall inside
+    ``[window_start, window_end]`` and before its end_date, without walking
+    the occurrences that precede the window.
+    """
+
+    if rule.end_date is not None:
+        window_end = min(window_end, rule.end_date)
+    first = max(window_start, rule.start_date)
+    if first > window_end:
+        return
+
+    if rule.frequency == 'days':
+        step = -(-(first - rule.start_date).days // rule.interval)
+        day = rule.start_date + timedelta(days=step * rule.interval)
+        while day <= window_end:
+            yield day
+            day += timedelta(days=rule.interval)
+        return
+
+    elapsed = (first.year - rule.start_date.year) * 12 + first.month - rule.start_date.month
+    step = max(elapsed // rule.interval, 0)
+    while True:
+        day = add_months(rule.start_date, step * rule.interval)
+        if day > window_end:
+            return
+        if day >= first:
+            yield day
+        step += 1
+
+
+def rule_targets(rules):
+    """
+    Returns {rule id: [(equipment id, team id), ...]} for every rule, from two
+    queries: one for equipment-level rules and one for team-level rules.
+    Scrapped equipment is skipped. Requests go to the rule's team, falling
+    back to the equipment's maintenance team.
+    """
+
+    equipment_ids = {rule.equipment_id for rule in rules if rule.equipment_id is not None}
+    team_ids = {rule.team_id for rule in rules if rule.equipment_id is None}
+    live = Equipment.objects.filter(is_scrapped=False)
+
+    by_equipment = dict(live.filter(id__in=equipment_ids).values_list('id', 'maintenance_team_id')) if equipment_ids else {}
+    by_team = {}
+    if team_ids:
+        rows = live.filter(maintenance_team_id__in=team_ids).order_by('id').values_list('id', 'maintenance_team_id')
+        for equipment_id, team_id in rows.iterator(chunk_size=GENERATION_CHUNK_SIZE):
+            by_team.setdefault(team_id, []).append(equipment_id)
+
+    targets = {}
+    for rule in rules:
+        if rule.equipment_id is not None:
+            if rule.equipment_id in by_equipment:
+                targets[rule.id] = [(rule.equipment_id, rule.team_id or by_equipment[rule.equipment_id])]
+            else:
+                targets[rule.id] = []
+        else:
+            targets[rule.id] = [(equipment_id, rule.team_id) for equipment_id in by_team.get(rule.team_id, [])]
+    return targets
+
+
+def existing_occurrences(rule, window_start, window_end):
+    return set(
+        MaintenanceRequest.objects
+        .filter(recurrence_rule_id=rule.id, occurrence_date__range=(window_start, window_end))
+        .values_list('occurrence_date', 'equipment_id')
+        .iterator(chunk_size=GENERATION_CHUNK_SIZE)
+    )
+
+
+def planned_occurrences(rules, targets, window_start, window_end):
+    """
+    Yields (rule, equipment id, team id, day) for the occurrences not
+    generated yet. One query per rule reads what is already there, so a
+    daily re-run over a rolling horizon only yields the newly uncovered day
+    (and any assets that joined the team since the last run).
+
+    Occurrences come asset by asset, every date of one asset before the
+    next, so an insert chunk covers few assets and the rollup rows it
+    touches (keyed by asset) are new instead of being updated chunk after
+    chunk.
+    """
+
+    for rule in rules:
+        dates = list(occurrences(rule, window_start, window_end))
+        if not dates or not targets[rule.id]:
+            continue
+        existing = existing_occurrences(rule, window_start, window_end)
+        for equipment_id, team_id in targets[rule.id]:
+            for day in dates:
+                if (day, equipment_id) not in existing:
+                    yield rule, equipment_id, team_id, day
+
+
+# The columns of the inserted rows that requests_changed receivers read
+# (the analytics rollups), reported once per group of equal rows.
+INSERTED_COLUMNS = ('created_at', 'assigned_team_id', 'equipment_id', 'status', 'request_type', 'duration_hours')
+
+
+def insert_counted(rule, chunk, change_seq, created_at):
+    """
+    PostgreSQL: inserts one rule's occurrences from ``chunk`` with a single
+    INSERT ... SELECT over unnest()ed id and date arrays, three parameters
+    however many rows, and returns the inserted rows counted per
+    (equipment, team) as ``(row, count)`` pairs. ON CONFLICT DO NOTHING
+    skips occurrences a concurrent run inserted first, and RETURNING only
+    reports the rows this statement created.
+    """
+
+    meta = MaintenanceRequest._meta
+    quote = connection.ops.quote_name
+    constants = {
+        'subject': rule.subject,
+        'description': rule.description,
+        'request_type': 'preventive',
+        'status': 'new',
+        'duration_hours': rule.duration_hours,
+        'created_at': created_at,
+        'version': 0,
+        'recurrence_rule_id': rule.id,
+        'change_seq': change_seq,
+    }
+    columns = [meta.get_field(name).column for name in constants] + [
+        meta.get_field(name).column for name in ('equipment_id', 'assigned_team_id', 'scheduled_date', 'occurrence_date')
+    ]
+    equipment_column = quote(meta.get_field('equipment_id').column)
+    team_column = quote(meta.get_field('assigned_team_id').column)
+    sql = (
+        f'WITH inserted AS ('
+        f'INSERT INTO {quote(meta.db_table)} ({", ".join(quote(column) for column in columns)}) '
+        f'SELECT {", ".join(["%s"] * len(constants))}, t.equipment_id, t.team_id, t.day, t.day '
+        f'FROM unnest(%s::bigint[], %s::bigint[], %s::date[]) AS t(equipment_id, team_id, day) '
+        f'ON CONFLICT DO NOTHING '
+        f'RETURNING {equipment_column}, {team_column}'
+        f') SELECT {equipment_column}, {team_column}, COUNT(*) FROM inserted GROUP BY 1, 2'
+    )
+    equipment_ids, team_ids, days = zip(*((equipment_id, team_id, day) for _, equipment_id, team_id, day in chunk))
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [*constants.values(), list(equipment_ids), list(team_ids), list(days)])
+        groups = cursor.fetchall()
+    return [
+        (
+            {
+                'created_at': created_at,
+                'assigned_team_id': team_id,
+                'equipment_id': equipment_id,
+                'status': 'new',
+                'request_type': 'preventive',
+                'duration_hours': rule.duration_hours,
+            },
+            count,
+        )
+        for equipment_id, team_id, count in groups
+    ]
+
+
+def insert_chunk(chunk, change_seq):
+    """
+    Inserts a chunk of planned occurrences and returns the rows it actually
+    created as ``(row, count)`` pairs, ``count`` rows sharing the
+    INSERTED_COLUMNS of ``row``: one INSERT ... SELECT per rule on
+    PostgreSQL, bulk_create plus a grouped read back by change_seq
+    elsewhere.
+    """
+
+    if connection.vendor == 'postgresql':
+        created_at = timezone.now()
+        groups = []
+        for rule, group in groupby(chunk, key=lambda occurrence: occurrence[0]):
+            groups.extend(insert_counted(rule, list(group), change_seq, created_at))
+        return groups
+
+    requests = [
+        MaintenanceRequest(
+            subject=rule.subject,
+            description=rule.description,
+            equipment_id=equipment_id,
+            request_type='preventive',
+            assigned_team_id=team_id,
+            scheduled_date=day,
+            duration_hours=rule.duration_hours,
+            recurrence_rule_id=rule.id,
+            occurrence_date=day,
+            change_seq=change_seq,
+        )
+        for rule, equipment_id, team_id, day in chunk
+    ]
+    MaintenanceRequest.objects.bulk_create(requests, ignore_conflicts=True)
+    # ignore_conflicts reports neither ids nor which rows a concurrent run
+    # had already inserted. This chunk's change_seq is unique to it, so
+    # reading it back returns exactly the rows created here.
+    groups = (
+        MaintenanceRequest.objects.filter(change_seq=change_seq)
+        .values(*INSERTED_COLUMNS).annotate(rows=Count('id')).order_by()
+    )
+    return [({column: group[column] for column in INSERTED_COLUMNS}, group['rows']) for group in groups]
+
+
+def generate_preventive_requests(horizon_days=DEFAULT_HORIZON_DAYS, today=None, rules=None, chunk_size=GENERATION_CHUNK_SIZE):
+    """
+    Materializes the occurrences of every active rule (or of ``rules``) from
+    ``today`` to ``today + horizon_days`` as preventive MaintenanceRequest rows.
+
+    Occurrences are planned lazily as plain tuples and inserted ``chunk_size``
+    at a time, each chunk in its own short transaction: set-based with
+    INSERT ... SELECT on PostgreSQL, bulk_create elsewhere. Occurrences
+    already in the table are skipped up front, and the (rule, occurrence
+    date, equipment) unique constraint plus ON CONFLICT DO NOTHING covers
+    concurrent runs, so re-running over an overlapping horizon only adds
+    the new ones.
+    """
+
+    today = today or timezone.localdate()
+    window_end = today + timedelta(days=horizon_days)
+    if rules is None:
+        rules = RecurrenceRule.objects.filter(is_active=True).filter(Q(end_date__isnull=True) | Q(end_date__gte=today))
+    rules = list(rules)
+    rule_ids = [rule.id for rule in rules]
+
+    generated = MaintenanceRequest.objects.filter(
+        recurrence_rule_id__in=rule_ids, occurrence_date__range=(today, window_end)
+    )
+    before = generated.count()
+
+    pending = planned_occurrences(rules, rule_targets(rules), today, window_end)
+    while True:
+        chunk = list(islice(pending, chunk_size))
+        if not chunk:
+            break
+        with transaction.atomic():
+            change_seq = ChangeSequence.advance(MaintenanceRequest.CHANGE_FEED)
+            inserted = insert_chunk(chunk, change_seq)
+            if inserted:
+                requests_changed.send(sender=MaintenanceRequest, changes=[], inserted=inserted)
+
+    return {
+        'rules': len(rules),
+        'from': today.isoformat(),
+        'until': window_end.isoformat(),
+        'created': generated.count() - before,
+        'existing': before,
+    }
@@ -6,3 +6,4 @@ class MaintenanceRequestSerializer(serializers.ModelSerializer):
     class Meta:
         model = MaintenanceRequest
         fields = "__all__"
+        read_only_fields = ["version"]
@@ -0,0 +1,39 @@
+from django.db.models.signals import post_save, pre_delete
+from django.dispatch import receiver
+
+from teams.models import MaintenanceTeam
+from users.models import GearguardUser
+from .dispatch import release_references
+from .logcapture import record_change
+from .models import ChangeSequence, MaintenanceRequest, MaintenanceRequestTombstone
+
+
+@receiver(post_save, sender=MaintenanceRequest)
+def log_request_change(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    after = {field: getattr(instance, field) for field in MaintenanceRequest.LOGGED_FIELDS}
+    before = {} if created else getattr(instance, '_loaded_values', None)
+    # Instances built by hand and saved over an existing row have no loaded
+    # state to compare against; those saves are not logged.
+    if before is not None:
+        record_change(instance.pk, before, after)
+
+
+@receiver(pre_delete, sender=MaintenanceRequest)
+def record_tombstone(sender, instance, **kwargs):
+    # pre_delete runs inside the delete's transaction, so the tombstone
+    # takes that transaction's change sequence value.
+    MaintenanceRequestTombstone.objects.update_or_create(
+        id=instance.pk, defaults={'change_seq': ChangeSequence.advance(MaintenanceRequest.CHANGE_FEED)},
+    )
+
+
+@receiver(pre_delete, sender=MaintenanceTeam)
+def release_team(sender, instance, **kwargs):
+    release_references(['assigned_team'], instance.pk)
+
+
+@receiver(pre_delete, sender=GearguardUser)
+def release_user(sender, instance, **kwargs):
+    release_references(['assigned_to', 'created_by'], instance.pk)
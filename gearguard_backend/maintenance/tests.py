@@ -1,3 +1,791 @@
-from django.test import TestCase
+import threading
+from datetime import date, timedelta
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.core.cache import cache
+from django.db import OperationalError, connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.utils import timezone
+
+from departements.models import Department
+from equipment.models import Equipment
+from gearguard_backend.pagination import keyset_paginate
+from teams.models import MaintenanceTeam
+from users.models import GearguardUser
+from .archive import archive_logs, retention_cutoff
+from .autoassign import DEFAULT_DURATION_HOURS, plan_assignments, technician_loads
+from .dispatch import bulk_assign
+from .events import requests_changed
+from .logcapture import LogBuffer, log_buffer
+from .models import (
+    ArchivedMaintenanceLog, MaintenanceLog, MaintenanceRequest, MaintenanceRequestTombstone, RecurrenceRule,
+    VersionConflict,
+)
+from .recurrence import add_months, generate_preventive_requests, occurrences
+from .transitions import TransitionConflict, transition
+
+
+# Taking a change sequence value: one SELECT on PostgreSQL, a counter
+# bump and read elsewhere.
+ADVANCE_QUERIES = 1 if connection.vendor == 'postgresql' else 2
+
+
+class MaintenanceFixtureMixin:
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.department = Department.objects.create(name='Production')
+        cls.team = MaintenanceTeam.objects.create(name='Mechanics')
+        cls.technician = GearguardUser.objects.create_user(username='tech', password='pw', role='technician')
+        cls.equipment = [
+            Equipment.objects.create(
+                name=f'Machine {i}', serial_number=f'SN-{i}', department=cls.department,
+                location='Plant A', purchase_date=date(2024, 1, 1), warranty_expiry=date(2027, 1, 1),
+            )
+            for i in range(3)
+        ]
+        cls.requests = [
+            MaintenanceRequest.objects.create(
+                subject=f'Request {i}', equipment=cls.equipment[i % 3], request_type='corrective',
+                assigned_to=cls.technician, assigned_team=cls.team, created_by=cls.technician,
+            )
+            for i in range(6)
+        ]
+
+
+class MaintenanceListTests(MaintenanceFixtureMixin, TestCase):
+
+    def test_list_runs_one_query(self):
+        with self.assertNumQueries(1):
+            rows = self.client.get('/maintenance/list/').json()
+        self.assertEqual(len(rows), 6)
+        by_id = {row['id']: row for row in rows}
+        request = self.requests[4]
+        self.assertEqual(by_id[request.id]['equipment_name'], request.equipment.name)
+        self.assertEqual(by_id[request.id]['assigned_team_id'], self.team.id)
+
+    def test_detail_runs_one_query(self):
+        with self.assertNumQueries(1):
+            row = self.client.get(f'/maintenance/{self.requests[1].id}/').json()
+        self.assertEqual(row['equipment_name'], 'Machine 1')
+
+    def test_detail_not_found(self):
+        self.assertEqual(self.client.get('/maintenance/0/').status_code, 404)
+
+
+class BoardTests(MaintenanceFixtureMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.admin = GearguardUser.objects.create_user(username='admin', password='pw', role='admin')
+        cls.other_technician = GearguardUser.objects.create_user(username='other', password='pw', role='technician')
+        for i, status in enumerate(['in_progress', 'in_progress', 'repaired']):
+            MaintenanceRequest.objects.create(
+                subject=f'Moved {i}', equipment=cls.equipment[0], request_type='preventive',
+                status=status, assigned_to=cls.other_technician,
+            )
+
+    def test_admin_board_counts_and_first_pages(self):
+        self.client.force_login(self.admin)
+        # Session + user, one aggregate, one page per non-empty column.
+        with self.assertNumQueries(2 + 1 + 3):
+            columns = self.client.get('/maintenance/requests/board/', {'limit': 4}).json()['columns']
+        self.assertEqual({status: column['count'] for status, column in columns.items()},
+                         {'new': 6, 'in_progress': 2, 'repaired': 1, 'scrap': 0})
+        self.assertEqual([card['subject'] for card in columns['new']['cards']],
+                         ['Request 5', 'Request 4', 'Request 3', 'Request 2'])
+
+        page = self.client.get(
+            '/maintenance/requests/board/', {'column': 'new', 'limit': 4, 'cursor': columns['new']['next_cursor']}
+        ).json()
+        self.assertEqual([card['subject'] for card in page['cards']], ['Request 1', 'Request 0'])
+        self.assertIsNone(page['next_cursor'])
+
+    def test_technician_board_is_scoped(self):
+        self.client.force_login(self.other_technician)
+        columns = self.client.get('/maintenance/requests/board/').json()['columns']
+        self.assertEqual({status: column['count'] for status, column in columns.items()},
+                         {'new': 0, 'in_progress': 2, 'repaired': 1, 'scrap': 0})
+
+    def test_unknown_column(self):
+        self.client.force_login(self.admin)
+        self.assertEqual(self.client.get('/maintenance/requests/board/', {'column': 'done'}).status_code, 400)
+
+
+class CalendarTests(MaintenanceFixtureMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.admin = GearguardUser.objects.create_user(username='admin', password='pw', role='admin')
+        cls.other_team = MaintenanceTeam.objects.create(name='Electricians')
+        schedule = [
+            (date(2026, 3, 2), cls.team, 'preventive', 2.0),
+            (date(2026, 3, 2), cls.team, 'corrective', 1.5),
+            (date(2026, 3, 9), cls.team, 'preventive', None),
+            (date(2026, 3, 9), cls.other_team, 'preventive', 4.0),
+            (date(2026, 4, 1), cls.team, 'preventive', 3.0),
+        ]
+        for scheduled_date, team, request_type, hours in schedule:
+            MaintenanceRequest.objects.create(
+                subject='Planned', equipment=cls.equipment[0], request_type=request_type,
+                assigned_team=team, scheduled_date=scheduled_date, duration_hours=hours,
+            )
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_month_buckets_for_team(self):
+        body = self.client.get('/maintenance/requests/calendar/', {
+            'start': '2026-03-01', 'end': '2026-03-31', 'team': self.team.id,
+        }).json()
+        self.assertEqual(body['days'], [
+            {'date': '2026-03-02', 'count': 2, 'preventive': 1, 'duration_hours': 3.5},
+            {'date': '2026-03-09', 'count': 1, 'preventive': 1, 'duration_hours': 0},
+        ])
+
+    def test_window_is_validated(self):
+        url = '/maintenance/requests/calendar/'
+        self.assertEqual(self.client.get(url, {'start': '2026-03-01'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'start': '2026-03-31', 'end': '2026-03-01'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'start': '2026-01-01', 'end': '2026-12-31'}).status_code, 400)
+
+
+class ManagerScopeTests(MaintenanceFixtureMixin, TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.manager = GearguardUser.objects.create_user(username='manager', password='pw', role='manager')
+        self.other_team = MaintenanceTeam.objects.create(name='Electricians')
+        self.team.members.add(self.manager)
+        self.other_team.members.add(self.manager)
+        MaintenanceRequest.objects.create(
+            subject='Unassigned', equipment=self.equipment[0], request_type='corrective',
+        )
+        self.client.force_login(self.manager)
+
+    def test_multi_team_manager_sees_each_request_once(self):
+        rows = self.client.get('/maintenance/requests/').json()
+        self.assertEqual(sorted(row['id'] for row in rows), [request.id for request in self.requests])
+        columns = self.client.get('/maintenance/requests/board/').json()['columns']
+        self.assertEqual(columns['new']['count'], 6)
+
+
+class AssignTransitionTests(MaintenanceFixtureMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.admin = GearguardUser.objects.create_user(username='admin', password='pw', role='admin')
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def assign(self, request, **data):
+        return self.client.post(f'/maintenance/requests/{request.id}/assign/', data, content_type='application/json')
+
+    def test_assign_bumps_version_and_writes_changed_columns(self):
+        request = self.requests[0]
+        response = self.assign(request, technician_id=self.admin.id, version=0)
+        self.assertEqual(response.json()['version'], 1)
+        request.refresh_from_db()
+        self.assertEqual((request.status, request.assigned_to_id, request.version), ('in_progress', self.admin.id, 1))
+
+    def test_stale_version_conflicts(self):
+        request = self.requests[0]
+        self.assertEqual(self.assign(request, team_id=self.team.id, version=0).status_code, 200)
+        response = self.assign(request, technician_id=self.admin.id, version=0)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['current'], {'status': 'in_progress', 'version': 1})
+
+    def test_invalid_transition_conflicts(self):
+        request = self.requests[0]
+        MaintenanceRequest.objects.filter(pk=request.pk).update(status='scrap')
+        self.assertEqual(self.assign(request, team_id=self.team.id).status_code, 409)
+        self.assertEqual(self.client.post('/maintenance/requests/0/assign/', {}).status_code, 404)
+
+    def test_assign_rejects_malformed_ids(self):
+        self.assertEqual(self.client.post('/maintenance/requests/abc/assign/', {}).status_code, 404)
+        request = self.requests[0]
+        self.assertEqual(self.assign(request, team_id='abc').status_code, 400)
+        self.assertEqual(self.assign(request, team_id=10 ** 6).status_code, 400)
+        self.assertEqual(self.assign(request, technician_id=10 ** 6).status_code, 400)
+        request.refresh_from_db()
+        self.assertEqual((request.status, request.version), ('new', 0))
+
+    def patch(self, request, **data):
+        return self.client.patch(f'/maintenance/requests/{request.id}/', data, content_type='application/json')
+
+    def test_patch_status_goes_through_transition(self):
+        request = self.requests[0]
+        response = self.patch(request, status='in_progress', assigned_to=self.admin.id)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['version'], 1)
+        request.refresh_from_db()
+        self.assertEqual((request.status, request.assigned_to_id, request.version), ('in_progress', self.admin.id, 1))
+
+    def test_manager_can_patch_a_request_out_of_their_scope(self):
+        manager = GearguardUser.objects.create_user(username='manager', password='pw', role='manager')
+        self.team.members.add(manager)
+        other_team = MaintenanceTeam.objects.create(name='Electricians')
+        self.client.force_login(manager)
+        request = self.requests[0]
+        response = self.patch(request, status='in_progress', assigned_team=other_team.id)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.json()['status'], response.json()['assigned_team']), ('in_progress', other_team.id))
+        request.refresh_from_db()
+        self.assertEqual((request.status, request.assigned_team_id), ('in_progress', other_team.id))
+
+    def test_patch_cannot_revive_scrapped_request(self):
+        request = self.requests[0]
+        MaintenanceRequest.objects.filter(pk=request.pk).update(status='scrap')
+        self.assertEqual(self.patch(request, status='new').status_code, 409)
+        request.refresh_from_db()
+        self.assertEqual(request.status, 'scrap')
+
+    def test_patch_with_stale_version_conflicts(self):
+        request = self.requests[0]
+        self.assertEqual(self.patch(request, subject='Renamed', version=0).status_code, 200)
+        response = self.patch(request, subject='Lost update', version=0)
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()['current'], {'status': 'new', 'version': 1})
+        response = self.patch(request, status='in_progress', version=0)
+        self.assertEqual(response.status_code, 409)
+        request.refresh_from_db()
+        self.assertEqual((request.subject, request.status), ('Renamed', 'new'))
+
+    def test_stale_save_is_rejected(self):
+        stale = MaintenanceRequest.objects.get(pk=self.requests[0].pk)
+        transition(MaintenanceRequest.objects.all(), stale.pk, 'scrap')
+        stale.description = 'Edited from an old copy'
+        with self.assertRaises(VersionConflict) as caught:
+            stale.save()
+        self.assertEqual(caught.exception.current, {'status': 'scrap', 'version': 1})
+        self.assertEqual(stale.version, 0)
+        request = MaintenanceRequest.objects.get(pk=stale.pk)
+        self.assertEqual((request.status, request.description, request.version), ('scrap', '', 1))
+
+    def test_save_bumps_version(self):
+        request = MaintenanceRequest.objects.get(pk=self.requests[0].pk)
+        request.description = 'First'
+        request.save()
+        request.description = 'Second'
+        request.save(update_fields=['description'])
+        self.assertEqual(MaintenanceRequest.objects.get(pk=request.pk).version, 2)
+
+
+@override_settings(MAINTENANCE_LOG_CAPTURE=False)
+class AssignStressTests(TransactionTestCase):
+    """
+    Concurrent dispatchers retrying on conflict: every successful transition
+    must be reflected in the version, i.e. no update is silently lost.
+    """
+
+    THREADS = 8
+    ASSIGNMENTS = 15
+
+    def test_no_lost_updates(self):
+        department = Department.objects.create(name='Production')
+        equipment = Equipment.objects.create(
+            name='Press', serial_number='SN-STRESS', department=department,
+            location='Plant A', purchase_date=date(2024, 1, 1), warranty_expiry=date(2027, 1, 1),
+        )
+        request = MaintenanceRequest.objects.create(subject='Hot', equipment=equipment, request_type='corrective')
+        technicians = [
+            GearguardUser.objects.create_user(username=f'tech{i}', password='pw', role='technician')
+            for i in range(self.THREADS)
+        ]
+        successes = []
+        errors = []
+
+        def dispatcher(technician):
+            try:
+                done = 0
+                while done < self.ASSIGNMENTS:
+                    try:
+                        transition(MaintenanceRequest.objects.all(), request.pk, 'in_progress', assigned_to_id=technician.id)
+                    except (TransitionConflict, OperationalError):
+                        continue
+                    done += 1
+                successes.append(done)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=dispatcher, args=(technician,)) for technician in technicians]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        request.refresh_from_db()
+        self.assertEqual(request.version, sum(successes))
+        self.assertEqual(request.version, self.THREADS * self.ASSIGNMENTS)
+
+
+class BulkAssignTests(MaintenanceFixtureMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.admin = GearguardUser.objects.create_user(username='admin', password='pw', role='admin')
+        cls.other_team = MaintenanceTeam.objects.create(name='Electricians')
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_grouped_updates_and_logs(self):
+        MaintenanceRequest.objects.filter(pk=self.requests[5].pk).update(status='scrap')
+        assignments = [
+            {'id': self.requests[0].id, 'team_id': self.team.id, 'technician_id': self.technician.id},
+            {'id': self.requests[1].id, 'team_id': self.team.id, 'technician_id': self.technician.id},
+            {'id': self.requests[2].id, 'team_id': self.other_team.id},
+            {'id': self.requests[3].id, 'team_id': 999},
+            {'id': self.requests[5].id, 'team_id': self.team.id},
+            {'id': 0, 'team_id': self.team.id},
+        ]
+        # Session + user, team and technician checks, savepoint, change
+        # sequence value, locking read, one UPDATE per pair, log insert,
+        # analytics rollups (department lookup, savepoint, locking read, bulk
+        # update, bulk insert in a savepoint, release), release.
+        with self.assertNumQueries(2 + 2 + 1 + 1 + ADVANCE_QUERIES + 2 + 1 + 8 + 1):
+            body = self.client.post(
+                '/maintenance/requests/bulk-assign/', {'assignments': assignments}, content_type='application/json'
+            ).json()
+        self.assertEqual(body['assigned'], 3)
+        self.assertEqual([row['id'] for row in body['rejected']], [0, self.requests[3].id, self.requests[5].id])
+
+        request = MaintenanceRequest.objects.get(pk=self.requests[2].pk)
+        self.assertEqual((request.status, request.assigned_team_id, request.version), ('in_progress', self.other_team.id, 1))
+        self.assertEqual(MaintenanceLog.objects.count(), 3)
+        self.assertEqual(
+            MaintenanceLog.objects.get(maintenance_request=self.requests[0]).action,
+            f'Assigned to team {self.team.id} and technician {self.technician.id}',
+        )
+
+    def test_technicians_cannot_dispatch(self):
+        self.client.force_login(self.technician)
+        response = self.client.post(
+            '/maintenance/requests/bulk-assign/', {'assignments': [{'id': self.requests[0].id}]},
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 403)
+
+
+class AutoAssignTests(MaintenanceFixtureMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.admin = GearguardUser.objects.create_user(username='admin', password='pw', role='admin')
+        cls.busy = cls.technician
+        cls.idle = GearguardUser.objects.create_user(username='idle', password='pw', role='technician')
+        cls.team.members.add(cls.busy, cls.idle, cls.admin)
+        MaintenanceRequest.objects.filter(assigned_to=cls.busy).update(duration_hours=1.0)
+        cls.pending = [
+            MaintenanceRequest.objects.create(
+                subject=f'Pending {i}', equipment=cls.equipment[0], request_type='corrective',
+                assigned_team=cls.team, duration_hours=2.0,
+            )
+            for i in range(5)
+        ]
+
+    def test_plan_balances_load(self):
+        self.assertEqual(plan_assignments([(1, 2.0), (2, 2.0), (3, 1.0)], {10: (3.0, 1), 20: (0.0, 0)}),
+                         {1: 20, 2: 20, 3: 10})
+
+    def test_loads_count_missing_durations_like_the_plan(self):
+        MaintenanceRequest.objects.filter(assigned_to=self.busy).update(duration_hours=None)
+        open_count = MaintenanceRequest.objects.filter(assigned_to=self.busy, status__in=('new', 'in_progress')).count()
+        self.assertEqual(technician_loads([self.busy.id])[self.busy.id], (open_count * DEFAULT_DURATION_HOURS, open_count))
+        self.assertEqual(plan_assignments([(1, None)], {10: (0.0, 0)}), {1: 10})
+
+    def test_unassigned_requests_go_to_least_loaded(self):
+        self.client.force_login(self.admin)
+        body = self.client.post(
+            '/maintenance/requests/auto-assign/', {'team_id': self.team.id}, content_type='application/json'
+        ).json()
+        self.assertEqual(body, {'assigned': 5, 'rejected': []})
+        # busy starts at 6h over six requests. idle takes three 2h requests
+        # to reach 6h, wins the tie on open count, and only at 8h does busy
+        # get the last one.
+        counts = {
+            technician.id: MaintenanceRequest.objects.filter(id__in=[p.id for p in self.pending], assigned_to=technician).count()
+            for technician in (self.busy, self.idle)
+        }
+        self.assertEqual(counts, {self.busy.id: 1, self.idle.id: 4})
+        self.assertEqual(MaintenanceLog.objects.count(), 5)
+
+
+class RecurrenceTests(MaintenanceFixtureMixin, TestCase):
+
+    def test_occurrences_every_n_days_start_inside_window(self):
+        rule = RecurrenceRule(frequency='days', interval=10, start_date=date(2026, 1, 1))
+        days = list(occurrences(rule, date(2026, 1, 5), date(2026, 2, 1)))
+        self.assertEqual(days, [date(2026, 1, 11), date(2026, 1, 21), date(2026, 1, 31)])
+
+    def test_monthly_occurrences_clamp_to_month_end(self):
+        self.assertEqual(add_months(date(2026, 1, 31), 1), date(2026, 2, 28))
+        rule = RecurrenceRule(frequency='months', interval=1, start_date=date(2025, 10, 31), end_date=date(2026, 3, 1))
+        days = list(occurrences(rule, date(2026, 1, 1), date(2026, 12, 31)))
+        self.assertEqual(days, [date(2026, 1, 31), date(2026, 2, 28)])
+
+    def test_generation_is_idempotent(self):
+        Equipment.objects.filter(id__in=[self.equipment[0].id, self.equipment[1].id]).update(maintenance_team=self.team)
+        RecurrenceRule.objects.create(subject='Lubrication', team=self.team, frequency='days', interval=30, start_date=date(2026, 1, 1))
+        RecurrenceRule.objects.create(subject='Inspection', equipment=self.equipment[2], frequency='months', interval=3, start_date=date(2026, 1, 15))
+
+        first = generate_preventive_requests(horizon_days=90, today=date(2026, 1, 1), chunk_size=3)
+        # Jan 1 .. Apr 1: 4 dates x 2 team assets + Jan 15 for the single asset.
+        self.assertEqual(first['created'], 9)
+        generated = MaintenanceRequest.objects.filter(recurrence_rule__isnull=False)
+        self.assertEqual(set(generated.values_list('request_type', flat=True)), {'preventive'})
+        self.assertEqual(generated.filter(equipment=self.equipment[0], assigned_team=self.team).count(), 4)
+
+        again = generate_preventive_requests(horizon_days=90, today=date(2026, 1, 1))
+        self.assertEqual((again['created'], again['existing']), (0, 9))
+
+        rolled = generate_preventive_requests(horizon_days=90, today=date(2026, 2, 1))
+        # Feb 1 .. May 2 adds May 1 for both team assets and Apr 15.
+        self.assertEqual(rolled['created'], 3)
+        self.assertEqual(generated.count(), 12)
+
+    def test_scrapped_and_inactive_are_skipped(self):
+        Equipment.objects.filter(id=self.equipment[0].id).update(maintenance_team=self.team, is_scrapped=True)
+        RecurrenceRule.objects.create(subject='Team', team=self.team, interval=7, start_date=date(2026, 1, 1))
+        RecurrenceRule.objects.create(subject='Off', equipment=self.equipment[1], interval=7, start_date=date(2026, 1, 1), is_active=False)
+        report = generate_preventive_requests(horizon_days=30, today=date(2026, 1, 1))
+        self.assertEqual((report['rules'], report['created']), (1, 0))
+
+    def test_generated_rows_match_the_rule(self):
+        rule = RecurrenceRule.objects.create(
+            subject='Oil', description='Top up', equipment=self.equipment[0], team=self.team,
+            interval=7, start_date=date(2026, 1, 1), duration_hours=1.5,
+        )
+        with mock.patch('django.utils.timezone.localdate', return_value=date(2026, 1, 1)):
+            report = generate_preventive_requests(horizon_days=13)
+        self.assertEqual((report['from'], report['created']), ('2026-01-01', 2))
+        rows = MaintenanceRequest.objects.filter(recurrence_rule=rule).order_by('occurrence_date')
+        self.assertEqual(
+            list(rows.values_list('subject', 'description', 'status', 'assigned_team_id', 'scheduled_date', 'duration_hours', 'version')),
+            [('Oil', 'Top up', 'new', self.team.id, day, 1.5, 0) for day in (date(2026, 1, 1), date(2026, 1, 8))],
+        )
+        self.assertEqual(len({row.change_seq for row in rows}), 1)
+
+
+class LogCaptureTests(MaintenanceFixtureMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.admin = GearguardUser.objects.create_user(username='admin', password='pw', role='admin')
+
+    def setUp(self):
+        # Flush by hand instead of from the background thread.
+        patcher = mock.patch.object(log_buffer, 'flush_interval', None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        log_buffer.pending.clear()
+        self.addCleanup(log_buffer.pending.clear)
+        self.client.force_login(self.admin)
+
+    def test_assign_is_queued_on_commit_and_flushed_in_batch(self):
+        request = self.requests[0]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(
+                f'/maintenance/requests/{request.id}/assign/', {'technician_id': self.admin.id},
+                content_type='application/json',
+            )
+        self.assertFalse(MaintenanceLog.objects.exists())
+        self.assertEqual(log_buffer.flush(), 1)
+        log = MaintenanceLog.objects.get()
+        self.assertEqual(log.maintenance_request_id, request.id)
+        self.assertEqual(log.action, f'Status new -> in_progress; Assigned to technician {self.admin.id}')
+        self.assertEqual(log.performed_by_id, self.admin.id)
+
+    def test_uncommitted_change_is_not_queued(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            transition(MaintenanceRequest.objects.all(), self.requests[0].id, 'in_progress')
+        self.assertEqual(log_buffer.pending, [])
+
+    def test_serializer_update_is_logged_without_extra_queries(self):
+        request = self.requests[1]
+        MaintenanceRequest.objects.filter(pk=request.pk).update(status='in_progress')
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(
+                f'/maintenance/requests/{request.id}/', {'status': 'repaired', 'assigned_to': None},
+                content_type='application/json',
+            )
+        self.assertEqual(response.status_code, 200)
+        log_buffer.flush()
+        log = MaintenanceLog.objects.get()
+        self.assertEqual(log.action, 'Status in_progress -> repaired; Unassigned technician')
+        self.assertEqual(log.performed_by_id, self.admin.id)
+
+    def test_unchanged_save_is_not_logged(self):
+        request = MaintenanceRequest.objects.get(pk=self.requests[2].pk)
+        request.description = 'Only the text changed'
+        with self.captureOnCommitCallbacks(execute=True):
+            request.save()
+        self.assertEqual(log_buffer.pending, [])
+
+    def test_bulk_assign_is_not_logged_twice(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            assigned, _ = bulk_assign(MaintenanceRequest.objects.all(), {self.requests[3].id: (self.team.id, None)})
+        self.assertEqual(log_buffer.pending, [])
+        self.assertEqual(MaintenanceLog.objects.count(), len(assigned))
+
+    def test_buffer_signals_flush_at_size_and_writes_one_insert(self):
+        buffer = LogBuffer(flush_size=3, flush_interval=None)
+        for request in self.requests[:3]:
+            buffer.record(request.id, 'Checked')
+        self.assertTrue(buffer.wakeup.is_set())
+        # Live request check + one INSERT.
+        with self.assertNumQueries(2):
+            self.assertEqual(buffer.flush(), 3)
+        self.assertEqual(buffer.stats()['flushes'], 1)
+
+    def test_close_flushes_and_skips_deleted_requests(self):
+        buffer = LogBuffer(flush_interval=None, max_pending=2)
+        buffer.record(self.requests[0].id, 'Checked')
+        buffer.record(0, 'Deleted meanwhile')
+        buffer.record(self.requests[1].id, 'Over the cap')
+        buffer.close()
+        self.assertEqual(list(MaintenanceLog.objects.values_list('action', flat=True)), ['Checked'])
+        self.assertEqual(buffer.stats()['dropped'], 1)
+
+
+class LogArchiveTests(MaintenanceFixtureMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.admin = GearguardUser.objects.create_user(username='admin', password='pw', role='admin')
+        now = timezone.now()
+        cls.logs = MaintenanceLog.objects.bulk_create(
+            MaintenanceLog(maintenance_request=cls.requests[0], action=f'{days} days ago', timestamp=now - timedelta(days=days))
+            for days in (400, 380, 30, 10, 1)
+        )
+        cls.other_log = MaintenanceLog.objects.create(
+            maintenance_request=cls.requests[1], action='Other request', timestamp=now - timedelta(days=500),
+        )
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def test_archive_moves_old_logs_in_batches_keeping_ids(self):
+        self.assertEqual(list(archive_logs(retention_cutoff(365), batch_size=2)), [2, 1])
+        self.assertEqual(MaintenanceLog.objects.count(), 3)
+        self.assertEqual(
+            set(ArchivedMaintenanceLog.objects.values_list('id', 'action')),
+            {(self.logs[0].id, '400 days ago'), (self.logs[1].id, '380 days ago'), (self.other_log.id, 'Other request')},
+        )
+        self.assertEqual(list(archive_logs(retention_cutoff(365))), [])
+
+    def test_max_batches_bounds_a_run(self):
+        self.assertEqual(list(archive_logs(retention_cutoff(365), batch_size=1, max_batches=2)), [1, 1])
+        self.assertEqual(ArchivedMaintenanceLog.objects.count(), 2)
+
+    def test_default_history_reads_hot_logs_only(self):
+        list(archive_logs(retention_cutoff(365)))
+        body = self.client.get(f'/maintenance/requests/{self.requests[0].id}/logs/').json()
+        self.assertEqual([row['action'] for row in body['results']], ['1 days ago', '10 days ago', '30 days ago'])
+        self.assertIsNone(body['next_cursor'])
+
+    def test_full_history_pages_across_hot_and_archive(self):
+        list(archive_logs(retention_cutoff(365)))
+        url = f'/maintenance/requests/{self.requests[0].id}/logs/?history=full&limit=2'
+        actions, archived, cursor = [], [], None
+        while True:
+            # Session, scope check and one keyset read per table.
+            with self.assertNumQueries(5):
+                body = self.client.get(url + (f'&cursor={cursor}' if cursor else '')).json()
+            actions += [row['action'] for row in body['results']]
+            archived += [row['archived'] for row in body['results']]
+            cursor = body['next_cursor']
+            if not cursor:
+                break
+        self.assertEqual(actions, ['1 days ago', '10 days ago', '30 days ago', '380 days ago', '400 days ago'])
+        self.assertEqual(archived, [False, False, False, True, True])
+
+    def test_logs_of_unknown_request(self):
+        self.assertEqual(self.client.get('/maintenance/requests/0/logs/').status_code, 404)
+
+
+class ChangeFeedTests(MaintenanceFixtureMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.admin = GearguardUser.objects.create_user(username='admin', password='pw', role='admin')
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def poll(self, cursor=None, limit=50):
+        return self.client.get('/maintenance/requests/changes/', {'limit': limit, **({'cursor': cursor} if cursor else {})}).json()
+
+    def sync(self, limit=4):
+        ids, cursor = [], None
+        while True:
+            body = self.poll(cursor, limit)
+            ids += [row['id'] for row in body['changes']]
+            cursor = body['cursor']
+            if not body['has_more']:
+                return ids, cursor
+
+    def test_every_write_takes_a_higher_sequence(self):
+        request = MaintenanceRequest.objects.get(pk=self.requests[0].pk)
+        seq = request.change_seq
+        request.description = 'edited'
+        request.save(update_fields=['description'])
+        request.refresh_from_db()
+        self.assertGreater(request.change_seq, seq)
+
+        transition(MaintenanceRequest.objects.all(), request.pk, 'in_progress')
+        bulk_assign(MaintenanceRequest.objects.all(), {self.requests[1].id: (self.team.id, None)})
+        seqs = dict(MaintenanceRequest.objects.values_list('id', 'change_seq'))
+        self.assertGreater(seqs[self.requests[1].id], seqs[request.pk])
+        self.assertGreater(seqs[request.pk], request.change_seq)
+
+    def test_initial_sync_pages_then_poll_returns_only_deltas(self):
+        ids, cursor = self.sync()
+        self.assertEqual(sorted(ids), sorted(request.id for request in self.requests))
+
+        # Session, user, the committed sequence and one keyset read per table.
+        with self.assertNumQueries(5):
+            body = self.poll(cursor)
+        self.assertEqual((body['changes'], body['deleted'], body['cursor']), ([], [], cursor))
+
+        transition(MaintenanceRequest.objects.all(), self.requests[2].id, 'in_progress', assigned_to_id=self.admin.id)
+        MaintenanceRequest.objects.filter(pk=self.requests[4].pk).delete()
+        body = self.poll(cursor)
+        self.assertEqual([row['id'] for row in body['changes']], [self.requests[2].id])
+        self.assertEqual(body['changes'][0]['status'], 'in_progress')
+        self.assertEqual(body['deleted'], [self.requests[4].id])
+        self.assertFalse(body['has_more'])
+        self.assertEqual(self.poll(body['cursor'])['changes'], [])
+
+    def test_write_committed_between_reads_is_not_skipped(self):
+        _, cursor = self.sync()
+        transition(MaintenanceRequest.objects.all(), self.requests[0].id, 'in_progress')
+
+        # Another writer commits an edit and a delete after the requests
+        # were read but before the tombstones are.
+        def racing_paginate(queryset, *args):
+            if queryset.model is MaintenanceRequestTombstone:
+                transition(MaintenanceRequest.objects.all(), self.requests[1].id, 'in_progress')
+                MaintenanceRequest.objects.filter(pk=self.requests[5].pk).delete()
+            return keyset_paginate(queryset, *args)
+
+        with mock.patch('maintenance.changes.keyset_paginate', racing_paginate):
+            body = self.poll(cursor)
+        self.assertEqual(([row['id'] for row in body['changes']], body['deleted']), ([self.requests[0].id], []))
+
+        body = self.poll(body['cursor'])
+        self.assertEqual([row['id'] for row in body['changes']], [self.requests[1].id])
+        self.assertEqual(body['deleted'], [self.requests[5].id])
+
+    def test_invalid_cursor(self):
+        self.assertEqual(self.client.get('/maintenance/requests/changes/?cursor=nope').status_code, 400)
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Writers only overlap on PostgreSQL')
+@override_settings(MAINTENANCE_LOG_CAPTURE=False)
+class ConcurrentChangeFeedTests(TransactionTestCase):
+
+    def test_open_writer_holds_back_the_feed_but_not_other_writers(self):
+        department = Department.objects.create(name='Production')
+        # Separate assets, so the two writes share no rollup row either.
+        first, second = [
+            MaintenanceRequest.objects.create(
+                subject=name, request_type='corrective', equipment=Equipment.objects.create(
+                    name=name, serial_number=f'SN-{name}', department=department,
+                    location='Plant A', purchase_date=date(2024, 1, 1), warranty_expiry=date(2027, 1, 1),
+                ),
+            )
+            for name in ('First', 'Second')
+        ]
+        self.client.force_login(GearguardUser.objects.create_user(username='admin', password='pw', role='admin'))
+        cursor = self.client.get('/maintenance/requests/changes/').json()['cursor']
+
+        written = threading.Event()
+        release = threading.Event()
+
+        def slow_writer():
+            try:
+                with transaction.atomic():
+                    transition(MaintenanceRequest.objects.all(), first.pk, 'in_progress')
+                    written.set()
+                    release.wait(10)
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=slow_writer)
+        thread.start()
+        try:
+            self.assertTrue(written.wait(10))
+            # Commits while the slow writer is still open.
+            transition(MaintenanceRequest.objects.all(), second.pk, 'in_progress')
+            body = self.client.get('/maintenance/requests/changes/', {'cursor': cursor}).json()
+            self.assertEqual((body['changes'], body['cursor']), ([], cursor))
+        finally:
+            release.set()
+            thread.join()
+
+        body = self.client.get('/maintenance/requests/changes/', {'cursor': cursor}).json()
+        self.assertEqual([row['id'] for row in body['changes']], [first.pk, second.pk])
+
+
+@skipUnless(connection.vendor == 'postgresql', 'Writers only overlap on PostgreSQL')
+@override_settings(MAINTENANCE_LOG_CAPTURE=False)
+class ConcurrentBulkAssignTests(TransactionTestCase):
+
+    def test_announces_the_row_a_concurrent_transition_committed(self):
+        department = Department.objects.create(name='Production')
+        equipment = Equipment.objects.create(
+            name='Press', serial_number='SN-DISPATCH', department=department,
+            location='Plant A', purchase_date=date(2024, 1, 1), warranty_expiry=date(2027, 1, 1),
+        )
+        request = MaintenanceRequest.objects.create(
+            subject='Hot', equipment=equipment, request_type='corrective', status='in_progress',
+        )
+        team = MaintenanceTeam.objects.create(name='Mechanics')
+        announced = []
+
+        def record(sender, changes, **kwargs):
+            announced.extend(changes)
+
+        repairing = threading.Event()
+        release = threading.Event()
+
+        def repairer():
+            try:
+                with transaction.atomic():
+                    transition(MaintenanceRequest.objects.all(), request.pk, 'repaired')
+                    repairing.set()
+                    release.wait(10)
+            finally:
+                connection.close()
+
+        thread = threading.Thread(target=repairer)
+        thread.start()
+        self.assertTrue(repairing.wait(10))
+        # The dispatch reaches its read while the repair is still open.
+        threading.Timer(0.5, release.set).start()
+        requests_changed.connect(record)
+        try:
+            assigned, rejected = bulk_assign(MaintenanceRequest.objects.all(), {request.pk: (team.id, None)})
+        finally:
+            requests_changed.disconnect(record)
+            release.set()
+            thread.join()
+
+        self.assertEqual((assigned, rejected), ([request.pk], {}))
+        [(before, after)] = [change for change in announced if change[1]['assigned_team_id'] == team.id]
+        self.assertEqual((before['status'], before['version']), ('repaired', 1))
+        request.refresh_from_db()
+        self.assertEqual((request.status, request.assigned_team_id, request.version), ('in_progress', team.id, 2))
@@ -0,0 +1,74 @@
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .events import requests_changed
+from .logcapture import record_change
+from .models import ChangeSequence, MaintenanceRequest, VersionConflict
+
+
+class TransitionError(Exception):
+    pass
+
+
+class InvalidTransition(TransitionError):
+    pass
+
+
+class TransitionConflict(TransitionError, VersionConflict):
+    """
+    The request changed since it was read. ``current`` holds its status and
+    version now, so the caller can re-read and retry.
+    """
+
+
+def check_transition(from_status, to_status):
+    if to_status not in MaintenanceRequest.TRANSITIONS.get(from_status, ()):
+        raise InvalidTransition(f'Cannot move a request from {from_status} to {to_status}')
+
+
+def transition(queryset, pk, to_status, version=None, performed_by=None, **changes):
+    """
+    Moves request ``pk`` to ``to_status`` and applies ``changes`` with one
+    conditional UPDATE ... WHERE version = n AND status = <read status>.
+    Only the changed columns and ``version`` are written, and the request
+    row is not locked while it is read.
+
+    ``queryset`` scopes the lookup (e.g. the viewset's role-filtered
+    queryset). ``version`` is the version the client last read; when omitted
+    the current one is read first, which still rejects writers racing
+    between that read and the update. Returns the new version.
+
+    The first move to repaired also stamps ``repaired_at``. The change is
+    queued for the MaintenanceLog writer, attributed to ``performed_by``,
+    and announced with ``requests_changed``.
+    """
+
+    row = queryset.filter(pk=pk).values().first()
+    if row is None:
+        raise MaintenanceRequest.DoesNotExist
+    current = {'status': row['status'], 'version': row['version']}
+    if version is None:
+        version = current['version']
+    elif version != current['version']:
+        raise TransitionConflict(current)
+    check_transition(current['status'], to_status)
+    changes = {name: MaintenanceRequest._meta.get_field(name).to_python(value) for name, value in changes.items()}
+    if to_status == 'repaired' and row['repaired_at'] is None:
+        changes['repaired_at'] = timezone.now()
+
+    with transaction.atomic():
+        change_seq = ChangeSequence.advance(MaintenanceRequest.CHANGE_FEED)
+        updated = MaintenanceRequest.objects.filter(
+            pk=pk, version=version, status=current['status'],
+        ).update(status=to_status, version=F('version') + 1, change_seq=change_seq, **changes)
+        if updated:
+            after = {**row, **changes, 'status': to_status, 'version': version + 1, 'change_seq': change_seq}
+            requests_changed.send(sender=MaintenanceRequest, changes=[(row, after)])
+    if not updated:
+        raise TransitionConflict(MaintenanceRequest.objects.filter(pk=pk).values('status', 'version').first())
+    record_change(
+        row['id'], row, {'status': to_status, **changes},
+        performed_by_id=performed_by.id if performed_by is not None else None,
+    )
+    return version + 1
@@ -1,12 +1,47 @@
 from rest_framework import viewsets, permissions
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 
-from .models import MaintenanceRequest
+from .aggregates import STATUSES
+from .archive import log_history
+from .autoassign import MAX_AUTO_ASSIGN_BATCH, auto_assign_plan
+from .changes import changes_since
+from .dispatch import DispatchError, bulk_assign, parse_assignments
+from .logcapture import performed_by
+from .models import MaintenanceRequest, VersionConflict
 from .serializers import MaintenanceRequestSerializer
+from .transitions import InvalidTransition, TransitionConflict, transition
 import json
+from django.db.models import Count, Q, Sum
+from django.utils.dateparse import parse_date
 from django.http import JsonResponse
-from equipment.views import getName 
+from gearguard_backend.pagination import keyset_paginate, parse_limit
+from gearguard_backend.projections import Projection
+from teams.membership import team_ids_for_user
+from teams.models import MaintenanceTeam
+from users.models import GearguardUser
+
+
+MAINTENANCE_REQUEST_ROW = Projection(
+    id='id',
+    subject='subject',
+    description='description',
+    equipment_id='equipment_id',
+    equipment_name='equipment__name',
+    request_type='request_type',
+    status='status',
+    assigned_to_id='assigned_to_id',
+    assigned_team_id='assigned_team_id',
+    scheduled_date='scheduled_date',
+    duration_hours='duration_hours',
+    created_by_id='created_by_id',
+)
+
+BOARD_CARD_ROW = MAINTENANCE_REQUEST_ROW.extend(created_at='created_at')
+CHANGE_FEED_ROW = MAINTENANCE_REQUEST_ROW.extend(version='version', change_seq='change_seq')
+BOARD_PAGE_SIZE = 20
+CALENDAR_MAX_DAYS = 92
 
 class MaintenanceRequestViewSet(viewsets.ModelViewSet):
     serializer_class = MaintenanceRequestSerializer
@@ -19,10 +54,12 @@ class MaintenanceRequestViewSet(viewsets.ModelViewSet):
         if user.role == 'admin':
             return MaintenanceRequest.objects.all()
 
-        # Manager sees tasks for their team
+        # Manager sees tasks for their teams. Team ids come from the
+        # membership cache, so this is a plain IN filter: no join through
+        # the members table and no duplicate rows for multi-team managers.
         if user.role == 'manager':
             return MaintenanceRequest.objects.filter(
-                assigned_team__members=user
+                assigned_team_id__in=team_ids_for_user(user.id)
             )
 
         # Technician sees only assigned tasks
@@ -33,27 +70,284 @@ class MaintenanceRequestViewSet(viewsets.ModelViewSet):
 
         return MaintenanceRequest.objects.none()
 
+    # Status and assignment changes made through the serializer are logged
+    # by the post_save handler; attribute them to the requesting user.
+    def perform_create(self, serializer):
+        with performed_by(self.request.user):
+            serializer.save()
+
+    def update(self, request, *args, **kwargs):
+        """
+        PUT/PATCH. Send the ``version`` you last read to detect concurrent
+        writers; without it the version read by this request is used. A
+        conflict, or a status change TRANSITIONS does not allow, returns 409.
+        """
+
+        try:
+            return super().update(request, *args, **kwargs)
+        except InvalidTransition as e:
+            return Response({"error": str(e)}, status=409)
+        except VersionConflict as e:
+            return Response({"error": str(e), "current": e.current}, status=409)
+
+    def perform_update(self, serializer):
+        instance = serializer.instance
+        version = self.request.data.get('version')
+        if version is not None:
+            try:
+                instance.version = int(version)
+            except (TypeError, ValueError):
+                raise ValidationError({"version": "version must be an integer"})
+
+        data = serializer.validated_data
+        if 'status' not in data or data['status'] == instance.status:
+            with performed_by(self.request.user):
+                serializer.save()
+            return
+
+        # Status changes go through the same checked transition as assign.
+        changes = {}
+        for name, value in data.items():
+            if name == 'status':
+                continue
+            field = MaintenanceRequest._meta.get_field(name)
+            if field.is_relation:
+                changes[field.attname] = value.pk if value is not None else None
+            else:
+                changes[field.attname] = value
+        transition(
+            self.get_queryset(), instance.pk, data['status'], version=instance.version,
+            performed_by=self.request.user, **changes
+        )
+        # Not through get_queryset(): the change may have moved the request
+        # out of the caller's scope (e.g. a manager handing it to another team).
+        serializer.instance = MaintenanceRequest.objects.get(pk=instance.pk)
+
     @action(detail=True, methods=['post'])
     def assign(self, request, pk=None):
-        task = self.get_object()
+        """
+        Assigns a team and/or technician and moves the request to
+        in_progress with an optimistic, version-checked UPDATE. Send the
+        ``version`` you last read to detect concurrent dispatchers; a
+        conflict returns 409 with the current status and version.
+        """
+
         user = request.user
 
         if user.role not in ['admin', 'manager']:
             return Response({"error": "Permission denied"}, status=403)
 
+        try:
+            pk = int(pk)
+        except ValueError:
+            return Response({"error": "Maintenance Request not found"}, status=404)
+
         team_id = request.data.get("team_id")
         technician_id = request.data.get("technician_id")
+        version = request.data.get("version")
+        try:
+            team_id = int(team_id) if team_id else None
+            technician_id = int(technician_id) if technician_id else None
+            version = int(version) if version is not None else None
+        except (TypeError, ValueError):
+            return Response({"error": "team_id, technician_id and version must be integers"}, status=400)
+
+        changes = {}
+        if team_id is not None:
+            if not MaintenanceTeam.objects.filter(pk=team_id).exists():
+                return Response({"error": "Unknown team"}, status=400)
+            changes['assigned_team_id'] = team_id
+
+        if technician_id is not None:
+            if not GearguardUser.objects.filter(pk=technician_id).exists():
+                return Response({"error": "Unknown technician"}, status=400)
+            changes['assigned_to_id'] = technician_id
+
+        try:
+            new_version = transition(
+                self.get_queryset(), pk, 'in_progress', version=version, performed_by=user, **changes
+            )
+        except MaintenanceRequest.DoesNotExist:
+            return Response({"error": "Maintenance Request not found"}, status=404)
+        except TransitionConflict as e:
+            return Response({"error": str(e), "current": e.current}, status=409)
+        except InvalidTransition as e:
+            return Response({"error": str(e)}, status=409)
+
+        return Response({"message": "Task assigned successfully", "version": new_version})
+
+    @action(detail=False, methods=['post'], url_path='bulk-assign')
+    def bulk_assign(self, request):
+        """
+        Morning dispatch: ``assignments`` is a list of
+        {"id", "team_id", "technician_id"}. Applied in one transaction with
+        one UPDATE per (team, technician) pair and bulk-created log rows.
+        """
+
+        user = request.user
+
+        if user.role not in ['admin', 'manager']:
+            return Response({"error": "Permission denied"}, status=403)
+
+        try:
+            assignments = parse_assignments(request.data.get('assignments'))
+        except DispatchError as e:
+            return Response({"error": str(e)}, status=400)
+
+        assigned, rejected = bulk_assign(self.get_queryset(), assignments, performed_by=user)
+        return Response({
+            "assigned": len(assigned),
+            "rejected": [{"id": pk, "error": error} for pk, error in sorted(rejected.items())],
+        })
 
-        if team_id:
-            task.assigned_team_id = team_id
+    @action(detail=False, methods=['post'], url_path='auto-assign')
+    def auto_assign(self, request):
+        """
+        Spreads the team's unassigned new requests over its technicians by
+        open load (scheduled hours, then open count) and dispatches them like
+        bulk-assign. Send ``dry_run: true`` to get the plan without writing.
+        """
 
-        if technician_id:
-            task.assigned_to_id = technician_id
+        user = request.user
+
+        if user.role not in ['admin', 'manager']:
+            return Response({"error": "Permission denied"}, status=403)
 
-        task.status = "in_progress"
-        task.save()
+        try:
+            team_id = int(request.data.get('team_id'))
+            limit = parse_limit(request.data.get('limit'), MAX_AUTO_ASSIGN_BATCH, MAX_AUTO_ASSIGN_BATCH)
+        except (TypeError, ValueError):
+            return Response({"error": "team_id and limit must be integers"}, status=400)
+
+        queryset = self.get_queryset()
+        plan = auto_assign_plan(queryset, team_id, limit)
+        if request.data.get('dry_run'):
+            return Response({"plan": [{"id": pk, "technician_id": technician} for pk, technician in plan.items()]})
+
+        assigned, rejected = bulk_assign(
+            queryset, {pk: (None, technician) for pk, technician in plan.items()}, performed_by=user
+        )
+        return Response({
+            "assigned": len(assigned),
+            "rejected": [{"id": pk, "error": error} for pk, error in sorted(rejected.items())],
+        })
 
-        return Response({"message": "Task assigned successfully"})
+    @action(detail=True, methods=['get'])
+    def logs(self, request, pk=None):
+        """
+        The request's activity log, newest first, keyset-paginated with
+        ?cursor= and ?limit=. Only recent (hot) logs are read unless
+        ?history=full, which also pages through archived logs.
+        """
+
+        if not self.get_queryset().filter(pk=pk).exists():
+            return Response({"error": "Maintenance Request not found"}, status=404)
+
+        try:
+            limit = parse_limit(request.query_params.get('limit'))
+            full = request.query_params.get('history') == 'full'
+            results, next_cursor = log_history(pk, full, request.query_params.get('cursor'), limit)
+        except ValueError as e:
+            return Response({'error': str(e)}, status=400)
+
+        return Response({'results': results, 'next_cursor': next_cursor})
+
+    @action(detail=False, methods=['get'])
+    def changes(self, request):
+        """
+        Delta feed for polling clients: the requests (scoped like the list)
+        written since ?cursor= and the ids deleted since, at most ?limit=
+        per call. Keep the returned cursor and poll again; when has_more is
+        true, call again right away.
+        """
+
+        try:
+            limit = parse_limit(request.query_params.get('limit'))
+            rows, deleted, cursor, has_more = changes_since(
+                self.get_queryset(), CHANGE_FEED_ROW, request.query_params.get('cursor'), limit
+            )
+        except ValueError as e:
+            return Response({'error': str(e)}, status=400)
+
+        return Response({'changes': rows, 'deleted': deleted, 'cursor': cursor, 'has_more': has_more})
+
+    @action(detail=False, methods=['get'])
+    def board(self, request):
+        """
+        Status board over the requests this user may see (same scoping as
+        the list). Returns per-status counts from one conditional aggregate and
+        the newest cards of every column.
+
+        Pass ?column=<status>&cursor=<next_cursor> to page through one column.
+        """
+
+        queryset = self.get_queryset()
+        column = request.query_params.get('column')
+        try:
+            limit = parse_limit(request.query_params.get('limit'), BOARD_PAGE_SIZE)
+            if column:
+                if column not in STATUSES:
+                    raise ValueError(f'Unknown column: {column}')
+                cards, next_cursor = self.board_column(queryset, column, request.query_params.get('cursor'), limit)
+                return Response({'status': column, 'cards': cards, 'next_cursor': next_cursor})
+
+            counts = queryset.aggregate(**{status: Count('id', filter=Q(status=status)) for status in STATUSES})
+            columns = {}
+            for status in STATUSES:
+                cards, next_cursor = self.board_column(queryset, status, None, limit) if counts[status] else ([], None)
+                columns[status] = {'count': counts[status], 'cards': cards, 'next_cursor': next_cursor}
+        except ValueError as e:
+            return Response({'error': str(e)}, status=400)
+
+        return Response({'columns': columns})
+
+    @action(detail=False, methods=['get'])
+    def calendar(self, request):
+        """
+        Scheduled work per day between ?start= and ?end= (inclusive, ISO
+        dates, at most CALENDAR_MAX_DAYS apart), optionally narrowed to
+        ?team= and/or ?technician=. Scoped like the list and computed with a
+        single GROUP BY scheduled_date over the (assigned_team, scheduled_date) index.
+        """
+
+        try:
+            start = parse_date(request.query_params.get('start') or '')
+            end = parse_date(request.query_params.get('end') or '')
+            if not start or not end:
+                raise ValueError('start and end are required (YYYY-MM-DD)')
+            if end < start or (end - start).days >= CALENDAR_MAX_DAYS:
+                raise ValueError(f'end must be on or after start and at most {CALENDAR_MAX_DAYS} days later')
+            queryset = self.get_queryset().filter(scheduled_date__range=(start, end))
+            if request.query_params.get('team'):
+                queryset = queryset.filter(assigned_team_id=int(request.query_params['team']))
+            if request.query_params.get('technician'):
+                queryset = queryset.filter(assigned_to_id=int(request.query_params['technician']))
+        except ValueError as e:
+            return Response({'error': str(e)}, status=400)
+
+        days = queryset.values('scheduled_date').annotate(
+            count=Count('id'),
+            preventive=Count('id', filter=Q(request_type='preventive')),
+            duration_hours=Sum('duration_hours'),
+        ).order_by('scheduled_date')
+        return Response({
+            'start': start,
+            'end': end,
+            'days': [
+                {
+                    'date': day['scheduled_date'],
+                    'count': day['count'],
+                    'preventive': day['preventive'],
+                    'duration_hours': day['duration_hours'] or 0,
+                }
+                for day in days
+            ],
+        })
+
+    def board_column(self, queryset, status, cursor, limit):
+        cards = BOARD_CARD_ROW.values(queryset.filter(status=status))
+        page, next_cursor = keyset_paginate(cards, 'created_at', True, cursor, limit)
+        return BOARD_CARD_ROW.rows(page), next_cursor
     
 def list_maintenance_requests(request):
 
@@ -68,26 +362,9 @@ def list_maintenance_requests(request):
 
     if not request.method=='GET':
         return JsonResponse({'error':'Invalid HTTP method'},status=405)
-    data=[]
-    equipments=MaintenanceRequest.objects.all()
-    for equipment in equipments:
-        # print(getName(equipment.equipment_id).get('name'))
-        data.append({
-            'id':equipment.id,
-            'subject':equipment.subject,
-            'description':equipment.description,
-            'equipment_id': equipment.equipment_id,
-            'equipment_name':getName(equipment.equipment_id).get('name'),
-            'request_type':equipment.request_type,
-            'status':equipment.status,
-            'assigned_to_id':equipment.assigned_to.id if equipment.assigned_to else None,
-            'assigned_team_id':equipment.assigned_team.id if equipment.assigned_team else None,
-            'scheduled_date':equipment.scheduled_date,
-            'duration_hours':equipment.duration_hours,
-            'created_by_id':equipment.created_by.id if equipment.created_by else None,
-            # 'created_at':equipment.created_at,
-        })
-    return JsonResponse(data,safe=False)
+    # equipment_name comes from a join in the same SELECT, not a lookup per row.
+    equipments=MAINTENANCE_REQUEST_ROW.values(MaintenanceRequest.objects.all())
+    return JsonResponse(MAINTENANCE_REQUEST_ROW.rows(equipments),safe=False)
 
 def request_detail_view(request,pk):
     
@@ -107,22 +384,7 @@ def request_detail_view(request,pk):
         return JsonResponse({'error':'Invalid HTTP method'},status=405)
     
     try:
-        equipment=MaintenanceRequest.objects.get(id=pk)
-        data={
-            'id':equipment.id,
-            'subject':equipment.subject,
-            'description':equipment.description,
-            'equipment_id':equipment.equipment_id,
-            'equipment_name':getName(equipment.equipment_id).get('name'),
-            'request_type':equipment.request_type,
-            'status':equipment.status,
-            'assigned_to_id':equipment.assigned_to.id if equipment.assigned_to else None,
-            'assigned_team_id':equipment.assigned_team.id if equipment.assigned_team else None,
-            'scheduled_date':equipment.scheduled_date,
-            'duration_hours':equipment.duration_hours,
-            'created_by_id':equipment.created_by.id if equipment.created_by else None,
-            # 'created_at':equipment.created_at,
-        }
-        return JsonResponse(data,status=200)
+        equipment=MAINTENANCE_REQUEST_ROW.values(MaintenanceRequest.objects.filter(id=pk)).get()
+        return JsonResponse(MAINTENANCE_REQUEST_ROW.row(equipment),status=200)
     except MaintenanceRequest.DoesNotExist:
         return JsonResponse({'error':'Maintenance Request not found'},status=404)
\ No newline at end of file
@@ -0,0 +1,66 @@
+from django.core.cache import cache
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+from .models import MaintenanceTeam
+
+
+VERSION_KEY = 'teams:membership-version'
+MEMBERSHIP_TTL = 5 * 60
+
+
+def cache_is_shared():
+    """
+    Team ids scope what a manager may read and write, so they are only
+    cached when a version bump reaches every worker. A per-process cache
+    would let a removed manager keep their old scope in the other workers
+    until the entry expired.
+    """
+
+    return not isinstance(cache, (LocMemCache, DummyCache))
+
+
+def membership_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        cache.add(VERSION_KEY, 1, timeout=None)
+        version = cache.get(VERSION_KEY, 1)
+    return version
+
+
+def bump_membership_version():
+    """
+    Invalidates every cached membership at once: entries are keyed by the
+    version, so after the bump they are simply never read again and expire.
+    """
+
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.add(VERSION_KEY, 2, timeout=None)
+
+
+def team_ids_for_user(user_id):
+    """
+    Returns the ids of the teams ``user_id`` belongs to, read from the M2M
+    join table once per membership version and then served from the cache,
+    or on every call without a shared cache.
+    """
+
+    if not cache_is_shared():
+        return read_team_ids(user_id)
+    key = f'teams:member:{user_id}:v{membership_version()}'
+    team_ids = cache.get(key)
+    if team_ids is None:
+        team_ids = read_team_ids(user_id)
+        cache.set(key, team_ids, MEMBERSHIP_TTL)
+    return team_ids
+
+
+def read_team_ids(user_id):
+    return list(
+        MaintenanceTeam.members.through.objects
+        .filter(gearguarduser_id=user_id)
+        .order_by('maintenanceteam_id')
+        .values_list('maintenanceteam_id', flat=True)
+    )
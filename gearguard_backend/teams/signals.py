@@ -0,0 +1,17 @@
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete
+from django.dispatch import receiver
+
+from .membership import bump_membership_version
+from .models import MaintenanceTeam
+
+
+@receiver(m2m_changed, sender=MaintenanceTeam.members.through)
+def membership_changed(sender, action, **kwargs):
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        transaction.on_commit(bump_membership_version)
+
+
+@receiver(post_delete, sender=MaintenanceTeam)
+def team_deleted(sender, **kwargs):
+    transaction.on_commit(bump_membership_version)
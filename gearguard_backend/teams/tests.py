@@ -1,3 +1,70 @@
+from unittest import mock
+
+from django.core.cache import cache
 from django.test import TestCase
 
-# Create your tests here.
+from users.models import GearguardUser
+from .membership import team_ids_for_user
+from .models import MaintenanceTeam
+
+
+class TeamQueryCountTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        users = [GearguardUser.objects.create_user(username=f'tech{i}', password='pw', role='technician') for i in range(3)]
+        for i in range(4):
+            team = MaintenanceTeam.objects.create(name=f'Team {i}')
+            team.members.set(users[:i])
+        cls.team = team
+
+    def test_list_runs_two_queries(self):
+        with self.assertNumQueries(2):
+            rows = self.client.get('/teams/list/').json()
+        self.assertEqual([len(row['members']) for row in rows], [0, 1, 2, 3])
+
+    def test_detail_runs_two_queries(self):
+        with self.assertNumQueries(2):
+            row = self.client.get(f'/teams/find/{self.team.id}/').json()
+        self.assertEqual(len(row['members']), 3)
+
+
+class MembershipCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        # The test locmem cache stands in for a shared one: this process is
+        # the only worker.
+        shared = mock.patch('teams.membership.cache_is_shared', return_value=True)
+        shared.start()
+        self.addCleanup(shared.stop)
+        self.manager = GearguardUser.objects.create_user(username='manager', password='pw', role='manager')
+        self.teams = [MaintenanceTeam.objects.create(name=f'Team {i}') for i in range(3)]
+        for team in self.teams[:2]:
+            team.members.add(self.manager)
+
+    def test_team_ids_are_cached(self):
+        with self.assertNumQueries(1):
+            self.assertEqual(team_ids_for_user(self.manager.id), [self.teams[0].id, self.teams[1].id])
+        with self.assertNumQueries(0):
+            team_ids_for_user(self.manager.id)
+
+    def test_membership_changes_invalidate(self):
+        team_ids_for_user(self.manager.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.teams[2].members.add(self.manager)
+        self.assertEqual(len(team_ids_for_user(self.manager.id)), 3)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.manager.teams.remove(self.teams[0])
+        self.assertEqual(team_ids_for_user(self.manager.id), [self.teams[1].id, self.teams[2].id])
+        with self.captureOnCommitCallbacks(execute=True):
+            self.teams[1].delete()
+        self.assertEqual(team_ids_for_user(self.manager.id), [self.teams[2].id])
+
+    def test_per_process_cache_is_bypassed(self):
+        with mock.patch('teams.membership.cache_is_shared', return_value=False):
+            team_ids_for_user(self.manager.id)
+            # No bump is needed: other workers would not see it anyway.
+            self.manager.teams.remove(self.teams[0])
+            with self.assertNumQueries(1):
+                self.assertEqual(team_ids_for_user(self.manager.id), [self.teams[1].id])
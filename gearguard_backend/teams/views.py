@@ -3,6 +3,28 @@ from .models import MaintenanceTeam
 from django.http import JsonResponse
 import json
 from django.views.decorators.csrf import csrf_exempt
+from gearguard_backend.projections import Projection
+
+
+TEAM_ROW = Projection(
+    id='id',
+    name='name',
+    description='description',
+    created_at='created_at',
+)
+
+
+def team_member_ids(team_ids):
+    """
+    Returns {team_id: [member ids]} read from the M2M join table in one query,
+    without loading any user rows.
+    """
+
+    members={team_id:[] for team_id in team_ids}
+    rows=MaintenanceTeam.members.through.objects.filter(maintenanceteam_id__in=team_ids)
+    for team_id,user_id in rows.order_by('id').values_list('maintenanceteam_id','gearguarduser_id'):
+        members[team_id].append(user_id)
+    return members
 
 # Create your views here.
 
@@ -16,16 +38,10 @@ def get_all_teams(request):
     if not request.method=='GET':
         return JsonResponse({'error':'Invalid HTTP method'},status=405)
     
-    data=[]
-    teams=MaintenanceTeam.objects.all()
-    for team in teams:
-        data.append({
-            'id':team.id,
-            'name':team.name,
-            'description':team.description,
-            'members':[member.id for member in team.members.all()],
-            'created_at':team.created_at
-        })
+    data=TEAM_ROW.rows(TEAM_ROW.values(MaintenanceTeam.objects.all()))
+    members=team_member_ids([team['id'] for team in data])
+    for team in data:
+        team['members']=members[team['id']]
     return JsonResponse(data,safe=False)
 
 @csrf_exempt
@@ -40,13 +56,8 @@ def get_team_details(request,team_id):
     
     try:
         team=MaintenanceTeam.objects.get(id=team_id)
-        data={
-            'id':team.id,
-            'name':team.name,
-            'description':team.description,
-            'members':[member.id for member in team.members.all()],
-            'created_at':team.created_at
-        }
+        data=TEAM_ROW.row(team)
+        data['members']=team_member_ids([team.id])[team.id]
         return JsonResponse(data,status=200)
     except MaintenanceTeam.DoesNotExist:
         return JsonResponse({'error':'Team not found'},status=404)
@@ -71,12 +82,7 @@ def create_team(request):
     team.members.set(member_ids)
     team.save()
 
-    response_data={
-        'id':team.id,
-        'name':team.name,
-        'description':team.description,
-        'members':[member.id for member in team.members.all()],
-        'created_at':team.created_at
-    }
+    response_data=TEAM_ROW.row(team)
+    response_data['members']=team_member_ids([team.id])[team.id]
 
     return JsonResponse(response_data,status=201)
\ No newline at end of file
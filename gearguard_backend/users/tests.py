@@ -1,3 +1,13 @@
 from django.test import TestCase
 
-# Create your tests here.
+from .models import GearguardUser
+
+
+class UserQueryCountTests(TestCase):
+
+    def test_list_runs_one_query(self):
+        for i in range(3):
+            GearguardUser.objects.create_user(username=f'user{i}', password='pw', role='technician')
+        with self.assertNumQueries(1):
+            rows = self.client.get('/users/list/').json()
+        self.assertEqual(len(rows), 3)
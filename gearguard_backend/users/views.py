@@ -4,6 +4,17 @@ from django.views.decorators.csrf import csrf_exempt
 from django.contrib.auth import authenticate
 import json
 from .models import GearguardUser
+from gearguard_backend.projections import Projection
+
+
+USER_ROW = Projection(
+    id='id',
+    username='username',
+    email='email',
+    first_name='first_name',
+    last_name='last_name',
+    role='role',
+)
 
 
 # Create your views here.
@@ -100,17 +111,7 @@ def list_users_view(request):
     if not request.method=='GET':
         return JsonResponse({'error':'Invalid HTTP method'},status=405)
     
-    users=GearguardUser.objects.all()
-    data=[]
-    for user in users:
-        data.append({
-            'id':user.id,
-            'username':user.username,
-            'email':user.email, 
-            'first_name':user.first_name,
-            'last_name':user.last_name,
-            'role':user.role
-        })
+    data=USER_ROW.rows(USER_ROW.values(GearguardUser.objects.all()))
     return JsonResponse(data,safe=False)
 
 